@@ -0,0 +1,348 @@
+# analysis_cache.py
+# 수집/분석 캐시 함수(main.py B~F, H, I)의 결과를 보관하는 메모리 한도 캐시. (모든 세션이 하나를 공유)
+# st.cache_data/resource는 항목 수나 ttl로만 제한되어 검색어 x 설정 조합이 쌓이면 서버 메모리가 계속 늘어난다.
+# - 항목마다 실제 크기(DataFrame, 희소 행렬, Counter 등)를 재서 전체 크기가 MAX_BYTES를 넘지 않게 한다.
+# - 넘으면 (다시 계산하는 데 걸린 시간 / 크기)가 작고 오래 안 쓴 항목부터 내보낸다. (GreedyDual-Size)
+# - 단계(stage)별 ttl이 지난 항목은 다시 계산한다. (수집 결과는 새 기사를 받기 위해 짧게)
+# - SPILL_DIR을 정하면 내보낸 항목을 버리지 않고 디스크(pickle)에 두었다가 다시 요청되면 읽어 온다.
+# - 이 캐시 밖에서 메모리를 쓰는 캐시(명사 캐시, 증분 상태, 렌더 캐시 등)는 register_usage로 등록하면
+#   사용량을 stats()에 함께 보여주고, budget=True인 것은 그만큼 이 캐시의 한도를 줄여서 전체가 MAX_BYTES 안에 들게 한다.
+#   trim을 함께 등록한 사용처(명사 캐시 등)는 다른 캐시 합계가 EXTERNAL_SHARE를 넘으면 큰 것부터 줄여서
+#   이 캐시의 한도가 0까지 줄어들지 않게 한다.
+# 결과는 복사하지 않고 참조로 돌려준다. (st.cache_resource와 같음, 읽기 전용으로만 사용!)
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+import perf
+
+MB = 1024 * 1024
+MAX_BYTES = int(os.environ.get("ANALYSIS_CACHE_MB", 512)) * MB         # 메모리 캐시 전체 크기 제한
+SPILL_DIR = os.environ.get("ANALYSIS_CACHE_SPILL_DIR")                  # None이면 내보낸 항목은 버림
+MAX_SPILL_BYTES = int(os.environ.get("ANALYSIS_CACHE_SPILL_MB", 2048)) * MB
+EXTERNAL_SHARE = 0.5  # 등록된 다른 캐시가 쓸 수 있는 몫 (넘으면 trim 가능한 사용처를 줄임)
+
+# 단계별 ttl(초). None이면 메모리 한도로만 내보냄
+STAGE_TTL = {
+    "fetch": 600,          # 새로 올라온 기사를 받아오도록 짧게 (기존 st.cache_data(ttl=600)과 같음)
+    "compare": 600,
+    "stop_words": None,
+    "dedup": 3600,
+    "analysis": 3600,
+    "timeline": 3600,
+    "graph": 3600,
+    "layout": 3600,
+}
+
+
+def sizeof(obj, _seen=None):
+    """
+    obj가 차지하는 대략적인 바이트 수. (numpy/희소 행렬/pandas는 버퍼 크기, 컨테이너는 내용까지)
+    같은 객체를 여러 번 참조하면 한 번만 셉니다.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if sp.issparse(obj):
+        return sum(sizeof(getattr(obj, name), seen) for name in ("data", "indices", "indptr", "row", "col")
+                   if isinstance(getattr(obj, name, None), np.ndarray))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sizeof(k, seen) + sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sizeof(item, seen) for item in obj)
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "stage", "size", "cost", "priority", "expires")
+
+    def __init__(self, value, stage, size, cost, priority, expires):
+        self.value = value
+        self.stage = stage
+        self.size = size
+        self.cost = cost
+        self.priority = priority
+        self.expires = expires
+
+
+class AnalysisCache:
+    """
+    바이트 크기 기준 전역 한도 캐시.
+    내보낼 때는 우선순위(clock + 계산 시간 / 크기)가 가장 낮은 항목부터 고르고, clock을 그 값으로 올린다.
+    (최근에 쓴 항목일수록, 계산이 비쌀수록, 작을수록 오래 남음)
+    같은 키를 동시에 요청하면 한 번만 계산합니다.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, spill_dir=SPILL_DIR, max_spill_bytes=MAX_SPILL_BYTES,
+                 stage_ttl=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self.stage_ttl = dict(STAGE_TTL if stage_ttl is None else stage_ttl)
+        self.entries = {}
+        self.size = 0
+        self.clock = 0.0
+        self.spilled = OrderedDict()   # 키 -> (파일 경로, 파일 크기, 단계, 계산 시간, 만료 시각) (LRU)
+        self.spill_size = 0
+        self.inflight = {}
+        self.usage = {}                # 이름 -> (사용량 함수, 한도에 포함 여부, 줄이는 함수)
+        self.counts = {name: 0 for name in ("hits", "misses", "evictions", "expirations",
+                                            "oversize", "spills", "spill_hits", "spill_errors", "trims")}
+        self.lock = threading.Lock()
+        if spill_dir:
+            # 이전 프로세스가 남긴 파일은 색인이 없으므로 정리
+            os.makedirs(spill_dir, exist_ok=True)
+            for name in os.listdir(spill_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(spill_dir, name))
+
+    def _expires(self, stage, now):
+        ttl = self.stage_ttl.get(stage)
+        return None if ttl is None else now + ttl
+
+    def _count(self, name, n=1):
+        self.counts[name] += n
+        perf.incr(f"analysis_cache.{name}", n)
+
+    def get_or_compute(self, key, stage, fn, *args, **kwargs):
+        """key가 캐시(메모리 또는 디스크)에 있으면 반환하고, 없으면 fn(*args, **kwargs)를 계산해 저장합니다."""
+        while True:
+            with self.lock:
+                now = time.time()
+                entry = self.entries.get(key)
+                if entry is not None and entry.expires is not None and entry.expires <= now:
+                    self._drop(key)
+                    self._count("expirations")
+                    entry = None
+                if entry is not None:
+                    entry.priority = self.clock + entry.cost / max(entry.size, 1)
+                    self._count("hits")
+                    return entry.value
+                waiting = self.inflight.get(key)
+                if waiting is None:
+                    # 이 스레드가 디스크에서 읽거나 계산 (같은 키의 다른 요청은 기다림)
+                    self.inflight[key] = threading.Event()
+                    spilled = self.spilled.pop(key, None)
+                    if spilled is not None:
+                        self.spill_size -= spilled[1]
+                    break
+            # 다른 스레드가 같은 키를 읽거나 계산 중이면 끝날 때까지 기다렸다가 다시 조회
+            waiting.wait()
+
+        try:
+            value = self._load_spilled(spilled, now) if spilled is not None else None
+            if value is not None:
+                with self.lock:
+                    self._count("spill_hits")
+                self.put(key, value, spilled[2], spilled[3], spilled[4])
+                return value
+            with self.lock:
+                self._count("misses")
+            start = time.perf_counter()
+            value = fn(*args, **kwargs)
+            self.put(key, value, stage, time.perf_counter() - start)
+            return value
+        finally:
+            with self.lock:
+                self.inflight.pop(key).set()
+
+    def register_usage(self, name, usage, budget=True, trim=None):
+        """
+        이 캐시 밖의 메모리 사용처를 등록합니다. usage()는 {"entries": 항목 수, "bytes": 크기}를 반환합니다.
+        budget=True면 항목을 넣을 때마다 호출해서 그 크기만큼 한도를 줄이므로 usage()는 가벼워야 합니다.
+        (다른 캐시와 객체를 공유해서 이중으로 세게 되는 사용처는 budget=False로 표시만)
+        trim(max_bytes)을 주면 다른 캐시 합계가 EXTERNAL_SHARE를 넘을 때 그 사용처를 max_bytes까지 줄입니다.
+        """
+        self.usage[name] = (usage, budget, trim)
+
+    def usage_stats(self, budget_only=False):
+        """{이름: {"entries", "bytes", "budget"}} (잠금 밖에서 호출: 사용량 함수는 각자 잠금을 잡음)"""
+        stats = {}
+        for name, (usage, budget, _) in list(self.usage.items()):
+            if budget or not budget_only:
+                u = usage()
+                stats[name] = {"entries": u["entries"], "bytes": u["bytes"], "budget": budget}
+        return stats
+
+    def limit(self):
+        """
+        등록된 사용처(budget=True)를 뺀 이 캐시의 한도.
+        사용처 합계가 max_bytes * EXTERNAL_SHARE를 넘으면 trim이 있는 사용처를 큰 것부터 줄인 뒤 계산합니다.
+        """
+        stats = self.usage_stats(budget_only=True)
+        external = sum(s["bytes"] for s in stats.values())
+        over = external - int(self.max_bytes * EXTERNAL_SHARE)
+        for name in sorted(stats, key=lambda n: -stats[n]["bytes"]):
+            if over <= 0:
+                break
+            usage, _, trim = self.usage[name]
+            if trim is None:
+                continue
+            trim(max(0, stats[name]["bytes"] - over))
+            freed = stats[name]["bytes"] - usage()["bytes"]
+            external -= freed
+            over -= freed
+            self._count("trims")
+        return max(0, self.max_bytes - external)
+
+    def put(self, key, value, stage, cost, expires=None):
+        size = sizeof(value)
+        limit = self.limit()
+        with self.lock:
+            if key in self.entries:
+                self._drop(key)
+            if size > limit:
+                self._count("oversize")
+                return
+            self.entries[key] = _Entry(value, stage, size, cost, self.clock + cost / max(size, 1),
+                                       expires if expires is not None else self._expires(stage, time.time()))
+            self.size += size
+            evicted = []
+            while self.size > limit:
+                victim = min(self.entries, key=lambda k: self.entries[k].priority)
+                self.clock = self.entries[victim].priority
+                evicted.append((victim, self.entries[victim]))
+                self._drop(victim)
+                self._count("evictions")
+        # 디스크에 쓰는 동안 다른 스레드가 기다리지 않도록 잠금 밖에서
+        if self.spill_dir:
+            for victim, entry in evicted:
+                self._spill(victim, entry)
+
+    def _drop(self, key):
+        entry = self.entries.pop(key)
+        self.size -= entry.size
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest() + ".pkl")
+
+    def _spill(self, key, entry):
+        if entry.expires is not None and entry.expires <= time.time():
+            return
+        path = self._spill_path(key)
+        try:
+            with open(path, "wb") as f:
+                pickle.dump(entry.value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            file_size = os.path.getsize(path)
+        except Exception:
+            self._remove_file(path)
+            with self.lock:
+                self._count("spill_errors")
+            return
+        with self.lock:
+            old = self.spilled.pop(key, None)
+            if old is not None:
+                self.spill_size -= old[1]
+            self.spilled[key] = (path, file_size, entry.stage, entry.cost, entry.expires)
+            self.spill_size += file_size
+            self._count("spills")
+            removed = []
+            while self.spill_size > self.max_spill_bytes and self.spilled:
+                _, (old_path, old_size, *_) = self.spilled.popitem(last=False)
+                self.spill_size -= old_size
+                removed.append(old_path)
+        for old_path in removed:
+            self._remove_file(old_path)
+
+    def _load_spilled(self, spilled, now):
+        path, _, _, _, expires = spilled
+        try:
+            if expires is not None and expires <= now:
+                with self.lock:
+                    self._count("expirations")
+                return None
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            with self.lock:
+                self._count("spill_errors")
+            return None
+        finally:
+            self._remove_file(path)
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self, name=None):
+        """name(캐시 함수 이름)의 항목을, name이 없으면 전부 지웁니다."""
+        with self.lock:
+            for key in [k for k in self.entries if name is None or k[0] == name]:
+                self._drop(key)
+            paths = []
+            for key in [k for k in self.spilled if name is None or k[0] == name]:
+                path, file_size, *_ = self.spilled.pop(key)
+                self.spill_size -= file_size
+                paths.append(path)
+        for path in paths:
+            self._remove_file(path)
+
+    def stats(self):
+        """이 캐시의 크기/카운터와 등록된 사용처의 사용량 (limit: 사용처를 뺀 이 캐시의 한도)"""
+        usage = self.usage_stats()
+        external = sum(s["bytes"] for s in usage.values() if s["budget"])
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.size, "max_bytes": self.max_bytes,
+                    "limit": max(0, self.max_bytes - external),
+                    "spilled_entries": len(self.spilled), "spilled_bytes": self.spill_size, **self.counts,
+                    "usage": usage}
+
+    def stage_stats(self):
+        """{단계: {"entries": 항목 수, "bytes": 크기, "spilled": 디스크 항목 수}}"""
+        with self.lock:
+            stats = {}
+            for entry in self.entries.values():
+                s = stats.setdefault(entry.stage, {"entries": 0, "bytes": 0, "spilled": 0})
+                s["entries"] += 1
+                s["bytes"] += entry.size
+            for _, _, stage, _, _ in self.spilled.values():
+                stats.setdefault(stage, {"entries": 0, "bytes": 0, "spilled": 0})["spilled"] += 1
+            return stats
+
+
+# 프로세스 전체(모든 세션)에서 공유
+cache = AnalysisCache()
+
+
+def cached(stage):
+    """
+    함수 결과를 cache에 stage 단계로 저장하는 데코레이터. (st.cache_resource 대신 사용)
+    st.cache_*처럼 밑줄(_)로 시작하는 인자는 키에서 제외하고, 나머지 인자는 해시 가능해야 합니다.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, tuple((k, v) for k, v in bound.arguments.items() if not k.startswith("_")))
+            return cache.get_or_compute(key, stage, fn, *args, **kwargs)
+
+        wrapper.clear = functools.partial(cache.clear, name)
+        return wrapper
+
+    return decorator
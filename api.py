@@ -1,78 +1,366 @@
 # api.py
 import sys
-import urllib.request
+import html
 import urllib.parse
+import http.client
 import json
+import logging
+import random
+import threading
+import time
 import pandas as pd
-import re
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+import perf
 
 # my_apikeys.py가 같은 경로에 있다고 가정
-sys.path.append('./') 
+sys.path.append('./')
 import my_apikeys as mykeys
 
-def get_naver_news(keyword, num_data=1000):
+logger = logging.getLogger("api")
+
+# ----------------------------------------------------------------------
+# 수집 엔진 설정
+# 네이버 검색 API는 초당 호출 수 제한이 있으므로 동시 요청 수와 호출 속도를 함께 제한한다.
+# ----------------------------------------------------------------------
+NAVER_NEWS_URL = "https://openapi.naver.com/v1/search/news"
+DISPLAY_COUNT = 100        # 한 페이지당 최대 100건 (API 제한)
+MAX_WORKERS = 4            # 동시에 요청할 페이지 수
+RATE_PER_SEC = 10          # 초당 최대 호출 수 (네이버 API 제한)
+MAX_RETRIES = 3            # 일시적 오류 시 재시도 횟수
+BACKOFF_BASE = 0.5         # 재시도 대기 시간 (초, 지수 증가)
+REQUEST_TIMEOUT = 10
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+# ----------------------------------------------------------------------
+# 정제 설정
+# pubDate는 RFC 2822 형식 ("Fri, 17 Oct 2025 09:30:00 +0900"). 오프셋을 반영해 한국 시간으로 맞춘다.
+# ----------------------------------------------------------------------
+LOCAL_TZ = timezone(timedelta(hours=9))  # 한국 표준시 (저장/분석은 이 시간대의 시각으로)
+ITEM_FIELDS = ["pubDate", "title", "description", "link", "originallink"]
+TAG_PATTERN = r"<[^>]*>"
+SPACE_PATTERN = "[\\s\xa0\u3000]{2,}|[\t\n\r\f\v\xa0\u3000]"  # 연속 공백/특수 공백만 (단일 공백은 그대로 두어서 빠름)
+COMMON_ENTITIES = [("&quot;", '"'), ("&lt;", "<"), ("&gt;", ">"), ("&#39;", "'"), ("&apos;", "'"), ("&amp;", "&")]
+COMMON_ENTITY_PATTERN = r"&(?:quot|lt|gt|#39|apos|amp);"
+PUBDATE_PATTERN = r"[A-Za-z]{3}, \d{2} [A-Za-z]{3} \d{4} \d{2}:\d{2}:\d{2} [+-]\d{4}"  # 고정 폭 (API 기본 형식)
+MONTHS = {m: f"{i:02d}" for i, m in enumerate(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], 1
+)}
+
+
+class TokenBucket:
+    """초당 rate개의 토큰을 채우는 토큰 버킷. acquire()는 토큰이 생길 때까지 기다린다."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ConnectionPool:
+    """호스트별 keep-alive 연결을 재사용하는 간단한 연결 풀."""
+
+    def __init__(self, timeout=REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self.idle = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, scheme, netloc, fresh=False):
+        """쉬고 있는 연결을 꺼내고, 없거나 fresh=True면 새 연결을 만듭니다."""
+        if not fresh:
+            with self.lock:
+                conns = self.idle.get((scheme, netloc))
+                if conns:
+                    return conns.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme, netloc, conn):
+        with self.lock:
+            self.idle.setdefault((scheme, netloc), []).append(conn)
+
+    def close(self):
+        with self.lock:
+            for conns in self.idle.values():
+                for conn in conns:
+                    conn.close()
+            self.idle.clear()
+
+
+# 모듈 전역 풀: 여러 번 호출해도 TLS 핸드셰이크를 다시 하지 않도록 공유
+_pool = ConnectionPool()
+
+# 인증키(Client ID)별 토큰 버킷: 호출 수 제한은 키 단위이므로 여러 세션/검색어의 수집이 동시에 돌아도
+# 같은 키로 보내는 요청은 합쳐서 초당 rate_per_sec개를 넘지 않는다.
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(client_id, rate_per_sec=RATE_PER_SEC):
+    """client_id가 공유하는 토큰 버킷. 초당 호출 수가 바뀌면 새 값으로 맞춘다."""
+    with _buckets_lock:
+        bucket = _buckets.get(client_id)
+        if bucket is None:
+            bucket = _buckets[client_id] = TokenBucket(rate_per_sec)
+        elif bucket.rate != float(rate_per_sec):
+            with bucket.lock:
+                bucket.rate = bucket.capacity = float(rate_per_sec)
+                bucket.tokens = min(bucket.tokens, bucket.capacity)
+        return bucket
+
+
+class TransientError(Exception):
+    """재시도하면 성공할 수 있는 오류 (429, 5xx, 연결 끊김 등)"""
+
+
+class PageError(Exception):
+    """재시도 후에도 받지 못한 검색 결과 페이지 (skip_failed=False일 때)"""
+
+
+def _request_json(url, headers, bucket, max_retries=MAX_RETRIES, pool=None):
     """
-    강의록의 수집 로직을 함수로 변환한 것
+    url을 GET 요청하여 JSON으로 반환합니다.
+    일시적 오류는 지수 백오프로 재시도하고, 그 외 오류(인증 실패 등)는 바로 예외를 발생시킵니다.
+    """
+    pool = pool or _pool
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path + ("?" + parts.query if parts.query else "")
+
+    attempt, fresh = 0, False
+    while True:
+        bucket.acquire()
+        perf.incr("api.requests")
+        if attempt and not fresh:
+            perf.incr("api.retries")
+        conn = pool.acquire(parts.scheme, parts.netloc, fresh=fresh)
+        reused = conn.sock is not None  # 풀에서 꺼낸 keep-alive 연결 (새 연결은 요청할 때 접속)
+        fresh = False
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()  # 연결 재사용을 위해 본문은 항상 끝까지 읽는다
+            perf.incr("api.bytes", len(body))
+            if response.will_close:
+                conn.close()
+            else:
+                pool.release(parts.scheme, parts.netloc, conn)
+            if response.getcode() == 200:
+                return json.loads(body.decode('utf-8'))
+            if response.getcode() not in TRANSIENT_STATUS:
+                raise RuntimeError(f"HTTP {response.getcode()}: {body[:200]!r}")
+            error = TransientError(f"HTTP {response.getcode()}")
+        except (OSError, http.client.HTTPException) as e:
+            # 연결이 끊긴 경우 해당 연결은 버리고 새로 연결
+            conn.close()
+            if reused:
+                # 쉬는 동안 서버가 닫은 keep-alive 연결: API 오류가 아니므로 기다리지 않고
+                # 새 연결로 바로 다시 요청한다. (재시도 횟수에 포함하지 않음)
+                perf.incr("api.stale_connections")
+                fresh = True
+                continue
+            error = TransientError(str(e))
+
+        if attempt >= max_retries:
+            raise error
+        time.sleep(BACKOFF_BASE * (2 ** attempt) * (1 + random.random()))
+        attempt += 1
+
+
+def iter_news_pages(keyword, num_data=1000, max_workers=MAX_WORKERS,
+                    rate_per_sec=RATE_PER_SEC, max_retries=MAX_RETRIES,
+                    base_url=NAVER_NEWS_URL, stop_when=None, skip_failed=True):
+    """
+    검색 결과 페이지들을 동시에 요청하고, 원본 item 목록을 페이지 순서대로 하나씩 yield합니다.
+    재시도 후에도 실패한 페이지는 skip_failed=True면 빈 목록으로 넘기고 나머지 페이지는 유지하며,
+    False면 그 페이지 순서에서 PageError를 발생시킵니다.
+    stop_when(items)가 주어지면 첫 페이지부터 차례로 확인하여 True가 되는 페이지(또는 결과가 끝난 빈 페이지)에서
+    수집을 멈춥니다. (sort=date이므로 이미 저장된 기사를 만나면 그 뒤는 모두 아는 기사)
+    실패한 페이지는 아는 기사에 도달한 것이 아니므로 멈추지 않는다.
     """
-    
     # 1. 인증키 가져오기 (my_apikeys.py 사용)
-    client_id = mykeys.naver_client_id
-    client_secret = mykeys.naver_client_secret
-
-    # 2. 파라미터 설정
-    display_count = 100 
-    sort = 'date' 
-    
-    # 검색어 인코딩
+    headers = {
+        "X-Naver-Client-Id": mykeys.naver_client_id,
+        "X-Naver-Client-Secret": mykeys.naver_client_secret,
+    }
+
+    # 2. 페이지별 URL 생성 (sort=date: 최신순)
     encText = urllib.parse.quote(keyword)
-    results = []
-
-    # 3. API 요청 (강의록 로직)
-    for idx in range(1, num_data + 1, display_count):
-        url = "https://openapi.naver.com/v1/search/news?query=" + encText \
-            + f"&start={idx}&display={display_count}&sort={sort}"
-        
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", client_id)
-        request.add_header("X-Naver-Client-Secret", client_secret)
-        
+    urls = [
+        f"{base_url}?query={encText}&start={idx}&display={DISPLAY_COUNT}&sort=date"
+        for idx in range(1, num_data + 1, DISPLAY_COUNT)
+    ]
+
+    bucket = get_bucket(mykeys.naver_client_id, rate_per_sec)
+    max_workers = max(1, int(max_workers))
+
+    def fetch(url):
+        """페이지의 item 목록. 실패하면 None"""
         try:
-            response = urllib.request.urlopen(request)
-            if response.getcode() == 200:
-                response_body = response.read()
-                response_dict = json.loads(response_body.decode('utf-8'))
-                results.extend(response_dict['items'])
+            items = _request_json(url, headers, bucket, max_retries)['items']
         except Exception as e:
-            print(f"Error: {e}")
-            break
+            # 실패 건수는 perf 카운터로 남기고, 표준 출력 대신 로그로 기록 (바쁜 서버에서 출력이 넘치지 않도록)
+            perf.incr("api.failed_pages")
+            logger.warning("page failed: %s: %s", url, e)
+            if not skip_failed:
+                raise PageError(f"{url}: {e}") from e
+            return None
+        perf.incr("api.pages")
+        perf.incr("api.items", len(items))
+        return items
 
-    # 4. 데이터프레임 변환 및 전처리 (강의록 로직)
+    # 3. 동시 요청. 앞 페이지가 도착하는 대로 바로 넘겨준다.
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        if stop_when is None:
+            futures = [executor.submit(fetch, url) for url in urls]
+            for future in futures:
+                yield future.result() or []
+        else:
+            # 증분 수집: 첫 페이지만 먼저 받고, 멈출 조건이 아니면 max_workers개씩 이어서 요청
+            pos, wave = 0, 1
+            while pos < len(urls):
+                futures = [executor.submit(fetch, url) for url in urls[pos:pos + wave]]
+                pos += wave
+                wave = max_workers
+                for future in futures:
+                    page = future.result()
+                    yield page or []
+                    if page is not None and (not page or stop_when(page)):
+                        return
+    finally:
+        # 소비자가 중간에 멈춘 경우 남은 요청은 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_news_items(keyword, num_data=1000, **kwargs):
+    """모든 페이지의 원본 item 목록을 페이지 순서대로 합쳐서 반환합니다."""
+    return [item for page in iter_news_pages(keyword, num_data, **kwargs) for item in page]
+
+
+def _parse_pubdate(value):
+    """고정 폭 형식이 아닌 pubDate 한 건 (한 자리 날짜, 초 생략 등). 해석할 수 없으면 None"""
+    try:
+        return parsedate_to_datetime(value).astimezone(LOCAL_TZ).replace(tzinfo=None)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_pubdates(values):
+    """
+    pubDate 문자열 Series를 한국 시간 기준 datetime64로 변환합니다. 형식 오류는 NaT.
+    요일/월 이름은 로케일과 무관하게 처리하고, +0900이 아닌 오프셋도 한국 시간으로 환산합니다.
+    """
+    text = pd.Series(values, dtype="object").astype("string")
+    fixed = text.str.fullmatch(PUBDATE_PATTERN).fillna(False).astype(bool)
+
+    # 1. 고정 폭 형식 ("Fri, 17 Oct 2025 09:30:00 +0900"): 잘라 붙여서 ISO 형식으로 한 번에 변환
+    iso = text.str[12:16] + "-" + text.str[8:11].str.title().map(MONTHS) + "-" + text.str[5:7] + " " + text.str[17:25]
+    local = pd.to_datetime(iso.where(fixed), format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    tz = pd.to_numeric(text.str[26:31].where(fixed), errors="coerce").astype(float)
+    offset_min = tz.abs() // 100 * 60 + tz.abs() % 100
+    offset = pd.to_timedelta(offset_min.where(tz >= 0, -offset_min), unit="m")
+    result = local - offset + LOCAL_TZ.utcoffset(None)
+
+    # 2. 그 밖의 형식은 한 건씩 (드묾)
+    other = ~fixed & text.notna()
+    if other.any():
+        result[other] = pd.to_datetime(text[other].map(_parse_pubdate), errors="coerce")
+    return result
+
+
+def normalize_text(values):
+    """태그 제거 -> HTML 엔티티 변환(&quot; 등) -> 공백 정리를 열 단위로 처리합니다. 문자열이 아니면 NA."""
+    text = pd.Series(values, dtype="object")
+    text = text.where(text.map(type) == str).astype("string")
+    text = text.str.replace(TAG_PATTERN, "", regex=True)
+
+    # 자주 나오는 엔티티 외의 것(&#x27;, &middot; 등)이나 단독 &가 있는 행은 html.unescape로 한 건씩 처리
+    rare = (text.str.count("&") > text.str.count(COMMON_ENTITY_PATTERN)).fillna(False).astype(bool)
+    unescaped = text[rare].map(html.unescape) if rare.any() else None
+    # 나머지는 열 전체에 문자열 치환 (&amp;는 마지막에)
+    for entity, char in COMMON_ENTITIES:
+        text = text.str.replace(entity, char, regex=False)
+    if unescaped is not None:
+        text = text.mask(rare, unescaped)
+    return text.str.replace(SPACE_PATTERN, " ", regex=True).str.strip()
+
+
+def clean_items(results):
+    """
+    원본 item 목록을 정제된 DataFrame으로 변환합니다. (강의록 로직을 열 단위로 처리)
+    발행 시각을 해석할 수 없거나 제목/요약이 없는 행은 제외하고, 제외한 행 수를
+    perf 카운터(api.rejected.*)와 결과의 attrs["rejected"]에 남깁니다.
+    """
     if not results:
         return pd.DataFrame()
 
-    df = pd.DataFrame()
-    remove_tags = re.compile(r'<.*?>') # 태그 제거 패턴
+    raw = pd.DataFrame.from_records(results)
+    for col in ITEM_FIELDS:
+        if col not in raw:
+            raw[col] = None
 
-    clean_data_list = [] # 속도 최적화를 위해 리스트 사용
+    df = pd.DataFrame({
+        "pubDate": parse_pubdates(raw["pubDate"]),
+        "title": normalize_text(raw["title"]),
+        "description": normalize_text(raw["description"]),
+        # 중복 판단용 링크는 그대로 유지
+        "link": raw["link"].fillna("").astype(str),
+        "originallink": raw["originallink"].fillna("").astype(str),
+    })
 
-    for item in results:
-        try:
-            # 날짜 변환
-            pubDate = datetime.strptime(item['pubDate'], "%a, %d %b %Y %H:%M:%S +0900")
-            # 태그 제거
-            title = re.sub(remove_tags, '', item['title'])
-            description = re.sub(remove_tags, '', item['description'])
-            
-            clean_data_list.append({
-                'pubDate': pubDate,
-                'title': title,
-                'description': description
-            })
-        except Exception:
-            continue
-
-    # 리스트를 DataFrame으로 변환
-    df = pd.DataFrame(clean_data_list)
-    
-    return df
\ No newline at end of file
+    # 제외할 행 (사유별로 집계)
+    bad_date = df["pubDate"].isna()
+    bad_text = (df["title"].isna() | df["description"].isna()) & ~bad_date
+    rejected = {"pubDate": int(bad_date.sum()), "text": int(bad_text.sum())}
+    for reason, n in rejected.items():
+        if n:
+            perf.incr(f"api.rejected.{reason}", n)
+
+    df = df[~(bad_date | bad_text)].reset_index(drop=True)
+    df["title"] = df["title"].astype(str)
+    df["description"] = df["description"].astype(str)
+    df.attrs["rejected"] = rejected
+    return df
+
+
+def iter_naver_news(keyword, num_data=1000, **kwargs):
+    """
+    스트리밍 모드: API 페이지가 도착할 때마다 정제된 DataFrame 배치를 yield합니다.
+    첫 배치는 첫 페이지(최대 100건)만 받으면 바로 나온다.
+    """
+    for page in iter_news_pages(keyword, num_data, **kwargs):
+        batch = clean_items(page)
+        if not batch.empty:
+            yield batch
+
+
+def get_naver_news(keyword, num_data=1000, **kwargs):
+    """
+    강의록의 수집 로직을 함수로 변환한 것
+    """
+    with perf.stage("api.fetch", num_data=num_data) as span:
+        results = fetch_news_items(keyword, num_data, **kwargs)
+        span["items"] = len(results)
+
+    # 4. 데이터프레임 변환 및 전처리 (강의록 로직)
+    with perf.stage("api.clean") as span:
+        df = clean_items(results)
+        span["rows"] = len(df)
+    return df
@@ -0,0 +1,215 @@
+# batch.py
+# Streamlit 없이 여러 검색어의 분석 결과를 한 번에 만들어 파일로 저장한다. (야간 리포트용)
+# 검색어마다 수집 -> 형태소 분석 -> 빈도/동시 등장 -> 시계열을 실행하고
+#   <out>/<검색어>/freq, edges, daily_volume, time_series (.parquet 또는 .json) + summary.json
+# 을 남긴다.
+#
+# 수집/형태소 분석은 대시보드와 같은 저장소(store)와 명사 캐시, 코퍼스 폴더를 쓰므로
+# 배치를 돌려 둔 검색어는 대시보드에서 검색해도 형태소 분석 없이 바로 결과가 나온다.
+# 대시보드는 검색할 때 먼저 find_report로 설정이 같은 최신 리포트(REPORT_MAX_AGE 안)를 찾아서 바로 보여준다.
+#
+# 사용법: python batch.py "케이팝 데몬 헌터스" "케데헌" --num 1000 --workers 4 --out ./reports
+#        python batch.py --keywords-file watchlist.txt --format json
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import store
+import nlp
+import cooccur
+import pipeline
+import dedup
+import perf
+
+REPORT_DIR = "./data/reports"
+KEYWORD_WORKERS = 4  # 동시에 처리할 검색어 수 (수집 대기 시간이 겹치도록)
+REPORT_MAX_AGE = 24 * 3600  # 대시보드가 그대로 보여줄 리포트의 최대 나이(초) (야간 배치 주기)
+
+
+def report_dir(keyword, root=None):
+    """검색어별 결과 폴더 (파일 이름에 쓸 수 없는 문자와 공백은 _로 바꿈)"""
+    return os.path.join(root or REPORT_DIR, re.sub(r'[\\/:*?"<>|\s]+', "_", keyword.strip()))
+
+
+def _write_table(df, path, fmt):
+    if fmt == "parquet":
+        df.to_parquet(path + ".parquet", index=False)
+    else:
+        df.to_json(path + ".json", orient="records", force_ascii=False, date_format="iso")
+
+
+def analyze_keyword(keyword, num_data=1000, min_len=2, window=0, edge_top_n=50,
+                    ts_top_n=5, workers=1, store_path=None, dedup_mode="collapse", **fetch_kwargs):
+    """
+    한 검색어의 전체 분석을 실행하고 결과 표들을 dict로 반환합니다.
+    {"articles", "analyzed", "freq", "edges", "daily_volume", "time_series", "corpus_path"}
+    dedup_mode는 대시보드의 "유사 기사 처리"와 같습니다. (같아야 코퍼스를 공유)
+    """
+    with perf.stage("batch.fetch", keyword=keyword):
+        df = store.collect_news(keyword, num_data, store_path or store.STORE_PATH, **fetch_kwargs)
+    if df.empty:
+        return None
+
+    analysis_df, weights = dedup.reduce_duplicates(df, dedup_mode)
+    freq, cooc, corpus_path = pipeline.analyze(analysis_df, keyword, min_len, window, workers, weights=weights)
+    daily_volume, time_series_df = pipeline.time_series(corpus_path, freq, ts_top_n, weights,
+                                                         article_dates=df["pubDate"])
+    edges = cooccur.top_edges(cooc, edge_top_n)
+
+    return {
+        "articles": len(df),
+        "analyzed": len(analysis_df),
+        "freq": pd.DataFrame(freq.most_common(), columns=["단어", "빈도"]),
+        "edges": pd.DataFrame(
+            [(u, v, weight) for (u, v), weight in edges], columns=["단어1", "단어2", "빈도"]
+        ),
+        "daily_volume": daily_volume,
+        "time_series": time_series_df,
+        "corpus_path": corpus_path,
+    }
+
+
+def write_report(keyword, result, root=None, fmt="parquet", params=None):
+    """analyze_keyword 결과를 검색어 폴더에 저장하고 폴더 경로를 반환합니다."""
+    path = report_dir(keyword, root)
+    os.makedirs(path, exist_ok=True)
+    for name in ("freq", "edges", "daily_volume", "time_series"):
+        _write_table(result[name], os.path.join(path, name), fmt)
+
+    summary = {
+        "keyword": keyword,
+        "articles": result["articles"],
+        "analyzed": result["analyzed"],
+        "terms": len(result["freq"]),
+        "corpus": os.path.basename(result["corpus_path"]),
+        "format": fmt,
+        "params": params or {},
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with open(os.path.join(path, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def _read_summary(path):
+    summary_path = os.path.join(path, "summary.json")
+    if not os.path.exists(summary_path):
+        return None
+    with open(summary_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_report(keyword, root=None):
+    """저장된 결과를 읽어 {"summary", "freq", "edges", "daily_volume", "time_series"}로 반환합니다. (없으면 None)"""
+    path = report_dir(keyword, root)
+    summary = _read_summary(path)
+    if summary is None:
+        return None
+
+    report = {"summary": summary}
+    for name in ("freq", "edges", "daily_volume", "time_series"):
+        if summary["format"] == "parquet":
+            report[name] = pd.read_parquet(os.path.join(path, name + ".parquet"))
+        else:
+            table = pd.read_json(os.path.join(path, name + ".json"), orient="records",
+                                 convert_dates=False)
+            # JSON에는 날짜가 문자열로 저장되므로 Parquet과 같은 날짜(date) 형식으로 되돌림
+            for col in ("date", "날짜"):
+                if col in table:
+                    table[col] = pd.to_datetime(table[col]).dt.date
+            report[name] = table
+    return report
+
+
+def find_report(keyword, params, root=None, max_age=REPORT_MAX_AGE):
+    """
+    params(분석 설정 일부, 예: {"num_data", "min_len", "window", "dedup_mode"})가 모두 같고
+    max_age초 안에 만든 리포트가 있으면 load_report 결과를, 없으면 None을 반환합니다.
+    """
+    summary = _read_summary(report_dir(keyword, root))
+    if summary is None or summary.get("keyword") != keyword:
+        return None
+    if any(summary["params"].get(k) != v for k, v in params.items()):
+        return None
+    if datetime.now() - datetime.fromisoformat(summary["generated_at"]) > timedelta(seconds=max_age):
+        return None
+    return load_report(keyword, root)
+
+
+def run_batch(keywords, num_data=1000, min_len=2, window=0, edge_top_n=50, ts_top_n=5,
+              workers=nlp.DEFAULT_WORKERS, keyword_workers=KEYWORD_WORKERS,
+              out=None, fmt="parquet", store_path=None, dedup_mode="collapse", **fetch_kwargs):
+    """
+    여러 검색어를 동시에 분석하여 저장합니다.
+    검색어별 수집은 스레드로 겹쳐서 실행하고, 형태소 분석은 모든 검색어가
+    하나의 프로세스 풀(nlp의 workers개 워커)을 함께 사용합니다.
+    반환값: {검색어: {"status": "ok" | "empty" | "error", "path" 또는 "error"}}
+    """
+    keywords = list(dict.fromkeys(k.strip() for k in keywords if k.strip()))
+    params = {"num_data": num_data, "min_len": min_len, "window": window,
+              "edge_top_n": edge_top_n, "ts_top_n": ts_top_n, "dedup_mode": dedup_mode}
+    if workers > 1:
+        nlp.warm_up(workers)  # 모든 검색어가 공유할 워커 프로세스를 미리 시작
+
+    def run_one(keyword):
+        with perf.stage("batch.keyword", keyword=keyword):
+            result = analyze_keyword(keyword, workers=workers, store_path=store_path,
+                                     **params, **fetch_kwargs)
+            if result is None:
+                return None
+            return write_report(keyword, result, out, fmt, params)
+
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(keyword_workers, len(keywords) or 1))) as executor:
+        futures = {keyword: executor.submit(run_one, keyword) for keyword in keywords}
+        for keyword, future in futures.items():
+            try:
+                path = future.result()
+            except Exception as e:
+                # 한 검색어가 실패해도 나머지 결과는 유지
+                outcomes[keyword] = {"status": "error", "error": str(e)}
+                continue
+            outcomes[keyword] = {"status": "ok", "path": path} if path else {"status": "empty"}
+    return outcomes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="여러 검색어의 뉴스 분석 결과를 파일로 저장합니다.")
+    parser.add_argument("keywords", nargs="*", help="검색어 목록")
+    parser.add_argument("--keywords-file", help="한 줄에 검색어 하나씩 적은 파일")
+    parser.add_argument("--num", type=int, default=1000, help="검색어별 수집 기사 수")
+    parser.add_argument("--min-len", type=int, default=2)
+    parser.add_argument("--window", type=int, default=0, help="동시 등장 범위 (0 = 기사 전체)")
+    parser.add_argument("--edges", type=int, default=50, help="저장할 상위 관계 수")
+    parser.add_argument("--ts-top-n", type=int, default=5)
+    parser.add_argument("--dedup", choices=dedup.MODES, default="collapse", help="유사 기사 처리")
+    parser.add_argument("--workers", type=int, default=nlp.DEFAULT_WORKERS, help="형태소 분석 프로세스 수")
+    parser.add_argument("--keyword-workers", type=int, default=KEYWORD_WORKERS, help="동시에 처리할 검색어 수")
+    parser.add_argument("--format", choices=["parquet", "json"], default="parquet")
+    parser.add_argument("--out", default=REPORT_DIR)
+    args = parser.parse_args(argv)
+
+    keywords = list(args.keywords)
+    if args.keywords_file:
+        with open(args.keywords_file, encoding="utf-8") as f:
+            keywords += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not keywords:
+        parser.error("검색어를 하나 이상 입력하세요.")
+
+    outcomes = run_batch(
+        keywords, num_data=args.num, min_len=args.min_len, window=args.window,
+        edge_top_n=args.edges, ts_top_n=args.ts_top_n, dedup_mode=args.dedup, workers=args.workers,
+        keyword_workers=args.keyword_workers, out=args.out, fmt=args.format,
+    )
+    print(json.dumps(outcomes, ensure_ascii=False, indent=2))
+    return 1 if any(v["status"] == "error" for v in outcomes.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# benchmarks/bench_fetch.py
+# 수집 동시성 리포트: 동시 요청 수(max_workers)를 바꿔 가며 같은 양의 기사를 받는 데 걸리는 시간을 잰다.
+# 로컬 가짜 API(stub_server)에 요청마다 지연(latency)을 주어 네트워크 왕복 시간을 흉내 내므로,
+# 호출 수 제한(--rate)에 걸리기 전까지는 걸리는 시간이 대략 (페이지 수 / max_workers) x latency로 줄어야 한다.
+# 사용법: python benchmarks/bench_fetch.py --items 2000 --latency 0.1 --workers 1 2 4 8 --repeat 3
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import api
+import perf
+import synthetic
+from stub_server import StubNewsServer
+
+
+def fetch_once(keyword, n, base_url, workers, rate):
+    """기사 n건을 한 번 수집하고 (경과 시간, 받은 기사 수, 요청 수)를 반환합니다."""
+    before = perf.counters("api.requests").get("api.requests", 0)
+    t = time.perf_counter()
+    items = api.fetch_news_items(keyword, n, base_url=base_url, max_workers=workers, rate_per_sec=rate)
+    elapsed = time.perf_counter() - t
+    return elapsed, len(items), perf.counters("api.requests").get("api.requests", 0) - before
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency", type=float, default=0.1, help="가짜 API 요청당 지연(초)")
+    parser.add_argument("--rate", type=float, default=1000.0, help="초당 호출 수 제한 (실제 API는 10)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keyword", default=synthetic.KEYWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="결과 JSON 파일 (없으면 표준 출력)")
+    args = parser.parse_args()
+
+    items = synthetic.generate_items(args.items, keyword=args.keyword, seed=args.seed)
+    pages = -(-args.items // api.DISPLAY_COUNT)
+    results = []
+    with StubNewsServer(items, latency=args.latency) as base_url:
+        # 연결 수립(keep-alive 연결 풀 채우기)은 측정에서 제외
+        fetch_once(args.keyword, args.items, base_url, max(args.workers), args.rate)
+        for workers in args.workers:
+            runs = [fetch_once(args.keyword, args.items, base_url, workers, args.rate)
+                    for _ in range(args.repeat)]
+            best, n_items, n_requests = min(runs)
+            results.append({
+                "max_workers": workers,
+                "seconds": round(best, 4),
+                "items": n_items,
+                "requests": n_requests,
+                "pages_per_sec": round(pages / best, 2),
+                # 요청을 하나씩 보낼 때의 이론값 (페이지 수 x 지연) 대비 속도
+                "speedup_vs_serial_latency": round(pages * args.latency / best, 2) if args.latency else None,
+            })
+
+    report = {
+        "items": args.items,
+        "pages": pages,
+        "latency_s": args.latency,
+        "rate_per_sec": args.rate,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
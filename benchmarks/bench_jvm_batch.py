@@ -0,0 +1,49 @@
+# benchmarks/bench_jvm_batch.py
+# Okt 호출 방식 비교: 문서마다 okt.nouns 호출 vs 여러 문서를 묶어 JVM 한 번 호출 (nlp.BATCH_CHARS 단위)
+# 문서는 합성 뉴스 기사의 제목 + 요약 (실제 분석과 같은 길이의 짧은 텍스트)
+# 사용법: python benchmarks/bench_jvm_batch.py --sizes 1000 10000 --repeat 3
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+import api
+import nlp
+import pipeline
+import synthetic
+
+
+def best_time(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-chars", type=int, default=nlp.BATCH_CHARS, help="JVM 호출 한 번에 보낼 글자 수")
+    args = parser.parse_args()
+
+    nlp.BATCH_CHARS = args.batch_chars
+    nlp.get_okt().nouns("워밍업")  # JVM 시작 비용 제외
+
+    for n in args.sizes:
+        docs = pipeline.doc_texts(api.clean_items(synthetic.generate_items(n))).tolist()
+        per_doc, expected = best_time(lambda: nlp.extract_nouns(docs, 1, batch=False), args.repeat)
+        batched, result = best_time(lambda: nlp.extract_nouns(docs, 1, batch=True), args.repeat)
+        same = "OK" if result == expected else "MISMATCH"
+        print(
+            f"docs={n:<7} per-doc {per_doc:8.2f}s ({n / per_doc:8.0f} docs/s)  "
+            f"batched {batched:8.2f}s ({n / batched:8.0f} docs/s)  x{per_doc / batched:5.2f}  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
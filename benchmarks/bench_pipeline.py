@@ -0,0 +1,157 @@
+# benchmarks/bench_pipeline.py
+# 전체 파이프라인 단계별 시간/최대 메모리 측정 (Streamlit, 네이버 API 없이 오프라인 실행)
+#   수집(get_naver_news, 로컬 가짜 API) -> 형태소 분석/코퍼스 저장 -> 빈도/동시 등장
+#   -> 그래프 지표(PageRank, 커뮤니티) -> 상위 엣지 -> 시계열 -> 네트워크 레이아웃 -> 워드클라우드/막대 그래프 렌더링
+# 결과는 JSON으로 출력하여 성능 회귀를 비교할 수 있게 한다.
+# 사용법: python benchmarks/bench_pipeline.py --sizes 1000 10000 100000 --workers 4 --out bench.json
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import api
+import nlp
+import cooccur
+import graph
+import pipeline
+import synthetic
+from stub_server import StubNewsServer
+
+FONT_PATH = "./fonts/AppleSDGothicNeoB.ttf"
+
+
+def max_rss_mb():
+    """프로세스 최대 RSS (MB). resource 모듈이 없는 OS(Windows)에서는 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class StageTimer:
+    """단계별 경과 시간과 파이썬 힙 최대 사용량(tracemalloc)을 기록합니다."""
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.stages = {}
+
+    def run(self, name, fn, *args, **kwargs):
+        if self.memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        t = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - t
+        stage = {"seconds": round(elapsed, 4)}
+        if self.memory:
+            stage["peak_mb"] = round((tracemalloc.get_traced_memory()[1] - base) / (1024 * 1024), 2)
+        self.stages[name] = stage
+        return result
+
+
+def run_size(n, args, workdir):
+    """기사 n건으로 파이프라인 전체를 한 번 실행하고 단계별 측정값을 반환합니다."""
+    # 캐시가 없는 상태(콜드)에서 측정: 크기마다 별도의 명사 캐시/코퍼스 폴더 사용
+    nlp.NOUN_CACHE_PATH = os.path.join(workdir, f"noun_cache_{n}.sqlite3")
+    nlp.clear_noun_cache()
+    corpus_root = os.path.join(workdir, f"corpus_{n}")
+
+    items = synthetic.generate_items(n, keyword=args.keyword, seed=args.seed)
+    timer = StageTimer(memory=not args.no_memory)
+    font_path = FONT_PATH if os.path.exists(FONT_PATH) else None
+
+    with StubNewsServer(items, latency=args.latency) as base_url:
+        df = timer.run("fetch", api.get_naver_news, args.keyword, n, base_url=base_url,
+                       max_workers=args.fetch_workers, rate_per_sec=args.rate)
+    del items
+
+    stop_words = pipeline.load_stop_words(args.keyword)
+    corpus_path = timer.run("tokenize", pipeline.build_corpus, df, args.workers, corpus_root)
+    freq, cooc = timer.run("analyze", pipeline.analyze_corpus, corpus_path, stop_words,
+                           args.min_len, args.window)
+    timer.run("graph", graph.analyze_graph, cooc)
+    edges = timer.run("top_edges", cooccur.top_edges, cooc, args.edges)
+    timer.run("time_series", pipeline.time_series, corpus_path, freq, args.ts_top_n)
+    timer.run("layout", pipeline.network_layout, edges)
+    if not args.no_render:
+        timer.run("render_wordcloud", pipeline.render_wordcloud_png,
+                  dict(freq.most_common(args.wc_top_n)), pipeline.WORDCLOUD_SIZE, font_path)
+        top_df = pd.DataFrame(freq.most_common(args.ts_top_n), columns=["단어", "빈도"])
+        timer.run("render_barplot", pipeline.render_barplot_png, top_df, "키워드 빈도")
+    # 같은 기사 묶음을 다시 분석 (명사 캐시/코퍼스 재사용)
+    timer.run("reanalyze", pipeline.analyze, df, args.keyword, args.min_len, args.window,
+              args.workers, stop_words, corpus_root)
+
+    return {
+        "n_articles": n,
+        "n_rows": len(df),
+        "n_terms": len(freq),
+        "n_pairs": int(cooc.matrix.nnz),
+        "stages": timer.stages,
+        "total_seconds": round(sum(s["seconds"] for s in timer.stages.values()), 4),
+        "max_rss_mb": max_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--workers", type=int, default=1, help="형태소 분석 프로세스 수")
+    parser.add_argument("--fetch-workers", type=int, default=api.MAX_WORKERS)
+    parser.add_argument("--rate", type=float, default=1000.0, help="가짜 API 초당 호출 수 제한")
+    parser.add_argument("--latency", type=float, default=0.0, help="가짜 API 요청당 지연(초)")
+    parser.add_argument("--keyword", default=synthetic.KEYWORD)
+    parser.add_argument("--min-len", type=int, default=2)
+    parser.add_argument("--window", type=int, default=0)
+    parser.add_argument("--edges", type=int, default=50)
+    parser.add_argument("--wc-top-n", type=int, default=80)
+    parser.add_argument("--ts-top-n", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 끄기 (시간만 측정)")
+    parser.add_argument("--no-render", action="store_true", help="차트 렌더링 단계 생략")
+    parser.add_argument("--out", help="결과 JSON 파일 (없으면 표준 출력)")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # 불용어/폰트 상대 경로
+    if not args.no_memory:
+        tracemalloc.start()
+
+    workdir = tempfile.mkdtemp(prefix="bench-pipeline-")
+    try:
+        results = [run_size(n, args, workdir) for n in args.sizes]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_startup.py
+# 시작 시간 리포트: (1) 첫 화면 전에 import하는 모듈의 시간 (기존 eager vs 현재 lazy)
+#                  (2) 첫 분석 지연 (JVM 콜드 스타트 vs 백그라운드 워밍업 후)
+# 사용법: python benchmarks/bench_startup.py --repeat 3 --typing 3
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# 기존 main.py가 첫 화면 전에 import하던 모듈
+EAGER_IMPORTS = [
+    "streamlit", "pandas", "matplotlib.pyplot", "matplotlib.font_manager", "wordcloud",
+    "konlpy.tag", "networkx", "seaborn", "altair", "plotly.express",
+]
+
+
+def main_imports(path=os.path.join(ROOT, "main.py")):
+    """
+    현재 main.py가 첫 화면 전에 import하는 모듈. (모듈 최상위의 import 문만, 차트 섹션 안의 import는 제외)
+    목록을 따로 적어 두면 main.py에 모듈이 추가될 때 어긋나므로 main.py에서 직접 읽는다.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+# 현재 main.py가 첫 화면 전에 import하는 모듈 (나머지는 차트 섹션에서 import)
+LAZY_IMPORTS = main_imports()
+
+IMPORT_SNIPPET = """
+import importlib, time
+t = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+print(time.perf_counter() - t)
+"""
+
+FIRST_ANALYSIS_SNIPPET = """
+import time, nlp
+docs = ["케이팝 데몬 헌터스가 넷플릭스에서 공개된 뒤 미국 음원 차트에서 인기를 끌었다."] * 100
+if {warm}:
+    nlp.warm_up_async()
+    time.sleep({typing})  # 사용자가 검색어를 입력하는 시간
+t = time.perf_counter()
+nlp.extract_nouns(docs)
+print(time.perf_counter() - t)
+"""
+
+
+def run(snippet):
+    """새 파이썬 프로세스에서 snippet을 실행하고 출력된 시간(초)을 반환합니다."""
+    out = subprocess.run(
+        [sys.executable, "-c", snippet], cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": ROOT},
+    )
+    if out.returncode != 0:
+        return None
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def best_of(snippet, repeat):
+    times = [t for t in (run(snippet) for _ in range(repeat)) if t is not None]
+    return min(times) if times else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--typing", type=float, default=3.0, help="워밍업 후 첫 분석까지 대기(초)")
+    args = parser.parse_args()
+
+    report = {
+        "lazy_imports": LAZY_IMPORTS,
+        "import_eager_s": best_of(IMPORT_SNIPPET.format(modules=EAGER_IMPORTS), args.repeat),
+        "import_lazy_s": best_of(IMPORT_SNIPPET.format(modules=LAZY_IMPORTS), args.repeat),
+        "first_analysis_cold_s": best_of(FIRST_ANALYSIS_SNIPPET.format(warm=False, typing=0), args.repeat),
+        "first_analysis_warm_s": best_of(
+            FIRST_ANALYSIS_SNIPPET.format(warm=True, typing=args.typing), args.repeat
+        ),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_tokenize.py
+# 형태소 분석 직렬/병렬 모드 속도 비교
+# 사용법: python benchmarks/bench_tokenize.py --docs 1000 --workers 1 2 4 8
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+import nlp
+
+WORDS = [
+    "케이팝", "데몬", "헌터스", "넷플릭스", "애니메이션", "영화", "인기", "미국", "음원", "차트",
+    "팬덤", "공개", "기록", "흥행", "아이돌", "콘서트", "무대", "성우", "제작", "감독",
+]
+JOSA = ["이", "가", "은", "는", "을", "를", "의", "에서", "와", "로"]
+
+
+def make_docs(n, seed=42):
+    """제목 + 요약 길이(약 40어절)의 합성 문서 n개"""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) + rng.choice(JOSA) for _ in range(40)) + " 밝혔다."
+        for _ in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    docs = make_docs(args.docs)
+    nlp.get_okt().nouns("워밍업")  # 직렬 모드 JVM 시작 비용 제외
+
+    baseline = None
+    for workers in args.workers:
+        if workers > 1:
+            nlp.extract_nouns(docs[: workers * 2], workers)  # 워커 프로세스 기동 비용 제외
+        start = time.perf_counter()
+        result = nlp.extract_nouns(docs, workers)
+        elapsed = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = (result, elapsed)
+        same = "OK" if result == baseline[0] else "MISMATCH"
+        print(f"workers={workers:<3} {elapsed:8.2f}s  x{baseline[1] / elapsed:5.2f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
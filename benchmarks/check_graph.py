@@ -0,0 +1,36 @@
+# benchmarks/check_graph.py
+# 그래프 지표의 경계 사례 확인: 명사가 하나도 없는 코퍼스(단어 0개), 단어는 있지만 관계가 없는 코퍼스.
+# (분석 작업은 항상 graph.analyze_graph를 부르므로 여기서 예외가 나면 검색 전체가 실패한다)
+# 사용법: python benchmarks/check_graph.py
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+import cooccur
+import graph
+
+
+def check(doc_terms, n_terms):
+    cooc = cooccur.build_cooccurrence(doc_terms)
+    stats = graph.analyze_graph(cooc)
+    for name in ("degree", "strength", "pagerank", "community"):
+        assert len(getattr(stats, name)) == n_terms, name
+    assert len(graph.top_nodes(stats, 10)) == 0
+    assert graph.subgraph_edges(cooc, stats, 10, "edges") == []
+    assert graph.subgraph_edges(cooc, stats, 10, "pagerank") == []
+    assert (stats.community == -1).all()
+    return stats
+
+
+def main():
+    check([[], []], 0)                          # 명사 없음 (V=0)
+    stats = check([["케이팝"], ["데몬"]], 2)      # 단어만 있고 관계 없음 (V>0, 엣지 0)
+    assert np.allclose(stats.pagerank, 0.5)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/stub_server.py
+# 네이버 뉴스 검색 API를 흉내 내는 로컬 HTTP 서버 (오프라인 벤치마크용)
+# GET /v1/search/news?query=...&start=...&display=...&sort=date
+# 실제 API와 달리 start 제한(1000)이 없어서 10만 건 이상도 수집할 수 있다.
+#
+# 사용법:
+#   with StubNewsServer(items, latency=0.05) as base_url:
+#       df = api.get_naver_news(keyword, 1000, base_url=base_url)
+#   python benchmarks/stub_server.py --items 10000 --port 8765   (단독 실행)
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+
+NEWS_PATH = "/v1/search/news"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (api.py의 연결 재사용)
+
+    def do_GET(self):
+        server = self.server
+        parts = urllib.parse.urlsplit(self.path)
+        if parts.path != NEWS_PATH:
+            self._send(404, {"errorMessage": "Not Found"})
+            return
+        query = urllib.parse.parse_qs(parts.query)
+        try:
+            start = int(query.get("start", ["1"])[0])
+            display = min(int(query.get("display", ["10"])[0]), 100)
+        except ValueError:
+            self._send(400, {"errorMessage": "Invalid parameter"})
+            return
+
+        with server.lock:
+            server.requests += 1
+            fail = server.fail_every and server.requests % server.fail_every == 0
+        if server.latency:
+            time.sleep(server.latency)
+        if fail:
+            # 일시적 오류 (api.py의 재시도 동작 확인용)
+            self._send(503, {"errorMessage": "Service Unavailable"})
+            return
+
+        items = server.items[start - 1:start - 1 + display]
+        self._send(200, {
+            "lastBuildDate": synthetic.format_pubdate(synthetic.START_TIME),
+            "total": len(server.items),
+            "start": start,
+            "display": len(items),
+            "items": items,
+        })
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 요청 로그 출력 안 함
+
+
+class StubNewsServer:
+    """백그라운드 스레드에서 도는 가짜 뉴스 API 서버. with 문에서 base_url을 반환합니다."""
+
+    def __init__(self, items, host="127.0.0.1", port=0, latency=0.0, fail_every=0):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.items = items
+        self.httpd.latency = latency        # 요청당 지연 (초)
+        self.httpd.fail_every = fail_every  # N번째 요청마다 503 (0이면 없음)
+        self.httpd.requests = 0
+        self.httpd.bytes_sent = 0
+        self.httpd.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{NEWS_PATH}"
+
+    def stats(self):
+        with self.httpd.lock:
+            return {"requests": self.httpd.requests, "bytes": self.httpd.bytes_sent}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = StubNewsServer(synthetic.generate_items(args.items, seed=args.seed),
+                            port=args.port, latency=args.latency)
+    print(f"serving {args.items} items at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
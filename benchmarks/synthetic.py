@@ -0,0 +1,71 @@
+# benchmarks/synthetic.py
+# 네이버 뉴스 검색 API 응답과 같은 형태의 합성 기사(item) 생성기
+# - 제목/요약에 <b>검색어</b> 태그와 &quot; 같은 HTML 엔티티 포함
+# - pubDate는 "Fri, 17 Oct 2025 09:30:00 +0900" 형식, 최신순 (sort=date)
+# - 같은 기사를 여러 언론사가 전재한 중복 기사 (제목/요약 같고 링크만 다름)
+import random
+from datetime import datetime, timedelta
+
+KEYWORD = "케이팝 데몬 헌터스"
+NOUNS = [
+    "케이팝", "데몬", "헌터스", "넷플릭스", "애니메이션", "영화", "인기", "미국", "음원", "차트",
+    "팬덤", "공개", "기록", "흥행", "아이돌", "콘서트", "무대", "성우", "제작", "감독",
+    "빌보드", "정상", "유튜브", "조회수", "굿즈", "캐릭터", "세계관", "후속작", "시즌", "관객",
+    "주제가", "스트리밍", "글로벌", "열풍", "한국", "문화", "관광", "팝업", "매출", "소니",
+]
+JOSA = ["이", "가", "은", "는", "을", "를", "의", "에서", "와", "로", "도"]
+ENDINGS = ["밝혔다.", "전했다.", "기록했다.", "나타났다.", "이어지고 있다.", "주목받고 있다."]
+PRESS = ["news1", "yna", "newsis", "edaily", "mk", "hankyung", "chosun", "joongang", "donga", "sbs"]
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+DUPLICATE_RATE = 0.15  # 전재(중복) 기사 비율
+START_TIME = datetime(2025, 10, 17, 9, 0, 0)
+
+
+def format_pubdate(dt):
+    """API와 같은 RFC 2822 형식 (로케일과 무관하게 영문 요일/월)"""
+    return f"{DAYS[dt.weekday()]}, {dt.day:02d} {MONTHS[dt.month - 1]} {dt.year} {dt:%H:%M:%S} +0900"
+
+
+def _phrase(rng, n):
+    return " ".join(rng.choice(NOUNS) + rng.choice(JOSA) for _ in range(n))
+
+
+def _article(rng, keyword):
+    quote = rng.choice(NOUNS)
+    title = f"<b>{keyword}</b> {_phrase(rng, 3)} &quot;{quote}&quot; {rng.choice(ENDINGS)}"
+    description = (
+        f"{_phrase(rng, 6)} <b>{keyword}</b>{rng.choice(JOSA)} {_phrase(rng, 10)} "
+        f"&quot;{_phrase(rng, 3)}&quot;고 {rng.choice(ENDINGS)} {_phrase(rng, 8)} {rng.choice(ENDINGS)}"
+    )
+    return title, description
+
+
+def generate_items(n, keyword=KEYWORD, seed=42, duplicate_rate=DUPLICATE_RATE):
+    """
+    최신순으로 정렬된 합성 item n개를 반환합니다.
+    duplicate_rate 비율만큼은 앞서 나온 기사를 다른 언론사가 조금 뒤에 전재한 기사입니다.
+    """
+    rng = random.Random(seed)
+    items = []
+    originals = []
+    t = START_TIME
+    for i in range(n):
+        # 최신순: 뒤로 갈수록 과거 (평균 약 3분 간격)
+        t -= timedelta(seconds=rng.randint(0, 360))
+        press = rng.choice(PRESS)
+        if originals and rng.random() < duplicate_rate:
+            title, description, originallink = rng.choice(originals[-50:])
+        else:
+            title, description = _article(rng, keyword)
+            originallink = f"https://www.{press}.co.kr/article/{i}"
+            originals.append((title, description, originallink))
+        items.append({
+            "title": title,
+            "originallink": originallink,
+            "link": f"https://n.news.naver.com/mnews/article/{i:03d}/{seed:04d}{i:08d}",
+            "description": description,
+            "pubDate": format_pubdate(t),
+        })
+    return items
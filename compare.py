@@ -0,0 +1,113 @@
+# compare.py
+# 여러 검색어 비교 분석 (예: 작품 제목과 줄임말).
+# 검색어별 수집은 동시에 하고, 기사는 link 기준으로 합쳐서 형태소 분석/코퍼스 저장을 한 번만 한다.
+# 검색어별/공통 빈도와 동시 등장은 같은 코퍼스에서 해당 기사만 골라 계산하므로
+# 비용이 (검색어 수 x 기사 수)가 아니라 중복을 제거한 기사 수에 비례한다.
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import store
+import cooccur
+import corpus
+import pipeline
+import perf
+
+OVERLAP = "공통"   # 모든 검색어에 함께 나온 기사 그룹 이름
+FETCH_WORKERS = 4  # 동시에 수집할 검색어 수
+
+# articles: 중복 제거된 전체 기사 (최신순), membership: 기사별 검색어 포함 여부 (bool 열)
+# freq / cooc: {그룹 이름: Counter / Cooccurrence} (그룹 = 각 검색어 + 공통)
+Comparison = namedtuple(
+    "Comparison", ["keywords", "articles", "membership", "corpus_path", "freq", "cooc"]
+)
+
+
+def collect_union(keywords, num_data=1000, store_path=None, **fetch_kwargs):
+    """
+    검색어별 기사를 동시에 수집하고 link 기준으로 합칩니다.
+    (합친 기사 DataFrame, 검색어별 포함 여부 DataFrame)을 반환합니다.
+    """
+    def fetch(keyword):
+        return store.collect_news(keyword, num_data, store_path or store.STORE_PATH, **fetch_kwargs)
+
+    with perf.stage("compare.fetch", keywords=len(keywords)):
+        with ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, len(keywords)))) as executor:
+            frames = list(executor.map(perf.bind(fetch), keywords))
+    non_empty = [f for f in frames if not f.empty]
+    if not non_empty:
+        return pd.DataFrame(), pd.DataFrame(columns=keywords, dtype=bool)
+
+    # 같은 기사(link)가 여러 검색어에 나와도 한 번만 (순서를 고정해야 코퍼스 ID가 같아짐)
+    articles = (
+        pd.concat(non_empty, ignore_index=True)
+        .drop_duplicates("link")
+        .sort_values(["pubDate", "link"], ascending=[False, True], ignore_index=True)
+    )
+    membership = pd.DataFrame({
+        keyword: articles["link"].isin(frame["link"]) if not frame.empty
+        else np.zeros(len(articles), dtype=bool)
+        for keyword, frame in zip(keywords, frames)
+    })
+    return articles, membership
+
+
+def group_masks(membership):
+    """그룹 이름 -> 기사 bool 마스크 (각 검색어 + 모든 검색어 공통)"""
+    groups = {keyword: membership[keyword].to_numpy() for keyword in membership.columns}
+    if len(groups) > 1:
+        groups[OVERLAP] = membership.all(axis=1).to_numpy()
+    return groups
+
+
+def analyze_groups(corpus_path, groups, stop_words, min_len, window=0):
+    """공유 코퍼스에서 그룹별 빈도(freq)와 동시 등장(cooc)을 계산합니다."""
+    tc = corpus.open_corpus(corpus_path)
+    # 불용어/최소 길이 필터는 전체 코퍼스에 한 번만 적용
+    offsets, tokens = tc.filter(tc.term_mask(stop_words, min_len))
+
+    freq, cooc = {}, {}
+    for name, mask in groups.items():
+        with perf.stage("compare.group", group=name, docs=int(mask.sum())):
+            g_offsets, g_tokens = tc.select(mask, offsets, tokens)
+            freq[name] = tc.freq(g_tokens)
+            cooc[name] = cooccur.cooccurrence_from_ids(tc.vocab, g_offsets, g_tokens, window)
+    return freq, cooc
+
+
+def compare(keywords, num_data=1000, min_len=2, window=0, workers=1, store_path=None, **fetch_kwargs):
+    """
+    여러 검색어를 함께 수집/분석하여 Comparison을 반환합니다. (기사가 하나도 없으면 None)
+    불용어는 모든 검색어의 불용어를 합친 것을 사용합니다. (검색어 자체는 결과에서 제외)
+    """
+    keywords = list(dict.fromkeys(k.strip() for k in keywords if k.strip()))
+    articles, membership = collect_union(keywords, num_data, store_path, **fetch_kwargs)
+    if articles.empty:
+        return None
+
+    stop_words = set().union(*(pipeline.load_stop_words(k) for k in keywords))
+    corpus_path = pipeline.build_corpus(articles, workers)
+    freq, cooc = analyze_groups(corpus_path, group_masks(membership), stop_words, min_len, window)
+    return Comparison(keywords, articles, membership, corpus_path, freq, cooc)
+
+
+def article_counts(comparison):
+    """그룹별 기사 수 + 중복 제거 전/후 기사 수"""
+    counts = {name: int(mask.sum()) for name, mask in group_masks(comparison.membership).items()}
+    counts["수집 합계"] = int(comparison.membership.to_numpy().sum())
+    counts["분석 기사 (중복 제거)"] = len(comparison.articles)
+    return counts
+
+
+def freq_table(comparison, top_n=20):
+    """그룹별 상위 top_n 단어를 합친 (단어 x 그룹) 빈도 표"""
+    words = list(dict.fromkeys(
+        word for f in comparison.freq.values() for word, _ in f.most_common(int(top_n))
+    ))
+    table = pd.DataFrame(
+        {name: [f.get(word, 0) for word in words] for name, f in comparison.freq.items()},
+        index=pd.Index(words, name="단어"),
+    )
+    return table.sort_values(list(table.columns), ascending=False)
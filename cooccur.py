@@ -0,0 +1,119 @@
+# cooccur.py
+# 단어 동시 등장(co-occurrence) 계산.
+# 문서마다 (단어, 단어) 튜플을 만드는 대신 단어를 정수 ID로 바꾸고 희소 행렬 곱으로 쌍 빈도를 구한다.
+# 메모리와 시간이 전체 쌍 등장 횟수가 아니라 서로 다른 쌍의 수에 비례한다.
+from collections import namedtuple
+
+import numpy as np
+import scipy.sparse as sp
+
+CHUNK_DOCS = 2000  # 창(window) 모드에서 한 번에 처리할 문서 수 (최대 메모리 제한)
+
+# vocab: ID 순서의 단어 목록 (가나다순이므로 ID가 작을수록 사전순으로 앞)
+# matrix: (V x V) 상삼각 CSR 행렬. matrix[i, j] (i < j) = 두 단어가 함께 나온 문서 수
+Cooccurrence = namedtuple("Cooccurrence", ["vocab", "matrix"])
+
+
+def build_vocab(doc_terms):
+    """문서별 단어 목록에서 어휘 사전(가나다순 단어 목록, 단어 -> ID)을 만듭니다."""
+    vocab = sorted({term for terms in doc_terms for term in terms})
+    return vocab, {term: i for i, term in enumerate(vocab)}
+
+
+def to_ids(doc_terms, index):
+    """문서별 단어 목록을 CSR 형태 (offsets, tokens) 정수 배열로 바꿉니다."""
+    offsets = np.zeros(len(doc_terms) + 1, dtype=np.int64)
+    np.cumsum([len(terms) for terms in doc_terms], out=offsets[1:])
+    tokens = np.fromiter(
+        (index[t] for terms in doc_terms for t in terms), dtype=np.int32, count=int(offsets[-1])
+    )
+    return offsets, tokens
+
+
+def doc_term_matrix(offsets, tokens, n_terms, binary=True):
+    """문서 x 단어 CSR 행렬. binary=True면 문서 안에서 중복된 단어는 1로 센다."""
+    # sum_duplicates가 indices/indptr 배열을 제자리에서 정렬·압축하므로 호출한 쪽의 tokens/offsets를 바꾸지 않도록 복사
+    X = sp.csr_matrix(
+        (np.ones(len(tokens), dtype=np.int32), np.array(tokens), np.array(offsets)),
+        shape=(len(offsets) - 1, n_terms),
+    )
+    X.sum_duplicates()
+    if binary:
+        X.data[:] = 1
+    return X
+
+
+def _window_pairs(offsets, tokens, V, window, weights=None):
+    """
+    창 크기 window 안에서 함께 나온 쌍을 문서별로 한 번씩 세어 상삼각 행렬로 반환합니다.
+    weights(문서별 가중치)가 있으면 한 번 대신 그 문서의 가중치만큼 셉니다.
+    """
+    C = sp.csr_matrix((V, V), dtype=np.int32)
+    n_docs = len(offsets) - 1
+
+    for start in range(0, n_docs, CHUNK_DOCS):
+        codes = []
+        for d in range(start, min(start + CHUNK_DOCS, n_docs)):
+            ids = np.asarray(tokens[offsets[d]:offsets[d + 1]], dtype=np.int64)
+            for offset in range(1, min(window, len(ids))):
+                a, b = ids[:-offset], ids[offset:]
+                lo, hi = np.minimum(a, b), np.maximum(a, b)
+                keep = lo != hi
+                codes.append(((d - start) * V + lo[keep]) * V + hi[keep])
+        if not codes:
+            continue
+
+        # 같은 문서 안의 같은 쌍은 한 번만
+        docs, pair_codes = np.divmod(np.unique(np.concatenate(codes)), V * V)
+        rows, cols = np.divmod(pair_codes, V)
+        data = (np.ones(len(rows), dtype=np.int32) if weights is None
+                else np.asarray(weights, dtype=np.int32)[start + docs])
+        C = C + sp.csr_matrix((data, (rows, cols)), shape=(V, V))
+    return C
+
+
+def cooccurrence_from_ids(vocab, offsets, tokens, window=None, weights=None):
+    """
+    CSR 형태의 정수 코퍼스 (offsets, tokens)에서 동시 등장 행렬을 만듭니다.
+    window가 없으면 문서 전체를 하나의 범위로 보고 (기존 combinations 방식과 같은 결과),
+    window가 있으면 window개 연속 단어 안에서 함께 나온 경우만 셉니다.
+    weights(문서별 정수 가중치, 예: 유사 기사 묶음 크기)가 있으면 문서 하나를 그만큼 셉니다.
+    """
+    V = len(vocab)
+    if window:
+        C = _window_pairs(offsets, tokens, V, int(window), weights)
+    else:
+        # (단어 x 문서) @ (문서 x 단어) = 두 단어가 함께 나온 문서 수
+        X = doc_term_matrix(offsets, tokens, V)
+        if weights is None:
+            C = sp.triu(X.T @ X, k=1, format="csr")
+        else:
+            W = sp.diags(np.asarray(weights, dtype=np.int32), dtype=np.int32)
+            C = sp.triu(X.T @ (W @ X), k=1, format="csr")
+    C.eliminate_zeros()
+    return Cooccurrence(vocab, C)
+
+
+def build_cooccurrence(doc_terms, window=None):
+    """문서별 단어 목록(순서 유지)에서 동시 등장 행렬을 만듭니다."""
+    doc_terms = list(doc_terms)
+    vocab, index = build_vocab(doc_terms)
+    offsets, tokens = to_ids(doc_terms, index)
+    return cooccurrence_from_ids(vocab, offsets, tokens, window)
+
+
+def top_edges(cooc, n):
+    """빈도 상위 n개 쌍을 [((단어1, 단어2), 빈도), ...] 형태로 반환합니다. (Counter.most_common과 같은 형태)"""
+    if cooc is None or cooc.matrix.nnz == 0 or n <= 0:
+        return []
+    C = cooc.matrix.tocoo()
+    n = min(int(n), C.nnz)
+    # 전체 정렬 대신 n번째 빈도 이상인 후보만 골라서 정렬
+    kth = np.partition(C.data, C.nnz - n)[C.nnz - n]
+    cand = np.flatnonzero(C.data >= kth)
+    # 빈도 내림차순, 같은 빈도는 단어 사전순
+    top = cand[np.lexsort((C.col[cand], C.row[cand], -C.data[cand]))][:n]
+    return [
+        ((cooc.vocab[C.row[k]], cooc.vocab[C.col[k]]), int(C.data[k]))
+        for k in top
+    ]
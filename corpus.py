@@ -0,0 +1,184 @@
+# corpus.py
+# 형태소 분석 결과(문서별 명사)를 디스크에 압축된 형태로 저장하고 메모리 매핑으로 읽는다.
+# 수백만 개의 작은 str 객체 대신 정수 배열만 다루므로 큰 코퍼스도 RAM을 적게 쓰고,
+# 저장된 분석을 다시 열 때는 파일만 매핑하면 된다.
+#
+# <CORPUS_DIR>/<corpus_id>/
+#   vocab.json      어휘 사전 (가나다순, 인덱스 = 단어 ID)
+#   offsets.npy     int64 (n_docs + 1)  문서 i의 단어 = tokens[offsets[i]:offsets[i+1]]
+#   tokens.npy      int32 (n_tokens)    단어 ID (문서 안 등장 순서 유지)
+#   dates.npy       datetime64[s] (n_docs) 기사 발행 시각
+#
+# 기사 묶음이 바뀔 때마다 새 코퍼스가 생기므로, 새로 저장할 때 오래 안 쓴 코퍼스를 지운다. (prune)
+# 코퍼스를 열거나 다시 쓸 때 폴더 수정 시각을 갱신하고(touch), 최근 MAX_CORPORA개와
+# MIN_IDLE초 안에 쓴 코퍼스(분석 캐시에 경로가 남아 있을 수 있음)는 남긴다.
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+CORPUS_DIR = "./data/corpus"
+MAX_CORPORA = int(os.environ.get("CORPUS_KEEP", 64))  # 남길 코퍼스 수 (최근에 쓴 순서)
+MIN_IDLE = 3600  # 이 시간(초) 안에 쓴 코퍼스는 지우지 않음 (분석/시계열 캐시 ttl과 같음)
+
+
+def corpus_id(df):
+    """기사 DataFrame 내용(발행 시각, 제목, 요약)으로 코퍼스 ID를 만듭니다."""
+    digest = hashlib.blake2b(digest_size=16)
+    row_hashes = pd.util.hash_pandas_object(
+        df[["pubDate", "title", "description"]].astype(str), index=False
+    )
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def corpus_path(cid, root=None):
+    return os.path.join(root or CORPUS_DIR, cid)
+
+
+def write_corpus(path, doc_nouns, dates):
+    """
+    문서별 명사 목록을 코퍼스 형식으로 저장합니다.
+    임시 폴더에 쓴 뒤 이름을 바꾸므로, 읽는 쪽은 완성된 코퍼스만 보게 됩니다.
+    """
+    vocab = sorted({n for nouns in doc_nouns for n in nouns})
+    index = {term: i for i, term in enumerate(vocab)}
+
+    lengths = np.fromiter((len(nouns) for nouns in doc_nouns), dtype=np.int64, count=len(doc_nouns))
+    offsets = np.zeros(len(doc_nouns) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    tokens = np.fromiter(
+        (index[n] for nouns in doc_nouns for n in nouns), dtype=np.int32, count=int(offsets[-1])
+    )
+
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        with open(os.path.join(tmp, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(vocab, f, ensure_ascii=False)
+        np.save(os.path.join(tmp, "offsets.npy"), offsets)
+        np.save(os.path.join(tmp, "tokens.npy"), tokens)
+        np.save(os.path.join(tmp, "dates.npy"),
+                pd.to_datetime(pd.Series(dates), errors="coerce").to_numpy().astype("datetime64[s]"))
+        os.replace(tmp, path)
+    except OSError:
+        # 다른 프로세스가 같은 코퍼스를 먼저 저장한 경우 (내용은 같다)
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.isdir(path):
+            raise
+    return path
+
+
+class TokenCorpus:
+    """메모리 매핑된 (읽기 전용) 코퍼스"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "vocab.json"), encoding="utf-8") as f:
+            self.vocab = json.load(f)
+        self.offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        self.tokens = np.load(os.path.join(path, "tokens.npy"), mmap_mode="r")
+        self.dates = np.load(os.path.join(path, "dates.npy"), mmap_mode="r")
+
+    @property
+    def n_docs(self):
+        return len(self.offsets) - 1
+
+    def doc_ids(self):
+        """토큰마다 속한 문서 번호"""
+        return np.repeat(np.arange(self.n_docs), np.diff(self.offsets))
+
+    def term_mask(self, stop_words=(), min_len=1):
+        """불용어/최소 길이 조건을 통과하는 단어 ID면 True인 배열"""
+        return np.array(
+            [len(t) >= min_len and t not in stop_words for t in self.vocab], dtype=bool
+        )
+
+    def filter(self, mask):
+        """mask를 통과한 단어만 남긴 (offsets, tokens). 문서 경계와 단어 순서는 유지됩니다."""
+        keep = mask[self.tokens]
+        # 남은 토큰 수의 누적합을 원래 경계 위치에서 읽으면 새 경계가 된다
+        kept_before = np.zeros(len(keep) + 1, dtype=np.int64)
+        np.cumsum(keep, out=kept_before[1:])
+        return kept_before[self.offsets], np.asarray(self.tokens[keep])
+
+    def select(self, docs, offsets=None, tokens=None):
+        """docs(문서 번호 또는 bool 마스크)의 문서만 남긴 (offsets, tokens). 문서 순서는 유지됩니다."""
+        offsets = self.offsets if offsets is None else offsets
+        tokens = self.tokens if tokens is None else tokens
+        docs = np.asarray(docs)
+        if docs.dtype == bool:
+            docs = np.flatnonzero(docs)
+        starts = np.asarray(offsets)[docs]
+        lengths = np.asarray(offsets)[docs + 1] - starts
+        new_offsets = np.zeros(len(docs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=new_offsets[1:])
+        # 새 위치 k의 토큰 = 원래 위치 (문서 시작 + 문서 안 순번)
+        index = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+        return new_offsets, np.asarray(tokens)[index]
+
+    def term_counts(self, tokens=None, weights=None):
+        """단어 ID별 등장 횟수 (weights: 토큰별 정수 가중치)"""
+        tokens = self.tokens if tokens is None else tokens
+        if weights is None:
+            return np.bincount(tokens, minlength=len(self.vocab))
+        return np.bincount(tokens, weights=weights, minlength=len(self.vocab)).astype(np.int64)
+
+    def freq(self, tokens=None, weights=None):
+        """워드클라우드용 Counter (기존 analyze_data의 freq와 같은 형태)"""
+        counts = self.term_counts(tokens, weights)
+        return Counter({self.vocab[i]: int(counts[i]) for i in np.flatnonzero(counts)})
+
+    def doc_terms(self, offsets=None, tokens=None):
+        """문서별 단어 목록 (str). 필요할 때만 문서 단위로 만든다."""
+        offsets = self.offsets if offsets is None else offsets
+        tokens = self.tokens if tokens is None else tokens
+        for i in range(len(offsets) - 1):
+            yield [self.vocab[t] for t in tokens[offsets[i]:offsets[i + 1]]]
+
+
+def touch(path):
+    """코퍼스를 쓴 시각을 갱신합니다. (prune에서 최근에 쓴 코퍼스로 남김)"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune(root=None, keep=MAX_CORPORA, min_idle=MIN_IDLE):
+    """
+    root 아래 코퍼스 중 최근에 쓴 keep개를 남기고 나머지를 지웁니다. (min_idle초 안에 쓴 코퍼스는 남김)
+    지운 코퍼스 수를 반환합니다.
+    """
+    root = root or CORPUS_DIR
+    try:
+        names = [name for name in os.listdir(root) if not name.startswith(".")]
+    except OSError:
+        return 0
+    entries = []
+    for name in names:
+        path = os.path.join(root, name)
+        try:
+            entries.append((os.stat(path).st_mtime, path))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    now = time.time()
+    removed = 0
+    for mtime, path in entries[keep:]:
+        if now - mtime >= min_idle:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def open_corpus(path):
+    touch(path)
+    return TokenCorpus(path)
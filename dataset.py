@@ -0,0 +1,16 @@
+# dataset.py
+# 수집한 기사 묶음을 가리키는 가벼운 핸들 (검색어 + 내용 지문 + 기사 수).
+# st.cache_data는 인자를 실행(rerun)마다 해시하므로 DataFrame/Counter를 그대로 넘기면
+# 코퍼스가 클수록 매 실행이 느려진다. 지문은 수집 직후 한 번만 계산하고,
+# 분석 캐시는 이 핸들만 키로 쓴다. (DataFrame은 해시하지 않는 _인자로 따로 넘김)
+from collections import namedtuple
+
+import corpus
+
+# fingerprint: 기사 내용(발행 시각, 제목, 요약) 지문 = corpus.corpus_id (같은 기사 묶음이면 같은 값)
+Dataset = namedtuple("Dataset", ["keyword", "fingerprint", "n_articles"])
+
+
+def make_dataset(keyword, df):
+    """수집한 기사 DataFrame의 핸들을 만듭니다. (DataFrame 전체를 한 번 해시)"""
+    return Dataset(keyword, corpus.corpus_id(df), len(df))
@@ -0,0 +1,171 @@
+# dedup.py
+# 유사(전재/일부 수정) 기사 찾기: 문자 n-gram(shingle) + MinHash + LSH.
+# 모든 기사 쌍을 비교하지 않고(O(n^2)), 서명의 일부(band)가 같은 기사끼리만 후보로 묶으므로
+# 기사 수에 거의 비례하는 시간으로 동작한다. 형태소 분석 전에 실행해서 분석할 기사 수를 줄인다.
+#
+# mode
+#   "off"      : 그대로
+#   "collapse" : 묶음마다 대표 기사(가장 먼저 나온 기사) 하나만 분석
+#   "weight"   : 대표 기사만 분석하되, 빈도/동시 등장/시계열에서 묶음 크기만큼 가중치
+#                (완전히 같은 전재 기사는 빈도/동시 등장이 원래 결과와 같고, 형태소 분석은 한 번만.
+#                 시계열에서는 묶음 전체를 대표 기사의 발행일로 센다.)
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+import perf
+
+SHINGLE_SIZE = 4         # 문자 n-gram 길이
+NUM_PERM = 64            # MinHash 서명 길이
+BANDS = 16               # LSH band 수 (band당 NUM_PERM // BANDS행, 유사도 약 0.5부터 후보)
+THRESHOLD = 0.6          # 후보 쌍을 같은 묶음으로 볼 최소 추정 유사도 (Jaccard)
+CHUNK_SHINGLES = 2_000_000  # 한 번에 처리할 shingle 수 (최대 메모리 제한)
+MODES = ["off", "collapse", "weight"]
+# 문장 부호/기호 차이("…" vs ",")는 무시 (한글, 영문, 숫자, 일본어, 한자만 남김)
+# pandas 문자열 정규식 엔진(RE2)은 \w가 ASCII만이므로 문자 범위를 직접 적는다.
+NON_TEXT_PATTERN = "[^0-9a-z가-힣ㄱ-ㅎㅏ-ㅣ\u3040-\u30ff\u4e00-\u9fff]+"
+_ROLL = np.uint64(0x100000001B3)  # k-gram 다항식 해시 곱수
+
+
+def _mix(x):
+    """64비트 해시 섞기 (splitmix64 마무리 단계)"""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _shingle_hashes(texts, k):
+    """
+    모든 문서의 문자 k-gram 해시를 한 배열로 반환합니다. (hashes, 문서별 shingle 시작 위치 offsets)
+    문서들을 하나의 UTF-32 배열로 이어 붙이고 k번의 벡터 연산으로 k-gram 해시를 만든다.
+    """
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+    n_grams = np.maximum(lengths - k + 1, 0)
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum(n_grams, out=offsets[1:])
+    # 문서 경계를 넘지 않는 k-gram 시작 위치
+    text_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    starts = np.repeat(text_starts - offsets[:-1], n_grams) + np.arange(offsets[-1])
+
+    hashes = np.zeros(len(starts), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(k):
+            hashes = hashes * _ROLL + codes[starts + j]
+        # 상위 32비트를 쓰도록 섞은 뒤 32비트로 줄임 (이후 순열 계산을 uint32로)
+        hashes = (_mix(hashes) >> np.uint64(32)).astype(np.uint32)
+    return hashes, offsets
+
+
+def normalize_texts(texts):
+    """소문자로 바꾸고 문장 부호/기호/연속 공백을 공백 하나로 바꾼 텍스트 목록"""
+    return (
+        pd.Series(texts, dtype="string").fillna("").str.lower()
+        .str.replace(NON_TEXT_PATTERN, " ", regex=True).str.strip().tolist()
+    )
+
+
+def minhash_signatures(texts, k=SHINGLE_SIZE, num_perm=NUM_PERM, seed=1):
+    """
+    문서별 MinHash 서명 (n x num_perm, uint32)과 shingle이 있는 문서 여부를 반환합니다.
+    texts는 normalize_texts를 거친 텍스트이고,
+    순열은 (a * x + b) mod 2^32 (a는 홀수)로 근사합니다.
+    """
+    hashes, offsets = _shingle_hashes(texts, k)
+    has_shingles = np.diff(offsets) > 0
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint32) | np.uint32(1)
+    b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint32)
+
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    docs = np.flatnonzero(has_shingles)
+    # 문서 단위로 나눠서 처리 (shingle 수 기준)
+    bounds = np.searchsorted(offsets[docs], np.arange(0, offsets[-1], CHUNK_SHINGLES))
+    bounds = np.unique(np.append(bounds, len(docs)))
+    with np.errstate(over="ignore"):
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            chunk_docs = docs[lo:hi]
+            first, last = offsets[chunk_docs[0]], offsets[chunk_docs[-1] + 1]
+            part = hashes[first:last]
+            starts = offsets[chunk_docs] - first
+            for p in range(num_perm):
+                signatures[chunk_docs, p] = np.minimum.reduceat(a[p] * part + b[p], starts)
+    return signatures, has_shingles
+
+
+def lsh_clusters(signatures, valid=None, bands=BANDS, threshold=THRESHOLD, seed=2):
+    """
+    LSH로 후보 쌍을 찾고, 추정 유사도가 threshold 이상인 쌍을 이어서 묶음 번호(n,)를 반환합니다.
+    band마다 같은 버킷의 첫 문서와 나머지 문서만 비교하므로 후보 수가 문서 수에 비례합니다.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    valid = np.ones(n, dtype=bool) if valid is None else valid
+    ids = np.flatnonzero(valid)
+    multipliers = _mix(np.arange(1, rows + 1, dtype=np.uint64) + np.uint64(seed))
+
+    src, dst = [], []
+    with np.errstate(over="ignore"):
+        for band in range(bands):
+            block = signatures[ids, band * rows:(band + 1) * rows].astype(np.uint64)
+            keys = _mix((block * multipliers).sum(axis=1))
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            leader = ids[first[inverse]]
+            cand = leader != ids
+            a, b = leader[cand], ids[cand]
+            # 서명 일치 비율 = Jaccard 유사도 추정값
+            similar = (signatures[a] == signatures[b]).mean(axis=1) >= threshold
+            src.append(a[similar])
+            dst.append(b[similar])
+
+    src = np.concatenate(src) if src else np.array([], dtype=np.int64)
+    dst = np.concatenate(dst) if dst else np.array([], dtype=np.int64)
+    graph = sp.coo_matrix((np.ones(len(src), dtype=np.int8), (src, dst)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def find_duplicates(df, threshold=THRESHOLD, k=SHINGLE_SIZE, num_perm=NUM_PERM, bands=BANDS):
+    """
+    기사 DataFrame의 유사 기사 묶음을 찾습니다.
+    기사마다 대표 기사(묶음에서 발행 시각이 가장 빠른 기사)의 행 번호를 반환합니다. (혼자면 자기 자신)
+    """
+    if df.empty:
+        return np.array([], dtype=np.int64)
+
+    with perf.stage("dedup", docs=len(df)) as span:
+        texts = normalize_texts(df["title"].fillna("").astype(str) + " " + df["description"].fillna("").astype(str))
+        # 정규화 후 완전히 같은 텍스트는 서명을 한 번만 계산
+        text_ids, unique_texts = pd.factorize(pd.Series(texts))
+        signatures, valid = minhash_signatures(list(unique_texts), k, num_perm)
+        labels = lsh_clusters(signatures, valid, bands, threshold)[text_ids]
+
+        # 묶음별 대표: 발행 시각이 가장 빠른 기사 (같으면 앞 행)
+        dates = pd.to_datetime(df["pubDate"], errors="coerce").to_numpy().astype("datetime64[s]").astype(np.int64)
+        order = np.lexsort((np.arange(len(df)), dates, labels))
+        first = np.r_[True, labels[order][1:] != labels[order][:-1]]
+        rep_of_label = np.empty(labels.max() + 1, dtype=np.int64)
+        rep_of_label[labels[order][first]] = order[first]
+        representative = rep_of_label[labels]
+        span["clusters"] = int(first.sum())
+    return representative
+
+
+def reduce_duplicates(df, mode="collapse", threshold=THRESHOLD):
+    """
+    mode에 따라 (분석할 기사 DataFrame, 기사별 가중치 또는 None)을 반환합니다.
+    collapse / weight 모두 대표 기사만 남기며(원래 순서 유지), weight는 묶음 크기를 가중치로 돌려줍니다.
+    """
+    if mode == "off" or df.empty:
+        return df, None
+    representative = find_duplicates(df, threshold)
+    sizes = np.bincount(representative, minlength=len(df))
+    keep = representative == np.arange(len(df))
+    reduced = df[keep].reset_index(drop=True)
+    perf.incr("dedup.dropped", int((~keep).sum()))
+    return reduced, (sizes[keep].astype(np.int32) if mode == "weight" else None)
@@ -0,0 +1,145 @@
+# graph.py
+# 전체 동시 등장 그래프(희소 행렬)에서 단어 중요도와 커뮤니티를 계산한다.
+# networkx 그래프(노드/엣지 파이썬 객체)를 만들지 않고 희소 행렬 연산만 쓰므로
+# 기사 1만 건 이상, 단어 수만 개의 그래프도 그대로 계산할 수 있다.
+# 화면에 그리는 상위 N개 관계와 상관없이 전체 그래프 기준 값이라, 노드 크기/색이 잘린 그래프에 좌우되지 않는다.
+from collections import namedtuple
+
+import numpy as np
+import scipy.sparse as sp
+
+import cooccur
+import perf
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOL = 1e-10
+PAGERANK_MAX_ITER = 100
+COMMUNITY_MAX_ITER = 30
+
+# 화면에 그릴 부분 그래프 고르는 방법
+SUBGRAPHS = {"edges": "빈도 상위 관계", "pagerank": "PageRank 상위 단어끼리의 관계"}
+
+# 단어 ID 순서의 배열들
+# degree: 연결된 단어 수, strength: 가중 연결 정도 (동시 등장 빈도 합), pagerank: 가중 PageRank
+# community: 커뮤니티 번호 (크기 내림차순 0, 1, ..., 연결이 없는 단어는 -1)
+GraphStats = namedtuple("GraphStats", ["vocab", "degree", "strength", "pagerank", "community"])
+
+
+def adjacency(cooc):
+    """상삼각 동시 등장 행렬을 대칭 가중 인접 행렬(CSR, float64)로 바꿉니다."""
+    C = cooc.matrix.astype(np.float64)
+    return (C + C.T).tocsr()
+
+
+def pagerank(A, damping=PAGERANK_DAMPING, tol=PAGERANK_TOL, max_iter=PAGERANK_MAX_ITER):
+    """가중 PageRank (거듭제곱법). 연결이 없는 단어의 점수는 모든 단어에 고르게 나눠 줍니다."""
+    n = A.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    strength = np.asarray(A.sum(axis=1)).ravel()
+    dangling = strength == 0
+    inv = np.divide(1.0, strength, out=np.zeros(n), where=~dangling)
+    # 전이 행렬의 전치 (열 i = 단어 i에서 이웃으로 가는 확률)
+    P_T = (sp.diags(inv) @ A).T.tocsr()
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        new = damping * (P_T @ rank) + (damping * rank[dangling].sum() + 1.0 - damping) / n
+        converged = np.abs(new - rank).sum() < tol * n
+        rank = new
+        if converged:
+            break
+    return rank / rank.sum()
+
+
+def communities(A, max_iter=COMMUNITY_MAX_ITER, seed=0):
+    """
+    가중 라벨 전파(label propagation)로 커뮤니티를 나눕니다.
+    단어마다 이웃 라벨별 가중치 합이 가장 큰 라벨을 따르며, 한 번에 절반의 단어만 갱신해서 진동을 막는다.
+    가중치는 연관 강도 w_ij / (s_i * s_j)를 써서 모든 기사에 나오는 단어가 전체를 한 묶음으로 끌어당기지 않게 한다.
+    """
+    n = A.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    strength = np.asarray(A.sum(axis=1)).ravel()
+    connected = strength > 0
+    inv = np.divide(1.0, strength, out=np.zeros(n), where=connected)
+    W = (sp.diags(inv) @ A @ sp.diags(inv)).tocsr()
+
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n)
+    rows = np.arange(n)
+    for _ in range(max_iter):
+        # (단어 x 라벨) 점수 = 이웃 중 그 라벨인 단어와의 가중치 합
+        scores = (W @ sp.csr_matrix((np.ones(n), (rows, labels)), shape=(n, n))).tocsr()
+        top = scores.max(axis=1).toarray().ravel()
+        current = np.asarray(scores[rows, labels]).ravel()
+        # 행별 최고 점수 라벨 (scores.argmax보다 빠르게: 최고 점수인 칸 중 하나를 고름)
+        entry_rows = np.repeat(rows, np.diff(scores.indptr))
+        hit = np.flatnonzero(scores.data == top[entry_rows])
+        best = labels.copy()
+        best[entry_rows[hit]] = scores.indices[hit]
+        # 지금 라벨도 최고 점수면 그대로 유지
+        wants = connected & (current < top)
+        if not wants.any():
+            break
+        update = wants & (rng.random(n) < 0.5)
+        labels = np.where(update, best, labels)
+
+    # 크기가 큰 커뮤니티부터 0, 1, ... (연결이 없는 단어는 -1)
+    _, inverse, sizes = np.unique(labels[connected], return_inverse=True, return_counts=True)
+    rank_of = np.empty(len(sizes), dtype=np.int64)
+    rank_of[np.argsort(-sizes, kind="stable")] = np.arange(len(sizes))
+    community = np.full(n, -1, dtype=np.int64)
+    community[connected] = rank_of[inverse]
+    return community
+
+
+def analyze_graph(cooc):
+    """전체 동시 등장 그래프의 GraphStats를 계산합니다. (단어가 없으면 빈 배열)"""
+    with perf.stage("graph", edges=int(cooc.matrix.nnz)):
+        A = adjacency(cooc)
+        if A.shape[0] == 0:
+            return GraphStats(cooc.vocab, np.zeros(0, dtype=np.int64), np.zeros(0),
+                              np.zeros(0), np.zeros(0, dtype=np.int64))
+        return GraphStats(
+            vocab=cooc.vocab,
+            degree=A.getnnz(axis=1),
+            strength=np.asarray(A.sum(axis=1)).ravel(),
+            pagerank=pagerank(A),
+            community=communities(A),
+        )
+
+
+def top_nodes(stats, n, by="pagerank"):
+    """by 기준 상위 n개 단어 ID (연결이 없는 단어 제외)"""
+    values = np.asarray(getattr(stats, by), dtype=np.float64)
+    ids = np.flatnonzero(stats.degree > 0)
+    return ids[np.argsort(-values[ids], kind="stable")[:int(n)]]
+
+
+def top_edges_among(cooc, node_ids, n):
+    """node_ids 단어끼리의 관계 중 빈도 상위 n개 (cooccur.top_edges와 같은 형태)"""
+    mask = np.zeros(len(cooc.vocab), dtype=cooc.matrix.dtype)
+    mask[np.asarray(node_ids, dtype=np.int64)] = 1
+    D = sp.diags(mask, dtype=mask.dtype)
+    return cooccur.top_edges(cooccur.Cooccurrence(cooc.vocab, (D @ cooc.matrix @ D).tocsr()), n)
+
+
+def subgraph_edges(cooc, stats, n, mode="edges"):
+    """
+    화면에 그릴 관계 n개. (mode는 SUBGRAPHS 참고)
+    edges: 전체에서 빈도 상위, pagerank: PageRank 상위 단어(관계 수의 절반, 최소 10개)끼리의 빈도 상위
+    """
+    if mode == "pagerank":
+        return top_edges_among(cooc, top_nodes(stats, max(10, n // 2)), n)
+    return cooccur.top_edges(cooc, n)
+
+
+def node_values(stats, words):
+    """words의 {단어: (PageRank, 가중 연결 정도, 커뮤니티)}"""
+    index = {t: i for i, t in enumerate(stats.vocab)}
+    return {
+        w: (float(stats.pagerank[index[w]]), float(stats.strength[index[w]]), int(stats.community[index[w]]))
+        for w in words if w in index
+    }
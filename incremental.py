@@ -0,0 +1,436 @@
+# incremental.py
+# 증분 분석: 같은 검색어를 다시 수집했을 때 새로 들어온 기사만 형태소 분석해서 분석 상태에 더한다.
+# 상태는 단어 빈도, 동시 등장 행렬(상삼각), (시간 구간 x 단어) 빈도의 합계와 기사별 (필터링된) 단어 ID를 들고 있고,
+# 목록에서 빠진 기사나 기간(keep_days)을 넘은 날짜의 기사는 그 기사의 몫만 빼서 내보낸다.
+# 어휘는 전체 분석의 코퍼스 어휘처럼 분석한 기사에 나온 모든 명사(필터에 걸린 명사 포함)이고,
+# 어떤 기사에도 남지 않은 단어와 기사가 없는 시간 구간은 일정 비율(COMPACT_RATIO)을 넘으면 합계에서 지운다.
+# 형태소 분석과 쌍 계산은 바뀐 기사 수에 비례하고, 합계 병합과 결과(Counter, 가나다순 어휘의 행렬) 만들기는
+# 기사 수가 아니라 어휘/서로 다른 쌍 수에 비례하는 벡터 연산이다.
+#
+# 유사 기사(dedup의 collapse/weight)는 지금 있는 대표 기사의 LSH 버킷에서만 찾는다.
+# 새 기사가 두 묶음을 잇거나 대표 기사보다 먼저 발행된 경우까지 다시 묶지는 않으므로 전체 분석과 드물게 다를 수 있다.
+# (대표 기사가 빠지면 남은 기사 중 가장 먼저 발행된 기사가 대표가 된다)
+import sys
+import threading
+from collections import Counter, OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+import cooccur
+import dedup
+import nlp
+import perf
+import pipeline
+import timeline
+
+MAX_STATES = 8  # 보관할 증분 상태 수 (검색어 x 분석 설정, 오래 안 쓴 상태부터 삭제)
+COMPACT_RATIO = 0.25  # 빈 단어/시간 구간이 이 비율을 넘으면 합계를 압축
+
+# freq / cooc: pipeline.analyze와 같은 형태, timeline: 시간 단위 timeline.Timeline (어휘는 cooc와 같음)
+# n_docs: 상태에 든 기사 수, n_analyzed: 그중 분석한 대표 기사 수
+Snapshot = namedtuple("Snapshot", ["freq", "cooc", "timeline", "n_docs", "n_analyzed"])
+
+
+class _Doc:
+    __slots__ = ("key", "tokens", "others", "hour", "date", "rep", "members", "text", "signature")
+
+    def __init__(self, key, tokens, others, hour, date, text, signature):
+        self.key = key
+        self.tokens = tokens        # 필터를 통과한 단어 ID (문서 안 순서 유지)
+        self.others = others        # 필터에 걸린 단어 ID (중복 없이, 어휘에만 쓰임)
+        self.hour = hour            # 발행 시각의 시간 구간 (datetime64[h] 정수, 없으면 None)
+        self.date = date            # 발행 시각 (datetime64[s] 정수, 없으면 None)
+        self.rep = key              # 대표 기사 key (자기 자신이면 대표)
+        self.members = set()        # 대표 기사일 때 묶인 다른 기사 key
+        self.text = text            # 정규화된 텍스트 (유사 기사 색인용)
+        self.signature = signature  # MinHash 서명 (없으면 None)
+
+
+def _sparse_nbytes(M):
+    return M.data.nbytes + M.indices.nbytes + M.indptr.nbytes
+
+
+def _doc_nbytes(doc):
+    """기사 하나가 상태에서 차지하는 대략적인 바이트 수"""
+    return (sys.getsizeof(doc) + sys.getsizeof(doc.key) + doc.tokens.nbytes + doc.others.nbytes
+            + (sys.getsizeof(doc.text) if doc.text is not None else 0)
+            + (doc.signature.nbytes if doc.signature is not None else 0))
+
+
+class IncrementalAnalysis:
+    """
+    검색어 하나, 분석 설정 하나(불용어, 최소 길이, 동시 등장 범위, 유사 기사 처리)의 증분 분석 상태.
+    sync(df)로 수집한 기사 목록에 맞추고 Snapshot을 받습니다. (여러 스레드에서 호출해도 한 번에 하나씩 갱신)
+    """
+
+    def __init__(self, stop_words, min_len, window=0, dedup_mode="off", threshold=dedup.THRESHOLD):
+        self.stop_words = stop_words
+        self.min_len = min_len
+        self.window = window
+        self.dedup_mode = dedup_mode
+        self.threshold = threshold
+        self.lock = threading.Lock()
+
+        self.vocab = []         # 처음 나온 순서의 단어 (필터에 걸린 단어 포함)
+        self.index = {}
+        self.doc_refs = np.zeros(0, dtype=np.int64)     # 단어별로 그 단어가 나온 기사 수 (0이면 압축 때 지움)
+        self.rep_refs = np.zeros(0, dtype=np.int64)     # 그중 대표 기사 수 (0이 아닌 단어만 결과 어휘에)
+        self.docs = {}          # key(link) -> _Doc
+        self.days = {}          # 발행일(일 수) -> 그날 기사 key 집합 (기간 밖 날짜 내보내기용)
+        self.term_totals = np.zeros(0, dtype=np.int64)
+        self.pairs = sp.csr_matrix((0, 0), dtype=np.int32)      # (V x V) 상삼각, 단어 ID는 처음 나온 순서
+        self.hour_rows = {}     # 시간 구간 -> hour_counts 행 번호
+        self.hour_values = []
+        self.hour_counts = sp.csr_matrix((0, 0), dtype=np.int64)
+        self.volume = np.zeros(0, dtype=np.int64)         # 시간 구간별 기사 수 (묶인 기사 포함, 가중치 없음)
+        self.texts = {}         # 정규화된 텍스트 -> 대표 기사 key
+        self.buckets = {}       # (band, 서명 일부) -> 대표 기사 key 집합
+        self.n_reps = 0
+        self.snapshot = None
+        self.doc_bytes = 0      # 기사별 데이터 크기 합 (추가/삭제할 때 갱신)
+        self.vocab_bytes = 0
+        self.size = 0           # nbytes() (sync가 끝날 때 갱신, 메모리 사용량 표시용)
+
+    # ------------------------------------------------------------------
+    # 공개 함수
+    # ------------------------------------------------------------------
+    def sync(self, df, workers=1, keep_days=None):
+        """
+        상태를 기사 DataFrame(df)에 맞춥니다. 새 기사만 형태소 분석해서 더하고, df에 없는 기사는 뺍니다.
+        keep_days가 있으면 가장 최근 발행일부터 keep_days일 안의 기사만 남깁니다. (이전 날짜는 내보냄)
+        형태소 분석 도중 취소되어도 상태는 바뀌지 않습니다. (병합은 "merge" 단계 한 번에)
+        """
+        with self.lock:
+            dates = pd.to_datetime(df["pubDate"], errors="coerce").to_numpy().astype("datetime64[s]")
+            cutoff = None
+            if keep_days and not np.isnat(dates).all():
+                cutoff = int(dates[~np.isnat(dates)].max().astype("datetime64[D]").astype(np.int64)) - int(keep_days) + 1
+                inside = np.isnat(dates) | (dates.astype("datetime64[D]").astype(np.int64) >= cutoff)
+                df, dates = df[inside], dates[inside]
+
+            # 기사 key(link) 비교는 파이썬 집합으로 (arrow 문자열 Series.isin보다 빠름)
+            keys = df["link"].astype(str).tolist()
+            current = set(keys)
+            removed = {key for key in self.docs if key not in current}
+            if cutoff is not None:
+                removed.update(key for day in self.days if day is not None and day < cutoff for key in self.days[day])
+            added = np.zeros(len(keys), dtype=bool)
+            seen = set()
+            for i, key in enumerate(keys):
+                if key not in self.docs and key not in seen:
+                    added[i] = True
+                    seen.add(key)
+            if not removed and not added.any() and self.snapshot is not None:
+                return self.snapshot
+            delta, delta_dates = df[added], dates[added]
+
+            # 1. 준비: 새 기사 형태소 분석, 유사 기사 서명 (상태는 그대로)
+            with perf.stage("tokenize", docs=len(delta)):
+                nouns = nlp.extract_nouns_cached(pipeline.doc_texts(delta), workers)
+            texts, signatures = None, None
+            if self.dedup_mode != "off" and len(delta):
+                texts = dedup.normalize_texts(pipeline.doc_texts(delta))
+                signatures, valid = dedup.minhash_signatures(texts)
+                signatures = [s if v else None for s, v in zip(signatures, valid)]
+
+            # 2. 병합: 빠진 기사 몫을 빼고 새 기사 몫을 더한 뒤 결과를 만든다
+            with perf.stage("merge", added=len(delta), removed=len(removed)):
+                self._remove(removed)
+                self._add([keys[i] for i in np.flatnonzero(added)], nouns, delta_dates, texts, signatures)
+                self._compact()
+                self.snapshot = self._materialize()
+            self.size = self.nbytes()
+            perf.incr("incremental.added", len(delta))
+            perf.incr("incremental.removed", len(removed))
+            return self.snapshot
+
+    def nbytes(self):
+        """상태가 차지하는 대략적인 바이트 수 (기사별 단어 ID/텍스트/서명, 어휘, 합계, 마지막 결과의 행렬)"""
+        size = self.doc_bytes + self.vocab_bytes + sys.getsizeof(self.index) + sys.getsizeof(self.docs)
+        size += self.term_totals.nbytes + self.doc_refs.nbytes + self.rep_refs.nbytes + self.volume.nbytes
+        size += _sparse_nbytes(self.pairs) + _sparse_nbytes(self.hour_counts)
+        if self.snapshot is not None:
+            size += sys.getsizeof(self.snapshot.freq) + _sparse_nbytes(self.snapshot.cooc.matrix)
+            size += _sparse_nbytes(self.snapshot.timeline.counts)
+        return size
+
+    # ------------------------------------------------------------------
+    # 기사 추가 / 삭제
+    # ------------------------------------------------------------------
+    def _term_ids(self, nouns):
+        """(필터를 통과한 단어 ID 순서대로, 필터에 걸린 단어 ID 집합)"""
+        ids, others = [], set()
+        for noun in nouns:
+            i = self.index.get(noun)
+            if i is None:
+                i = self.index[noun] = len(self.vocab)
+                self.vocab.append(noun)
+                self.vocab_bytes += sys.getsizeof(noun)
+            if len(noun) < self.min_len or noun in self.stop_words:
+                others.add(i)
+            else:
+                ids.append(i)
+        return np.array(ids, dtype=np.int32), np.array(sorted(others), dtype=np.int32)
+
+    def _count_terms(self, doc, sign, rep, member=True):
+        """doc에 나온 단어의 기사 수(member)와 대표 기사 수(rep)를 sign만큼 바꿉니다."""
+        V = len(self.vocab)
+        if len(self.doc_refs) < V:
+            grow = np.zeros(V - len(self.doc_refs), dtype=np.int64)
+            self.doc_refs = np.concatenate([self.doc_refs, grow])
+            self.rep_refs = np.concatenate([self.rep_refs, grow])
+        terms = np.union1d(doc.tokens, doc.others)
+        if member:
+            self.doc_refs[terms] += sign
+        if rep:
+            self.rep_refs[terms] += sign
+
+    def _add(self, keys, nouns, dates, texts=None, signatures=None):
+        contrib = []  # (대표 기사, 더할 횟수)
+        # 먼저 발행된 기사가 대표가 되도록 발행 시각 순서로 (시각이 없는 기사는 마지막)
+        for i in np.argsort(dates, kind="stable"):
+            date = None if np.isnat(dates[i]) else int(dates[i].astype(np.int64))
+            doc = _Doc(keys[i], *self._term_ids(nouns[i]),
+                       None if date is None else date // 3600, date,
+                       None if texts is None else texts[i], None if signatures is None else signatures[i])
+            self.docs[doc.key] = doc
+            self.doc_bytes += _doc_nbytes(doc)
+            self.days.setdefault(None if date is None else date // 86400, set()).add(doc.key)
+
+            rep = self._find_rep(doc) if texts is not None else None
+            self._count_terms(doc, 1, rep is None)
+            self._count_volume(doc, 1)
+            if rep is None:
+                self._index(doc)
+                self.n_reps += 1
+                contrib.append((doc, 1))
+            else:
+                doc.rep = rep.key
+                rep.members.add(doc.key)
+                if self.dedup_mode == "weight":
+                    contrib.append((rep, 1))
+        self._apply(contrib)
+
+    def _remove(self, keys):
+        contrib = []
+        docs = [self.docs[key] for key in keys if key in self.docs]
+        # 묶인 기사를 먼저 빼야 대표 기사의 남은 묶음 크기가 맞다
+        docs.sort(key=lambda d: d.rep == d.key)
+        for doc in docs:
+            del self.docs[doc.key]
+            self.doc_bytes -= _doc_nbytes(doc)
+            day = None if doc.date is None else doc.date // 86400
+            self.days[day].discard(doc.key)
+            if not self.days[day]:
+                del self.days[day]
+            self._count_terms(doc, -1, doc.rep == doc.key)
+            self._count_volume(doc, -1)
+
+            if doc.rep != doc.key:
+                self.docs[doc.rep].members.discard(doc.key)
+                if self.dedup_mode == "weight":
+                    contrib.append((self.docs[doc.rep], -1))
+                continue
+
+            self._unindex(doc)
+            self.n_reps -= 1
+            size = 1 + len(doc.members) if self.dedup_mode == "weight" else 1
+            contrib.append((doc, -size))
+            if doc.members:
+                # 남은 기사 중 가장 먼저 발행된 기사를 새 대표로
+                members = [self.docs[key] for key in doc.members]
+                new_rep = min(members, key=lambda d: (d.date is None, d.date or 0))
+                new_rep.members = {m.key for m in members if m is not new_rep}
+                for m in members:
+                    m.rep = new_rep.key
+                self._index(new_rep)
+                self._count_terms(new_rep, 1, True, member=False)
+                self.n_reps += 1
+                contrib.append((new_rep, size - 1 if self.dedup_mode == "weight" else 1))
+        self._apply(contrib)
+
+    # ------------------------------------------------------------------
+    # 유사 기사 색인 (대표 기사만)
+    # ------------------------------------------------------------------
+    def _band_keys(self, signature):
+        rows = len(signature) // dedup.BANDS
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(dedup.BANDS)]
+
+    def _find_rep(self, doc):
+        key = self.texts.get(doc.text)
+        if key is not None:
+            return self.docs[key]
+        if doc.signature is None:
+            return None
+        candidates = set()
+        for band_key in self._band_keys(doc.signature):
+            candidates.update(self.buckets.get(band_key, ()))
+        best, best_score = None, self.threshold
+        for key in candidates:
+            # 서명 일치 비율 = Jaccard 유사도 추정값
+            score = float((self.docs[key].signature == doc.signature).mean())
+            if score >= best_score:
+                best, best_score = self.docs[key], score
+        return best
+
+    def _index(self, doc):
+        if doc.text is None:
+            return
+        self.texts.setdefault(doc.text, doc.key)
+        if doc.signature is not None:
+            for band_key in self._band_keys(doc.signature):
+                self.buckets.setdefault(band_key, set()).add(doc.key)
+
+    def _unindex(self, doc):
+        if doc.text is None:
+            return
+        if self.texts.get(doc.text) == doc.key:
+            del self.texts[doc.text]
+        if doc.signature is not None:
+            for band_key in self._band_keys(doc.signature):
+                bucket = self.buckets.get(band_key)
+                if bucket is not None:
+                    bucket.discard(doc.key)
+                    if not bucket:
+                        del self.buckets[band_key]
+
+    # ------------------------------------------------------------------
+    # 합계 갱신 / 결과 만들기
+    # ------------------------------------------------------------------
+    def _hour_row(self, hour):
+        row = self.hour_rows.get(hour)
+        if row is None:
+            row = self.hour_rows[hour] = len(self.hour_values)
+            self.hour_values.append(hour)
+        return row
+
+    def _count_volume(self, doc, sign):
+        """doc의 발행 시간 구간 기사 수를 sign만큼 바꿉니다. (발행량은 유사 기사 처리와 상관없이 모든 기사로)"""
+        if doc.hour is None:
+            return
+        row = self._hour_row(doc.hour)
+        if len(self.volume) <= row:
+            self.volume = np.concatenate([self.volume, np.zeros(row + 1 - len(self.volume), dtype=np.int64)])
+        self.volume[row] += sign
+
+    def _apply(self, contrib):
+        """(기사, 횟수) 목록의 단어 빈도, 동시 등장, 시간별 단어 빈도를 합계에 더합니다. (횟수가 음수면 뺌)"""
+        contrib = [(doc, w) for doc, w in contrib if w]
+        V, H = len(self.vocab), len(self.hour_values)
+        # 새 단어/시간 구간만큼 합계 크기를 늘림
+        if len(self.term_totals) < V:
+            self.term_totals = np.concatenate([self.term_totals, np.zeros(V - len(self.term_totals), dtype=np.int64)])
+        if self.pairs.shape[0] < V:
+            self.pairs.resize((V, V))
+        if self.hour_counts.shape != (H, V):
+            self.hour_counts.resize((H, V))
+        if not contrib:
+            return
+
+        lengths = np.array([len(doc.tokens) for doc, _ in contrib], dtype=np.int64)
+        offsets = np.zeros(len(contrib) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        tokens = np.concatenate([doc.tokens for doc, _ in contrib]) if offsets[-1] else np.zeros(0, dtype=np.int32)
+        weights = np.array([w for _, w in contrib], dtype=np.int64)
+        token_weights = np.repeat(weights, lengths)
+
+        # 1. 단어 빈도
+        self.term_totals += np.bincount(tokens, weights=token_weights, minlength=V).astype(np.int64)
+
+        # 2. 동시 등장 (전체 분석과 같은 계산을 바뀐 기사에만, 가중치 = 더하거나 뺄 횟수)
+        delta = cooccur.cooccurrence_from_ids(self.vocab, offsets, tokens, self.window or None, weights).matrix
+        self.pairs = (self.pairs + delta).tocsr()
+        self.pairs.eliminate_zeros()
+
+        # 3. 시간 구간별 단어 빈도 (기사 수는 _count_volume에서)
+        dated = np.array([doc.hour is not None for doc, _ in contrib], dtype=bool)
+        rows = np.array([self.hour_rows[doc.hour] for doc, _ in contrib if doc.hour is not None], dtype=np.int64)
+        token_dated = np.repeat(dated, lengths)
+        self.hour_counts = (self.hour_counts + sp.csr_matrix(
+            (token_weights[token_dated], (np.repeat(rows, lengths[dated]), tokens[token_dated])),
+            shape=(H, V),
+        )).tocsr()
+        self.hour_counts.eliminate_zeros()
+
+    def _compact(self):
+        """어떤 기사에도 남지 않은 단어와 기사가 없는 시간 구간이 COMPACT_RATIO를 넘으면 합계에서 지웁니다."""
+        live = self.doc_refs > 0
+        live_hours = self.volume > 0
+        if (np.count_nonzero(~live) <= len(live) * COMPACT_RATIO
+                and np.count_nonzero(~live_hours) <= len(live_hours) * COMPACT_RATIO):
+            return
+        # 남은 단어에 처음 나온 순서를 유지한 채 새 ID를 붙인다 (상삼각도 그대로 유지됨)
+        new_id = (np.cumsum(live) - 1).astype(np.int32)
+        self.vocab = [term for term, keep in zip(self.vocab, live) if keep]
+        self.index = {term: i for i, term in enumerate(self.vocab)}
+        self.vocab_bytes = sum(sys.getsizeof(term) for term in self.vocab)
+        for doc in self.docs.values():
+            doc.tokens = new_id[doc.tokens]
+            doc.others = new_id[doc.others]
+        self.doc_refs, self.rep_refs, self.term_totals = self.doc_refs[live], self.rep_refs[live], self.term_totals[live]
+        self.pairs = self.pairs[live][:, live].tocsr()
+
+        rows = np.flatnonzero(live_hours)
+        self.hour_values = [self.hour_values[r] for r in rows]
+        self.hour_rows = {hour: r for r, hour in enumerate(self.hour_values)}
+        self.hour_counts = self.hour_counts[rows][:, live].tocsr()
+        self.volume = self.volume[rows]
+        perf.incr("incremental.compactions")
+
+    def _materialize(self):
+        """
+        합계를 가나다순 어휘 기준의 freq, Cooccurrence, Timeline으로 바꿉니다. (pipeline.analyze와 같은 형태)
+        어휘는 대표 기사에 나온 단어만 (전체 분석의 코퍼스 어휘와 같음)
+        """
+        order = np.array(sorted(np.flatnonzero(self.rep_refs > 0), key=self.vocab.__getitem__), dtype=np.int64)
+        V = len(order)
+        rank = np.full(len(self.vocab), -1, dtype=np.int64)
+        rank[order] = np.arange(V)
+        vocab = [self.vocab[i] for i in order]
+
+        # 빈도 (전체 분석처럼 가나다순으로 넣어서 같은 빈도의 순서도 같게)
+        freq = Counter({vocab[r]: int(self.term_totals[i]) for r, i in enumerate(order) if self.term_totals[i]})
+
+        # 동시 등장: 단어 ID를 가나다순 ID로 바꾸고 상삼각으로
+        C = self.pairs.tocoo()
+        a, b = rank[C.row], rank[C.col]
+        matrix = sp.csr_matrix((C.data, (np.minimum(a, b), np.maximum(a, b))), shape=(V, V))
+
+        # 시계열: 기사가 있는 시간 구간만 시각 순서로
+        hours = np.asarray(self.hour_values, dtype=np.int64)
+        live = np.flatnonzero(self.volume > 0)
+        live = live[np.argsort(hours[live], kind="stable")]
+        tl = timeline.Timeline(
+            vocab, hours[live].astype("datetime64[h]").astype("datetime64[s]"),
+            self.hour_counts[live][:, order].tocsr(), self.volume[live],
+        )
+        return Snapshot(freq, cooccur.Cooccurrence(vocab, matrix), tl, len(self.docs), self.n_reps)
+
+
+# ----------------------------------------------------------------------
+# 상태 보관 (프로세스 전체, 모든 세션 공유)
+# ----------------------------------------------------------------------
+_states = OrderedDict()
+_states_lock = threading.Lock()
+
+
+def get_state(keyword, stop_words, min_len, window=0, dedup_mode="off"):
+    """검색어와 분석 설정의 증분 상태를 반환합니다. (없으면 빈 상태를 만들고, MAX_STATES개를 넘으면 오래된 것부터 삭제)"""
+    key = (keyword, min_len, window, dedup_mode)
+    with _states_lock:
+        state = _states.get(key)
+        if state is None:
+            state = _states[key] = IncrementalAnalysis(stop_words, min_len, window, dedup_mode)
+            perf.incr("incremental.states")
+            while len(_states) > MAX_STATES:
+                _states.popitem(last=False)
+        _states.move_to_end(key)
+        return state
+
+
+def state_stats():
+    """보관 중인 증분 상태의 {"entries": 상태 수, "bytes": 크기 추정값 합}"""
+    with _states_lock:
+        return {"entries": len(_states), "bytes": sum(state.size for state in _states.values())}
@@ -0,0 +1,210 @@
+# jobs.py
+# 수집/분석 작업을 Streamlit 스크립트 스레드 밖에서 실행하는 공유 실행기. (모든 세션이 하나를 공유)
+# - 같은 키의 작업이 이미 실행 중이면 새로 실행하지 않고 그 작업을 함께 기다린다. (요청 합치기)
+# - 작업 안에서 perf.stage 단계가 시작될 때마다 진행 상황을 갱신하고, 취소된 작업은 그 자리에서 멈춘다.
+# - 세션(owner)이 다른 키의 작업을 요청하면 이전 작업을 놓고, 아무도 기다리지 않는 작업은 취소한다.
+# 취소는 단계 경계에서만 일어나므로 이미 시작된 형태소 분석 조각 등은 끝까지 실행된다.
+# - 작업 함수는 publish()로 중간 결과를 내보낼 수 있다. (스트리밍 수집처럼 끝나기 전에 보여줄 것이 있을 때)
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import perf
+
+MAX_WORKERS = 4     # 동시에 실행할 작업 수
+KEEP_FINISHED = 16  # 완료된 작업을 보관할 개수 (같은 요청이 다시 오면 바로 결과 반환)
+
+_local = threading.local()  # 현재 스레드에서 실행 중인 Job (publish용)
+
+
+class JobCancelled(Exception):
+    """취소된 작업이 다음 단계에 들어갈 때 발생합니다."""
+
+
+class Job:
+    """
+    백그라운드 작업 하나. state: "pending" -> "running" -> "done" | "failed" | "cancelled"
+    stages는 예상 단계 이름 순서로, 진행률(마지막으로 시작한 예상 단계의 위치)을 계산할 때 씁니다.
+    """
+
+    def __init__(self, key, stages=()):
+        self.key = key
+        self.stages = list(stages)
+        self.state = "pending"
+        self.stage = None
+        self.fraction = 0.0
+        self.error = None
+        self.owners = set()
+        self.submitted = time.time()
+        self.finished = None
+        self.keep = False       # 완료 후 finished에 보관할지 (ttl=0으로만 요청된 작업은 다시 쓰지 않으므로 보관 안 함)
+        self.updates = 0        # publish 횟수 (화면은 이 값이 바뀔 때만 다시 그림)
+        self._partial = None
+        self._result = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def _on_stage(self, name, depth):
+        # perf.stage 시작 알림 (작업 스레드에서 호출)
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+        self.stage = name
+        if name in self.stages:
+            self.fraction = max(self.fraction, self.stages.index(name) / len(self.stages))
+
+    def _publish(self, value):
+        # 중간 결과 갱신 (작업 스레드에서 호출). 단계 경계와 같이 취소 지점으로도 쓴다.
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+        self._partial = value
+        self.updates += 1
+
+    def partial(self):
+        """(publish 횟수, 마지막 중간 결과)"""
+        return self.updates, self._partial
+
+    def cancel(self):
+        """다음 단계 경계에서 작업을 멈추도록 요청합니다."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """작업이 끝나면 True (timeout초 안에 끝나지 않으면 False)"""
+        return self._done.wait(timeout)
+
+    def progress(self):
+        """(진행률 0~1, 현재 단계 이름)"""
+        return (1.0 if self.state == "done" else self.fraction), self.stage
+
+    def result(self, timeout=None):
+        """작업 결과를 반환합니다. 실패한 작업은 그 예외를, 취소된 작업은 JobCancelled를 던집니다."""
+        if not self._done.wait(timeout):
+            raise TimeoutError(self.key)
+        if self.state == "cancelled":
+            raise JobCancelled(self.key)
+        if self.error is not None:
+            raise self.error
+        return self._result
+
+
+class JobExecutor:
+    """키별로 작업을 합치고, 세션별로 마지막 작업만 유지하는 스레드 실행기"""
+
+    def __init__(self, max_workers=MAX_WORKERS, keep_finished=KEEP_FINISHED):
+        self.keep_finished = keep_finished
+        self.active = {}                # 키 -> 실행 중(또는 대기 중)인 Job
+        self.finished = OrderedDict()   # 키 -> 완료된 Job (LRU)
+        self.owned = {}                 # owner -> 마지막으로 요청한 키
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def submit(self, key, fn, *args, owner=None, stages=(), ttl=None, **kwargs):
+        """
+        key 작업을 반환합니다. 완료된 같은 작업이 있으면 그것을, 실행 중이면 합쳐서 같은 Job을 돌려주고,
+        없으면 fn(*args, **kwargs)를 백그라운드에서 시작합니다.
+        ttl(초)을 주면 그보다 오래전에 완료된 작업은 다시 쓰지 않습니다.
+        (0이면 실행 중인 작업만 합치고, 완료된 결과도 보관하지 않음 - 결과는 요청한 쪽과 분석 캐시가 들고 있음)
+        owner(세션 등)를 주면 그 owner가 이전에 요청한 다른 작업은 놓습니다. (아무도 기다리지 않으면 취소)
+        """
+        with self.lock:
+            job = self.finished.get(key)
+            if job is not None and ttl is not None and time.time() - job.finished >= ttl:
+                del self.finished[key]
+                job = None
+            if job is not None:
+                self.finished.move_to_end(key)
+                perf.incr("jobs.reused")
+            else:
+                job = self.active.get(key)
+                if job is not None and not job.cancelled:
+                    perf.incr("jobs.coalesced")
+                else:
+                    job = Job(key, stages)
+                    self.active[key] = job
+                    perf.incr("jobs.submitted")
+                    self.executor.submit(self._run, job, fn, args, kwargs)
+                job.keep = job.keep or ttl != 0
+            if owner is not None:
+                self._claim(owner, job)
+        return job
+
+    def release(self, owner):
+        """owner가 기다리던 작업을 놓습니다. (아무도 기다리지 않으면 취소)"""
+        with self.lock:
+            self._claim(owner, None)
+
+    def _claim(self, owner, job):
+        prev = self.active.get(self.owned.get(owner))
+        if prev is not None and prev is not job:
+            prev.owners.discard(owner)
+            if not prev.owners and not prev.done():
+                prev.cancel()
+                perf.incr("jobs.cancelled")
+        if job is None:
+            self.owned.pop(owner, None)
+        else:
+            job.owners.add(owner)
+            self.owned[owner] = job.key
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancelled:
+            job.state = "cancelled"
+        else:
+            job.state = "running"
+            perf.set_listener(job._on_stage)
+            perf.set_owner(job.key)  # 단계 기록의 소유자 = 작업 키 (기다리는 세션이 자기 기록으로 골라 봄)
+            _local.job = job
+            try:
+                job._result = fn(*args, **kwargs)
+                job.state = "done"
+            except JobCancelled:
+                job.state = "cancelled"
+            except Exception as e:
+                job.error = e
+                job.state = "failed"
+            finally:
+                perf.set_listener(None)
+                perf.set_owner(None)
+                _local.job = None
+        job.finished = time.time()
+
+        with self.lock:
+            if self.active.get(job.key) is job:
+                del self.active[job.key]
+            if job.state == "done" and job.keep:
+                self.finished[job.key] = job
+                while len(self.finished) > self.keep_finished:
+                    self.finished.popitem(last=False)
+        job._done.set()
+
+    def finished_results(self):
+        """보관 중인 완료된 작업의 결과 목록 (메모리 사용량 표시용)"""
+        with self.lock:
+            return [job._result for job in self.finished.values()]
+
+    def stats(self):
+        with self.lock:
+            states = [job.state for job in self.active.values()]
+            return {"running": states.count("running"), "pending": states.count("pending"),
+                    "finished": len(self.finished), **perf.counters("jobs.")}
+
+
+def publish(value):
+    """
+    실행 중인 작업의 중간 결과를 value로 바꿉니다. (기다리는 쪽은 Job.partial()로 읽음)
+    작업이 취소되었으면 JobCancelled가 발생하고, 작업 밖에서 호출하면 아무것도 하지 않습니다.
+    """
+    job = getattr(_local, "job", None)
+    if job is not None:
+        job._publish(value)
+
+
+# 프로세스 전체(모든 세션)에서 공유
+executor = JobExecutor()
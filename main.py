@@ -1,18 +1,28 @@
 import streamlit as st
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm  # 폰트 매니저
-from wordcloud import WordCloud
-from konlpy.tag import Okt
+import time
+import uuid
+import hashlib
 from collections import Counter
-import networkx as nx
-from itertools import combinations
-import seaborn as sns
-import altair as alt
-import plotly.express as px
 
-import api  # 네이버 뉴스 API 호출 함수 (별도 파일에 구현 가정)
+# 무거운 시각화/형태소 분석 라이브러리(matplotlib, wordcloud, networkx, seaborn, altair, plotly, konlpy)는
+# 첫 화면을 빨리 그리기 위해 각 차트 섹션에서 처음 쓸 때 import한다.
+import store  # 수집 기사 디스크 저장소 (증분 수집)
+import nlp  # 형태소 분석 (병렬 처리 지원)
+import cooccur  # 희소 행렬 기반 동시 등장 계산
+import render_cache  # 완성된 차트 이미지 캐시
+import pipeline  # 분석 단계 함수 (Streamlit 없이도 호출 가능)
+import perf  # 단계별 시간/메모리, 캐시 적중 측정
+import compare  # 여러 검색어 비교 (공유 수집/형태소 분석)
+import dedup  # 유사(전재) 기사 묶기 (MinHash/LSH)
+import timeline  # (시간 구간 x 단어) 빈도 행렬
+import dataset  # 수집 기사 핸들 (캐시 키)
+import jobs  # 백그라운드 작업 실행기 (진행률, 취소, 요청 합치기)
+import graph  # 전체 동시 등장 그래프 지표 (PageRank, 커뮤니티)
+import analysis_cache  # 메모리 한도 캐시 (수집/분석 결과, 모든 세션 공유)
+import incremental  # 증분 분석 (새 기사만 분석해서 합계에 반영)
+import batch  # 야간 리포트 읽기 (배치 CLI가 저장한 결과)
 
 # ----------------------------------------------------------------------
 # A. 초기 설정 및 폰트 전역 등록
@@ -23,24 +33,47 @@ import api  # 네이버 뉴스 API 호출 함수 (별도 파일에 구현 가정
 # LLM을 사용,,, seaborn 및 networkx에서 font_path만으로는 실행이 오류가 났음.
 # LLM 코드 참조
 FONT_PATH = "./fonts/AppleSDGothicNeoB.ttf"
-FONT_NAME = 'sans-serif' # 기본값
-if os.path.exists(FONT_PATH):
-    # 1. Matplotlib에 폰트 등록
-    try:
-        fm.fontManager.addfont(FONT_PATH)
-        # 2. 등록된 폰트 이름 가져와서 설정
-        FONT_NAME = fm.FontProperties(fname=FONT_PATH).get_name()
-        plt.rc('font', family=FONT_NAME)
-        plt.rc('axes', unicode_minus=False) # 마이너스 기호 깨짐 방지
-    except Exception as e:
-        # 등록 실패 시 Windows 기본 폰트 사용 
-        st.warning(f"폰트 등록 오류: {e}. 기본 폰트로 대체됩니다.")
-        FONT_NAME = 'Malgun Gothic'
-        plt.rc('font', family=FONT_NAME)
-        plt.rc('axes', unicode_minus=False)
-else:
-    st.warning(f"한글 폰트 파일이 없어 기본 폰트로 출력됩니다. ({FONT_PATH} 확인 필요)")
-    # 파일이 없을 경우 Matplotlib 기본 폰트 설정 유지
+
+
+@st.cache_resource
+def setup_matplotlib_font():
+    """
+    Matplotlib에 한글 폰트를 등록하고 (폰트 이름, 경고 메시지)를 반환합니다.
+    처음 Matplotlib 차트를 그릴 때 프로세스당 한 번만 실행됩니다.
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib.font_manager as fm  # 폰트 매니저
+
+    font_name = 'sans-serif' # 기본값
+    warning = None
+    if os.path.exists(FONT_PATH):
+        # 1. Matplotlib에 폰트 등록
+        try:
+            fm.fontManager.addfont(FONT_PATH)
+            # 2. 등록된 폰트 이름 가져와서 설정
+            font_name = fm.FontProperties(fname=FONT_PATH).get_name()
+            plt.rc('font', family=font_name)
+            plt.rc('axes', unicode_minus=False) # 마이너스 기호 깨짐 방지
+        except Exception as e:
+            # 등록 실패 시 Windows 기본 폰트 사용 
+            warning = f"폰트 등록 오류: {e}. 기본 폰트로 대체됩니다."
+            font_name = 'Malgun Gothic'
+            plt.rc('font', family=font_name)
+            plt.rc('axes', unicode_minus=False)
+    else:
+        warning = f"한글 폰트 파일이 없어 기본 폰트로 출력됩니다. ({FONT_PATH} 확인 필요)"
+        # 파일이 없을 경우 Matplotlib 기본 폰트 설정 유지
+    return font_name, warning
+
+
+@st.cache_resource
+def warm_up_okt():
+    """
+    JVM 시작과 Okt 준비를 백그라운드 스레드에서 미리 시작합니다. (서버 프로세스 전체에서 Okt는 하나)
+    사용자가 검색어를 입력하는 동안 JVM이 뜨므로 첫 분석에서 JVM 시작 시간을 기다리지 않는다.
+    병렬 분석 워커(워커마다 JVM)는 페이지를 열 때가 아니라 실제로 병렬 분석할 때 띄운다.
+    """
+    return nlp.warm_up_async()
 
 # ======================================================
 # 1) 페이지 설정 (
@@ -70,139 +103,289 @@ st.markdown(
 st.write("")
 st.info("🔥K팝 데몬 헌터스 팬덤 형성 핵심 요인 분석🔥")
 
+# 백그라운드 작업의 소유자 구분용 세션 ID (세션마다 마지막으로 요청한 작업만 유지)
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
+session_id = st.session_state["session_id"]
+
+# 이번 실행(rerun)에서 이 세션이 기록한 단계만 성능 패널에 보여주기 위한 시작 표시와 소유자
+# (다른 세션과 백그라운드 작업의 기록이 섞이지 않도록, 이 세션과 이번 실행에서 기다린 작업의 기록만)
+perf.set_owner(session_id)
+run_owners = {session_id}
+run_mark = perf.mark()
+run_started = time.perf_counter()
+
 # ----------------------------------------------------------------------
+# [캐시 함수] 공통: 수집/분석 캐시는 st.cache_* 대신 analysis_cache를 사용한다.
+# 항목 크기를 재서 전체 메모리 한도(ANALYSIS_CACHE_MB)를 넘으면 싸고 오래 안 쓴 항목부터 내보내고,
+# 단계별 ttl(analysis_cache.STAGE_TTL)이 지나면 다시 계산한다. (ANALYSIS_CACHE_SPILL_DIR을 주면 디스크로 내보냄)
+# 밑줄(_) 인자는 st.cache_*와 같이 키에서 제외, 결과는 참조로 돌려주므로 읽기 전용으로만 사용!
+# 다른 모듈의 메모리 캐시(명사, 증분 상태, 차트 이미지)도 같은 한도에 포함하고 성능 패널에 사용량을 표시한다.
+# 명사 캐시는 크기(NOUN_CACHE_MB)로 제한하고, 다른 캐시 합계가 한도의 절반을 넘으면 명사 캐시부터 줄인다.
+# ----------------------------------------------------------------------
+analysis_cache.cache.register_usage("nouns", nlp.noun_cache_stats, trim=nlp.trim_noun_cache)
+analysis_cache.cache.register_usage("incremental", incremental.state_stats)
+analysis_cache.cache.register_usage("render", render_cache.cache.stats)
+# 보관 중인 완료 작업의 결과는 대부분 분석 캐시 항목과 같은 객체이므로 한도에는 넣지 않고 표시만
+analysis_cache.cache.register_usage(
+    "jobs",
+    lambda: {"entries": len(jobs.executor.finished), "bytes": analysis_cache.sizeof(jobs.executor.finished_results())},
+    budget=False,
+)
 # B. [캐시 함수] 데이터 수집 
 # 캐시 함수를 통해 같은 파라미터로 여러 번 호출 시 API 호출을 줄임..!
+# 재시작 후에도 store(SQLite)에 저장된 기사를 쓰고, 새 기사만 받아온다.
+# ttl이 지나면 다시 호출되어 새로 올라온 기사만 증분 수집.
 # ----------------------------------------------------------------------
-@st.cache_data
+@perf.track_cache
+@analysis_cache.cached("fetch")
 def fetch_news_data(keyword, num):
-    return api.get_naver_news(keyword, num)
+    perf.cache_miss("fetch_news_data")
+    return store.collect_news(keyword, num)
 
 # ----------------------------------------------------------------------
 # C. [캐시 함수] 불용어 로드 (파일 IO는 한 번만)
 # wordcloud와 networkx 분석 모두에서 동일한 불용어 리스트 사용..
 # 미리 정의 후 캐싱 --> 캐싱을 통해 여러 번 호출 시 부담을 줄임.
-# 강의안 보고 사용.
+# 강의안 보고 사용. (실제 구현은 pipeline.py, 벤치마크/배치 실행과 공유)
 # ----------------------------------------------------------------------
-@st.cache_data
+@perf.track_cache
+@analysis_cache.cached("stop_words")
 def get_stop_words(keyword):
     """불용어 파일을 읽고 검색어 및 강의에서 사용된 불용어를 추가하여 반환합니다."""
-    stopwords_path = "./data/korean_stopwords.txt" # 강의록에서 가지고온 불용어
-    stop_words = set()
-    
-    if os.path.exists(stopwords_path):
-        with open(stopwords_path, "r", encoding="utf-8") as f:
-            stop_words = set(line.strip() for line in f if line.strip())
-    else:
-        # 기본 불용어 (파일 없을 경우.. 그럴 리는 없다.)
-        stop_words = {"것", "등", "위", "수", "배", "만", "명", "관련", "대해", "뉴스", "속보"}
-        
-    if keyword:
-        stop_words.add(keyword)
-        stop_words.add(keyword.replace(" ", ""))
-    # 강의안에서 추가된 불용어들 (중복 방지를 위해 set에 update)
-    stop_words.update([
-        "서울", "서울시", "부동산", "주요", "첫째", "결과", "조사", "아크", "대비", "증권", 
-        "가능성", "대표", "시절", "제자", "최강", "활용", "최진", "타운", "요소", "적용",
-        "중앙", "전주", "한국", "포함", "도시", "일부", "이슈", "보고서", "갈등", "미래", 
-        "위원", "통해", "문제", "NH투자증권", "아유경제_부동산", "quot", "조국", 
-        "조희연", "사면", "심층분석", "년", "월", "일", "시" # 시간 관련 불용어 추가(시계열 분석을 위해)
-    ])
-    return stop_words
+    perf.cache_miss("get_stop_words")
+    return pipeline.load_stop_words(keyword)
 
 # ----------------------------------------------------------------------
 # D. [캐시 함수] 통합 분석 (형태소 분석은 한 번만)
 # 마찬가지로 wordcloud와 networkx 분석 모두에서 동일한 형태소 분석 결과 사용..
 # LLM의 힘을 빌려, 최적화를 진행했다. (95%그대로 사용..)
+# 캐시 키는 데이터셋 핸들(검색어 + 수집 시 한 번 계산한 지문)과 설정값뿐이라 실행마다 DataFrame을 해시하지 않고,
+# 결과(Counter, 희소 행렬)도 복사/피클 없이 참조로 돌려준다. (읽기 전용으로만 사용!)
 # ----------------------------------------------------------------------
-@st.cache_data
-def analyze_data(df, keyword, min_len):
+@perf.track_cache
+@analysis_cache.cached("analysis")
+def analyze_data(data, dedup_mode, min_len, window=0, _df=None, _weights=None, _workers=1):
     """
-    데이터프레임을 분석하여 단어 빈도(freq)와 엣지 목록(edge_list)을 반환합니다.
-    @st.cache_data를 사용하여 무거운 형태소 분석을 캐싱합니다.
+    데이터프레임을 분석하여 단어 빈도(freq), 동시 등장 행렬(cooc), 코퍼스 경로를 반환합니다.
+    window가 0이면 문서 전체, 아니면 window개 연속 단어 안에서의 동시 등장을 셉니다.
+    _df(분석할 기사), _weights(유사 기사 묶음 크기)는 data와 dedup_mode로 정해지므로 캐시 키에서 제외합니다.
+    _workers는 결과에 영향을 주지 않으므로 캐시 키에서 제외합니다. (밑줄 인자)
     """
-    stop_words = get_stop_words(keyword)
-    
-    # 텍스트 통합 (시리즈로 처리)
-    text_series = (df["title"].fillna("").astype(str) + " " + df["description"].fillna("").astype(str))
-    
-    okt = Okt()
-    all_filtered_nouns = []
-    all_edge_list = []
-    
-    # 각 문서별로 처리
-    for doc in text_series:
-        # 1. 명사 추출
-        nouns = okt.nouns(doc)
-        
-        # 2. 필터링 (최소 길이, 불용어)
-        filtered_nouns = [n for n in nouns if len(n) >= min_len and n not in stop_words]
-        
-        # 3. 워드클라우드용: 모든 문서의 명사를 합칩니다.
-        all_filtered_nouns.extend(filtered_nouns)
-        
-        # 4. 네트워크용: 동시 등장 관계 생성
-        # 4-1. 중복 제거된 단어 리스트 (네트워크 분석에선 단어와의 관계를 보기에 중복된 단어는 set을 통해 하나로 취급.. LLM의 조언)
-        unique_terms = sorted(set(filtered_nouns))
-        # 4-2. 단어 쌍 생성 (조합)
-        if len(unique_terms) >= 2: # 단어가 2개 이상일 때만 조합 생성
-            all_edge_list.extend(combinations(unique_terms, 2)) # 엣지 리스트에 추가
+    perf.cache_miss("analyze_data")
+    return pipeline.analyze(_df, data.keyword, min_len, window, _workers,
+                            stop_words=get_stop_words(data.keyword), weights=_weights)
+# ----------------------------------------------------------------------
+# E. [캐시 함수] 시계열 분석 데이터 전처리
+# plotly, altair 시각화에 공통으로 사용되는 (시간 구간 x 단어) 빈도 행렬을 코퍼스당 한 번만 만든다.
+# 상위 N 개수, 표시할 단어, 시간/일/주 단위를 바꾸면 이 행렬을 잘라서 바로 그린다..!
 
+@perf.track_cache
+@analysis_cache.cached("timeline")
+def get_timeline(data, corpus_path, weighted=False, _weights=None, _df=None):
+    """
+    코퍼스의 시간 단위 Timeline (구간별 기사 건수 + (구간 x 단어) 등장 횟수)을 반환
+    형태소 분석은 다시 하지 않고, analyze_data가 저장한 토큰 코퍼스를 시간별로 합산한다.
+    기사 건수는 유사 기사로 묶인 기사까지 수집한 기사(_df) 전체로 세고, 가중치는 단어 횟수에만 쓴다.
+    (코퍼스가 같으면 가중치도 같으므로 가중치 배열은 해시하지 않고 사용 여부만 키로 사용, _df는 data로 정해짐)
+    """
+    perf.cache_miss("get_timeline")
+    return pipeline.build_timeline(corpus_path, _weights if weighted else None, _df["pubDate"])
 
-    # 5. 최종 단어 빈도 계산
-    freq = Counter(all_filtered_nouns)
 
-    return freq, all_edge_list
+@perf.track_cache
+@analysis_cache.cached("timeline")
+def get_timeline_view(data, dedup_mode, min_len, window, days, resolution, _timeline=None):
+    """
+    시간 단위 Timeline을 resolution("H", "D", "W") 단위로 합친 Timeline을 반환합니다.
+    _timeline은 분석 키(data, dedup_mode, min_len, window, 증분 분석 기간 days)로 정해지므로 캐시 키에서 제외합니다.
+    (단어 선택이나 다른 위젯만 바꾼 실행에서는 다시 합치지 않음)
+    """
+    perf.cache_miss("get_timeline_view")
+    return timeline.resample(_timeline, resolution)
+
 # ----------------------------------------------------------------------
-# E. [캐시 함수] 시계열 분석 데이터 전처리
-# plotly, seaborn, altair 시각화에 공통으로 사용되는 시계열 데이터 전처리
-# pubDate를 기준으로 일별 기사 건수 및 상위 N개 키워드의 일별 등장 빈도 계산..!
+# F. [캐시 함수] 네트워크 레이아웃
+# spring_layout은 그래프(상위 엣지 목록)가 바뀔 때만 다시 계산한다.
+# 엣지 수를 늘린 경우 이전 좌표에서 시작하므로 적은 반복으로 수렴..!
+# ----------------------------------------------------------------------
+def network_fingerprint(top_edges):
+    """상위 엣지 목록(단어 쌍 + 빈도)으로 그래프 지문을 만듭니다."""
+    return hashlib.blake2b(repr(top_edges).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def layout_fingerprint(pos):
+    """시작 좌표 {단어: (x, y)}의 지문 (없으면 None)"""
+    if not pos:
+        return None
+    return hashlib.blake2b(repr(sorted(pos.items())).encode("utf-8"), digest_size=16).hexdigest()
+
+
+@perf.track_cache
+@analysis_cache.cached("layout")
+def get_network_layout(graph_key, init_key, _top_edges, _init_pos=None):
+    """
+    노드 좌표 {단어: (x, y)}를 반환합니다.
+    graph_key(그래프 지문)와 init_key(시작 좌표 지문)로 캐싱하고, _init_pos가 있으면 그 좌표에서 레이아웃을 이어서 계산합니다.
+    (시작 좌표가 없는 첫 배치는 모든 세션이 공유하고, 이어서 계산한 배치는 같은 시작 좌표일 때만 재사용)
+    """
+    perf.cache_miss("get_network_layout")
+    return pipeline.network_layout(_top_edges, _init_pos)
 
-@st.cache_data
-def get_time_series_data(df, freq, min_len, top_n=5):
+
+# 노드 크기/색은 화면에 그리는 상위 관계가 아니라 전체 동시 등장 그래프에서 계산 (분석 결과당 한 번)
+@perf.track_cache
+@analysis_cache.cached("graph")
+def get_graph_stats(data, dedup_mode, min_len, window=0, days=None, _cooc=None):
+    """
+    전체 동시 등장 그래프의 가중 연결 정도, PageRank, 커뮤니티(graph.GraphStats)를 반환합니다.
+    _cooc는 분석 키(data, dedup_mode, min_len, window, 증분 분석 기간 days)로 정해지므로 캐시 키에서 제외합니다.
+    """
+    perf.cache_miss("get_graph_stats")
+    return graph.analyze_graph(_cooc)
+
+
+@perf.track_cache
+@analysis_cache.cached("graph")
+def get_subgraph_edges(data, dedup_mode, min_len, window, days, n, mode, _cooc=None, _graph_stats=None):
     """
-    일별 기사 건수(daily_volume)와
-    상위 N개 키워드의 일별 등장 빈도(time_series_df)를 반환
+    화면에 그릴 관계 n개 (graph.subgraph_edges, mode는 graph.SUBGRAPHS 참고)를 반환합니다.
+    _cooc, _graph_stats는 분석 키로 정해지므로 캐시 키에서 제외합니다.
     """
-    df_copy = df.copy()
+    perf.cache_miss("get_subgraph_edges")
+    with perf.stage("top_edges", n=n):
+        return graph.subgraph_edges(_cooc, _graph_stats, n, mode)
 
-    # pubDate -> datetime 안전 변환
-    df_copy["datetime"] = pd.to_datetime(df_copy["pubDate"], errors="coerce")
-    df_copy = df_copy.dropna(subset=["datetime"])
+# ----------------------------------------------------------------------
+# G. 차트 렌더링 (render_cache에서 호출, 렌더링 전용 스레드에서 실행)
+# 렌더링 함수는 pipeline.py (pyplot 전역 상태를 쓰지 않고 PNG 바이트로 반환)
+# ----------------------------------------------------------------------
+@st.cache_resource
+def load_wordcloud_mask():
+    """data/mask.png를 워드클라우드 마스크로 한 번만 변환합니다."""
+    return pipeline.load_mask(pipeline.MASK_PATH, pipeline.WORDCLOUD_SIZE[1])
+
+# ----------------------------------------------------------------------
+# H. [캐시 함수] 검색어 비교
+# 검색어별로 따로 분석하지 않고, 기사를 link 기준으로 합쳐서 형태소 분석은 한 번만..!
+# ----------------------------------------------------------------------
+@perf.track_cache
+@analysis_cache.cached("compare")
+def compare_data(keywords, num, min_len, window=0, _workers=1):
+    """
+    검색어 튜플을 함께 수집/분석하여 검색어별, 공통 기사의 빈도와 동시 등장을 반환합니다.
+    결과는 복사하지 않고 참조로 돌려줍니다. (읽기 전용으로만 사용)
+    """
+    perf.cache_miss("compare_data")
+    return compare.compare(list(keywords), num, min_len, window, _workers)
 
-    # 날짜만
-    df_copy["date"] = df_copy["datetime"].dt.date
+# ----------------------------------------------------------------------
+# I. [캐시 함수] 유사 기사 정리
+# 같은 보도자료/전재 기사가 여러 번 수집되면 빈도와 관계가 부풀려지므로,
+# 형태소 분석 전에 MinHash/LSH로 묶어서 대표 기사만 분석한다. (분석할 기사 수도 줄어듦)
+# ----------------------------------------------------------------------
+@perf.track_cache
+@analysis_cache.cached("dedup")
+def dedupe_data(data, mode, _df=None):
+    """(분석할 기사 DataFrame, 기사별 가중치 또는 None)을 반환합니다. mode는 dedup.MODES 참고."""
+    perf.cache_miss("dedupe_data")
+    return dedup.reduce_duplicates(_df, mode)
 
-    # 1) 일별 기사 건수
-    daily_volume = df_copy.groupby("date").size().reset_index(name="기사_건수")
+# ----------------------------------------------------------------------
+# J. 백그라운드 작업 (수집/분석을 스크립트 스레드 밖에서)
+# 작업은 모든 세션이 공유하는 jobs.executor에서 실행되고, 같은 요청(키)은 하나로 합쳐진다.
+# 분석 중에 슬라이더를 움직여도 화면이 멈추지 않고, 설정이 바뀌어 필요 없어진 작업은 취소된다.
+# ----------------------------------------------------------------------
+FETCH_STAGES = ["fetch", "api.fetch", "api.clean"]
+STREAM_STAGES = ["stream", "tokenize_batch"]
+ANALYSIS_STAGES = ["dedup", "analyze", "tokenize", "write_corpus", "filter", "freq", "cooccur", "merge",
+                   "timeline", "graph"]
+STAGE_LABELS = {
+    "fetch": "수집 준비", "api.fetch": "뉴스 API 호출", "api.clean": "기사 정리",
+    "stream": "뉴스 API 호출", "tokenize_batch": "형태소 분석",
+    "dedup": "유사 기사 묶기", "analyze": "분석 준비", "tokenize": "형태소 분석",
+    "write_corpus": "코퍼스 저장", "filter": "불용어 필터링", "freq": "단어 빈도", "cooccur": "동시 등장 계산",
+    "merge": "새 기사 반영", "timeline": "시계열 집계", "graph": "네트워크 지표 계산",
+}
 
-    # 2) 상위 N개 키워드
-    top_words = [word for word, _ in freq.most_common(int(top_n))]
 
-    # 3) 일별 키워드 빈도
-    all_time_series_data = []
-    okt = Okt()
-    stop_words = get_stop_words(st.session_state.get("search_keyword", ""))
+def run_fetch(keyword, num):
+    with perf.stage("fetch", num=num):
+        return fetch_news_data(keyword, num)
 
-    for date, group_df in df_copy.groupby("date"):
-        daily_text = " ".join(
-            group_df["title"].fillna("").astype(str) + " " + group_df["description"].fillna("").astype(str)
-        )
 
-        nouns = okt.nouns(daily_text)
-        daily_nouns = [n for n in nouns if len(n) >= min_len and n not in stop_words]
-        daily_freq = Counter(daily_nouns)
+def run_stream(keyword, num, stop_words, min_len, workers):
+    """
+    스트리밍 수집: API 페이지(배치)가 도착할 때마다 형태소 분석하고
+    (지금까지 수집한 기사, 빈도 상위 20개 단어)를 중간 결과로 내보냅니다. 최신순으로 합친 기사를 반환합니다.
+    """
+    with perf.stage("stream", num=num):
+        batches = []
+        stream_freq = Counter()
+        for page in store.iter_collect_news(keyword, num):
+            batches.append(page)
+            doc_terms = pipeline.analyze_batch(page, stop_words, min_len, workers)
+            stream_freq.update(n for terms in doc_terms for n in terms)
+            jobs.publish((pd.concat(batches, ignore_index=True), stream_freq.most_common(20)))
+    if not batches:
+        return pd.DataFrame()
+    return pd.concat(batches, ignore_index=True).sort_values("pubDate", ascending=False, ignore_index=True)
 
-        for word in top_words:
-            all_time_series_data.append({
-                "날짜": date,
-                "단어": word,
-                "빈도": daily_freq.get(word, 0)
-            })
 
-    time_series_df = pd.DataFrame(all_time_series_data).sort_values("날짜")
+def run_analysis(data, dedup_mode, min_len, window, df, workers, days=None):
+    """
+    유사 기사 정리 -> 통합 분석 -> 시계열 행렬 -> 네트워크 지표.
+    (분석 대상 기사 수, 분석한 대표 기사 수, freq, cooc, 시간 단위 Timeline, 그래프 지표)를 반환합니다.
+    days가 None이 아니면 검색어별 증분 상태에 새 기사만 반영합니다. (0이면 기간 제한 없음)
+    """
+    if days is None:
+        analysis_df, doc_weights = dedupe_data(data, dedup_mode, df)
+        freq, cooc, corpus_path = analyze_data(data, dedup_mode, min_len, window, analysis_df, doc_weights, workers)
+        base_timeline = get_timeline(data, corpus_path, doc_weights is not None, doc_weights, df)
+        n_docs, n_analyzed = len(df), len(analysis_df)
+    else:
+        state = incremental.get_state(data.keyword, get_stop_words(data.keyword), min_len, window, dedup_mode)
+        freq, cooc, base_timeline, n_docs, n_analyzed = state.sync(df, workers, days or None)
+    graph_stats = get_graph_stats(data, dedup_mode, min_len, window, days, cooc)
+    return n_docs, n_analyzed, freq, cooc, base_timeline, graph_stats
 
-    return daily_volume, time_series_df
+
+def wait_for_job(job, label):
+    """
+    작업이 끝날 때까지 진행률과 현재 단계를 표시하고 결과를 반환합니다.
+    기다리는 중에 설정이 바뀌면 Streamlit이 이 스크립트를 멈추고 다시 실행하며, 작업은 백그라운드에서 계속된다.
+    """
+    if not job.done():
+        bar = st.progress(0.0, text=label)
+        while not job.wait(0.2):
+            fraction, stage = job.progress()
+            bar.progress(fraction, text=f"{label} - {STAGE_LABELS.get(stage, stage or '대기 중')}")
+        bar.empty()
+    return job.result()
+
+def wait_for_stream(job, label, num):
+    """
+    스트리밍 수집 작업이 끝날 때까지 기다리며, 중간 결과가 나올 때마다 수집 건수/빈도 상위 단어/일별 기사 수를 갱신합니다.
+    다른 실행(rerun)에서 시작된 작업이면 지금까지의 중간 결과부터 이어서 보여줍니다.
+    """
+    if not job.done():
+        bar = st.progress(0.0, text=label)
+        freq_slot = st.empty()
+        volume_slot = st.empty()
+        shown = 0
+        while not job.wait(0.2):
+            updates, partial = job.partial()
+            if partial is None or updates == shown:
+                continue
+            shown = updates
+            collected, top_words = partial
+            bar.progress(min(1.0, len(collected) / num), text=f"{label} - {len(collected)}건")
+            freq_slot.dataframe(pd.DataFrame(top_words, columns=["단어", "빈도"]), use_container_width=True)
+            volume_slot.line_chart(collected.groupby(collected["pubDate"].dt.date).size().rename("기사_건수"))
+        bar.empty()
+        freq_slot.empty()
+        volume_slot.empty()
+    return job.result()
 
 # ======================================================
 # 3) 사이드바 (인터렉티브한 조작 구현~)
@@ -232,10 +415,16 @@ with st.sidebar:
     edge_top_n = st.slider(
         "네트워크 관계 수 (Top N)",
         min_value=10,
-        max_value=100,
+        max_value=500,
         value=50,
         step=10
     )
+    # 네트워크에 그릴 관계 고르는 방법 (전체 빈도 상위 / 중요 단어끼리)
+    network_subgraph = st.selectbox(
+        "네트워크 구성",
+        options=list(graph.SUBGRAPHS),
+        format_func=graph.SUBGRAPHS.get
+    )
     min_word_len = st.slider(
         "단어 최소 길이",
         min_value=1,
@@ -249,31 +438,194 @@ with st.sidebar:
         max_value=10,
         value=5
     )
+    # 시계열 집계 단위 (시간/일/주)
+    ts_resolution = st.selectbox(
+        "시계열 단위",
+        options=list(timeline.RESOLUTIONS),
+        index=1,
+        format_func=timeline.RESOLUTIONS.get
+    )
+    ts_unit = timeline.RESOLUTIONS[ts_resolution]
+    # 형태소 분석 프로세스 수 (1이면 직렬 분석)
+    nlp_workers = st.slider(
+        "형태소 분석 프로세스 수",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=nlp.DEFAULT_WORKERS
+    )
+    # 스트리밍 모드: 페이지가 도착할 때마다 분석 결과를 바로 보여줌
+    stream_mode = st.checkbox("수집하면서 바로 분석 (스트리밍)", value=True)
+    # 네트워크 동시 등장 범위 (0 = 기사 전체)
+    cooc_window = st.selectbox(
+        "동시 등장 범위 (연속 단어 수)",
+        options=[0, 3, 5, 10],
+        format_func=lambda w: "기사 전체" if w == 0 else f"{w}단어 이내"
+    )
+    # 유사(전재) 기사 처리
+    dedup_mode = st.selectbox(
+        "유사 기사 처리",
+        options=dedup.MODES,
+        index=1,
+        format_func={
+            "off": "그대로 분석",
+            "collapse": "대표 기사만 분석",
+            "weight": "대표 기사만 분석 (묶음 크기 가중치)",
+        }.get
+    )
+    # 증분 분석: 같은 검색어를 다시 수집하면 새 기사만 분석하고, 빠진 기사/기간 밖 날짜는 합계에서 뺀다
+    incremental_mode = st.checkbox(
+        "새 기사만 추가 분석 (증분)",
+        value=False,
+        help="다시 수집할 때 새 기사만 형태소 분석합니다. 유사 기사 묶음은 이미 있는 대표 기사 기준으로만 찾으므로 "
+             "전체 분석과 드물게 다를 수 있습니다. (근사)"
+    )
+    keep_days = st.number_input(
+        "분석 기간 (최근 N일, 0이면 전체)",
+        min_value=0,
+        max_value=365,
+        value=0,
+        disabled=not incremental_mode,
+        help="증분 분석에서만 사용합니다. 가장 최근 기사 날짜부터 N일 안의 기사만 분석합니다."
+    )
+    # 증분 분석이 아니면 None (기간 설정은 작업/캐시 키에 포함)
+    analysis_days = int(keep_days) if incremental_mode else None
+    use_wc_mask = st.checkbox("워드클라우드 마스크 모양 사용", value=False)
+    # 야간 배치(batch.py)가 같은 설정으로 만든 최신 리포트가 있으면 수집/분석 없이 바로 표시
+    use_reports = st.checkbox(
+        "야간 리포트가 있으면 바로 보기",
+        value=True,
+        help=f"수집 기사 수, 단어 최소 길이, 동시 등장 범위, 유사 기사 처리가 같고 "
+             f"{batch.REPORT_MAX_AGE // 3600}시간 안에 만든 리포트만 사용합니다."
+    )
     search_btn = st.button("수집 시작", use_container_width=True)
 
+    st.subheader("🆚 검색어 비교")
+    compare_input = st.text_input(
+        "비교할 검색어 (쉼표로 구분)",
+        placeholder="예: K팝 데몬 헌터스, 케데헌",
+        key="compare_keywords_input"
+    )
+    compare_btn = st.button("비교 분석", use_container_width=True)
+
+    st.subheader("🛠️ 진단")
+    show_perf = st.checkbox("성능 패널 표시", value=False)
+    trace_memory = st.checkbox("단계별 메모리 측정 (느려짐)", value=False)
+
+# 메모리 측정은 켜 둔 세션이 하나라도 있는 동안만 (tracemalloc은 모든 할당을 추적하므로 느려진다)
+if trace_memory:
+    perf.start_memory(session_id)
+else:
+    perf.stop_memory(session_id)
+
+# 검색어를 입력하는 동안 JVM/Okt를 백그라운드에서 준비
+warm_up_okt()
+
 # ======================================================
 # 4) 메인 화면 – 데이터 수집 실행
 # ======================================================
 st.header("1. 데이터 수집")
-if search_btn:
+# 야간 리포트 화면에서 "최신 기사로 다시 수집"을 누르면 리포트의 검색어를 리포트 없이 수집
+refresh_report = st.session_state.get("report_refresh", False) and "report" in st.session_state
+if refresh_report:
+    keyword = st.session_state.pop("report")["summary"]["keyword"]
+if search_btn or refresh_report:
     if not keyword:
         st.warning("검색어를 입력하세요.")
     else:
-        with st.spinner("뉴스 데이터 수집 중..."):
-            try:
-                # 데이터 수집 (캐싱 함수 사용)
-                df = fetch_news_data(keyword, news_limit)
-                
-                if df is not None and not df.empty:
-                    # st.session_state에 수집된 데이터와 검색어 저장
-                    st.session_state["news_df"] = df
-                    st.session_state["search_keyword"] = keyword
-                    st.success(f"수집 완료: {len(df)}건")
-                else:
-                    st.warning("검색 결과가 없습니다.")
-                    st.session_state["news_df"] = pd.DataFrame() # 빈 DF로 초기화
-            except Exception as e:
-                st.error(f"에러 발생: {e}")
+        # 설정이 같은 최신 야간 리포트(batch.py)가 있으면 수집/분석 작업을 시작하지 않고 리포트를 바로 보여준다.
+        # (증분 분석의 기간 제한은 리포트에 없는 설정이므로 제외)
+        report = None
+        if use_reports and not refresh_report and not analysis_days:
+            report = batch.find_report(keyword, {"num_data": news_limit, "min_len": min_word_len,
+                                                 "window": cooc_window, "dedup_mode": dedup_mode})
+        if report is not None:
+            st.session_state["report"] = report
+            st.session_state.pop("fetch_job", None)
+            st.session_state.pop("fetch_keyword", None)
+            jobs.executor.release((session_id, "fetch"))
+            st.session_state["news_df"] = pd.DataFrame()
+            st.session_state.pop("news_dataset", None)
+        else:
+            st.session_state.pop("report", None)
+            if stream_mode:
+                # 페이지 단위 스트리밍 (백그라운드 작업): 배치가 올 때마다 형태소 분석 후 중간 결과를 내보내고
+                # 화면은 기다리는 동안 표/차트를 갱신한다. 설정을 바꿔 다시 실행되어도 수집은 계속되고 이어서 표시된다.
+                st.session_state["fetch_job"] = jobs.executor.submit(
+                    ("stream", keyword, news_limit, min_word_len), run_stream,
+                    keyword, news_limit, get_stop_words(keyword), min_word_len, nlp_workers,
+                    owner=(session_id, "fetch"), stages=STREAM_STAGES, ttl=0
+                )
+            else:
+                # 데이터 수집 (캐싱 함수 사용, 백그라운드 작업)
+                # 다른 세션이 같은 검색어를 수집 중이면 그 작업을 함께 기다린다.
+                # 기다리는 중에 설정을 바꿔도 다음 실행에서 이어서 기다리도록 세션에 작업을 보관
+                st.session_state["fetch_job"] = jobs.executor.submit(
+                    ("fetch", keyword, news_limit), run_fetch, keyword, news_limit,
+                    owner=(session_id, "fetch"), stages=FETCH_STAGES, ttl=0
+                )
+            st.session_state["fetch_keyword"] = keyword
+
+if "fetch_job" in st.session_state:
+    try:
+        fetch_job = st.session_state["fetch_job"]
+        run_owners.add(fetch_job.key)
+        if fetch_job.key[0] == "stream":
+            df = wait_for_stream(fetch_job, "뉴스 데이터 수집 및 분석 중", fetch_job.key[2])
+        else:
+            df = wait_for_job(fetch_job, "뉴스 데이터 수집 중")
+        fetch_keyword = st.session_state.pop("fetch_keyword")
+        del st.session_state["fetch_job"]
+
+        if df is not None and not df.empty:
+            # st.session_state에 수집된 데이터와 검색어 저장
+            st.session_state["news_df"] = df
+            st.session_state["search_keyword"] = fetch_keyword
+            # 내용 지문은 여기서 한 번만 계산 (이후 실행은 핸들로 캐시 조회)
+            st.session_state["news_dataset"] = dataset.make_dataset(fetch_keyword, df)
+            # 스트리밍 수집이었다면 형태소 분석 결과는 문서별 캐시에 남아 있으므로 아래 6) 통합 분석은 필터링만 한다.
+            st.success(f"수집 완료: {len(df)}건")
+        else:
+            st.warning("검색 결과가 없습니다.")
+            st.session_state["news_df"] = pd.DataFrame() # 빈 DF로 초기화
+            st.session_state.pop("news_dataset", None)
+    except Exception as e:
+        st.session_state.pop("fetch_job", None)
+        st.session_state.pop("fetch_keyword", None)
+        st.error(f"에러 발생: {e}")
+
+# 야간 리포트 (수집/분석 없이 저장된 결과만 표시)
+if "report" in st.session_state:
+    report = st.session_state["report"]
+    summary = report["summary"]
+    st.success(
+        f"야간 리포트 ({summary['generated_at']} 생성): 수집 {summary['articles']}건, 분석 {summary['analyzed']}건"
+    )
+    st.button("최신 기사로 다시 수집", key="report_refresh")
+
+    report_freq = [(w, int(c)) for w, c in report["freq"].head(int(wc_top_n)).itertuples(index=False, name=None)]
+    if report_freq:
+        wc_font = FONT_PATH if os.path.exists(FONT_PATH) else None
+        wc_mask = load_wordcloud_mask() if use_wc_mask else None
+        wc_key = render_cache.digest(
+            "wordcloud", report_freq, pipeline.WORDCLOUD_SIZE, wc_font, pipeline.MASK_PATH if wc_mask is not None else None
+        )
+        st.image(
+            render_cache.cache.get_or_render(
+                wc_key, pipeline.render_wordcloud_png, dict(report_freq), pipeline.WORDCLOUD_SIZE, wc_font, wc_mask
+            ),
+            use_container_width=True
+        )
+        with st.expander("단어 빈도 Top 50"):
+            st.dataframe(report["freq"].head(50), use_container_width=True)
+    if not report["edges"].empty:
+        st.markdown("**상위 관계**")
+        st.dataframe(report["edges"].head(int(edge_top_n)), use_container_width=True)
+    if not report["daily_volume"].empty:
+        st.markdown("**일별 뉴스 발행량**")
+        st.line_chart(report["daily_volume"].set_index("date")["기사_건수"])
+    if not report["time_series"].empty:
+        st.markdown("**상위 키워드 일별 등장 추이**")
+        st.line_chart(report["time_series"].pivot_table(index="날짜", columns="단어", values="빈도"))
 
 # ======================================================
 # 5) 데이터 확인
@@ -289,41 +641,62 @@ if "news_df" in st.session_state and not st.session_state["news_df"].empty:
 if "news_df" in st.session_state and not st.session_state["news_df"].empty:
     df = st.session_state["news_df"]
     keyword = st.session_state.get("search_keyword", "")
+    if "news_dataset" not in st.session_state:
+        st.session_state["news_dataset"] = dataset.make_dataset(keyword, df)
+    news_dataset = st.session_state["news_dataset"]
     
-    with st.spinner("통합 텍스트 분석 중 (형태소 분석 및 관계 생성)..."):
-        # [핵심] 통합 분석 함수 호출 (캐시 함수)
-        try:
-            freq, edge_list = analyze_data(df, keyword, min_word_len)
-        except Exception as e:
-            st.error(f"분석 중 오류 발생: {e}")
-            freq = Counter()
-            edge_list = []
+    # [핵심] 통합 분석 (캐시 함수, 키는 데이터셋 핸들) - 백그라운드 작업으로 실행하고 진행률 표시
+    # 유사 기사를 먼저 묶어서 대표 기사만 형태소 분석
+    # 분석 설정이 바뀌면 이 세션의 이전 분석 작업은 (다른 세션이 기다리지 않으면) 취소된다.
+    # 완료된 작업 결과는 따로 보관하지 않는다(ttl=0). 다음 실행은 분석 캐시/증분 상태에서 바로 결과를 받는다.
+    try:
+        analysis_job = jobs.executor.submit(
+            ("analyze", news_dataset, dedup_mode, min_word_len, cooc_window, analysis_days),
+            run_analysis, news_dataset, dedup_mode, min_word_len, cooc_window, df, nlp_workers, analysis_days,
+            owner=(session_id, "analyze"), stages=ANALYSIS_STAGES, ttl=0
+        )
+        run_owners.add(analysis_job.key)
+        n_docs, n_analyzed, freq, cooc, base_timeline, graph_stats = wait_for_job(
+            analysis_job, "통합 텍스트 분석 중 (형태소 분석 및 관계 생성)"
+        )
+    except Exception as e:
+        st.error(f"분석 중 오류 발생: {e}")
+        n_docs = n_analyzed = len(df)
+        freq = Counter()
+        cooc = None
+        base_timeline = None
+        graph_stats = None
 
+    if n_docs < len(df):
+        st.caption(f"최근 {analysis_days}일 기사 {n_docs}건만 분석했습니다. (전체 {len(df)}건)")
+    if n_analyzed < n_docs:
+        st.caption(f"유사 기사 {n_docs - n_analyzed}건을 묶어 대표 기사 {n_analyzed}건을 분석했습니다.")
     if not freq:
         st.warning("분석 가능한 명사가 없어 워드클라우드/네트워크를 생성할 수 없습니다. (단어 최소 길이 조절 필요)")
-    daily_volume, time_series_df = get_time_series_data(df, freq, min_word_len, ts_top_n)
+    # 시계열은 코퍼스당 한 번 만든 (증분 분석이면 상태가 갱신해 둔) 시간별 행렬을 선택한 단위로 합쳐서 사용 (단어 선택은 아래 7번 섹션)
+    ts_view = None
+    if base_timeline is not None:
+        ts_view = get_timeline_view(news_dataset, dedup_mode, min_word_len, cooc_window, analysis_days,
+                                    ts_resolution, base_timeline)
+    daily_volume = timeline.volume_frame(ts_view, ts_resolution) if ts_view is not None else pd.DataFrame(columns=["date", "기사_건수"])
 # ======================================================
 # 7) 워드클라우드 시각화
 # ======================================================
 st.header("3. 워드클라우드 시각화")
 if "news_df" in st.session_state and not st.session_state["news_df"].empty and freq:
-    
-    # 1. 워드클라우드 생성
-    wc = WordCloud(
-        font_path=FONT_PATH if os.path.exists(FONT_PATH) else None,
-        background_color="white",
-        width=900,
-        height=450,
-        max_words=int(wc_top_n)
-    ).generate_from_frequencies(
-        dict(freq.most_common(int(wc_top_n)))
+    # 1. 워드클라우드 생성 (같은 입력이면 렌더 캐시의 PNG를 그대로 사용)
+    wc_words = freq.most_common(int(wc_top_n))
+    wc_font = FONT_PATH if os.path.exists(FONT_PATH) else None
+    wc_mask = load_wordcloud_mask() if use_wc_mask else None
+    wc_key = render_cache.digest(
+        "wordcloud", wc_words, pipeline.WORDCLOUD_SIZE, wc_font, pipeline.MASK_PATH if wc_mask is not None else None
     )
-    
+    wc_png = render_cache.cache.get_or_render(
+        wc_key, pipeline.render_wordcloud_png, dict(wc_words), pipeline.WORDCLOUD_SIZE, wc_font, wc_mask
+    )
+
     # 2. 시각화 출력
-    fig = plt.figure(figsize=(12, 5))
-    plt.imshow(wc, interpolation="bilinear")
-    plt.axis("off")
-    st.pyplot(fig, clear_figure=True)
+    st.image(wc_png, use_container_width=True)
     
     # 3. 단어 빈도 표
     with st.expander("단어 빈도 Top 50"):
@@ -347,57 +720,78 @@ if "news_df" in st.session_state and not st.session_state["news_df"].empty and f
 # ======================================================
 st.header("4. 키워드 네트워크 분석")
 
-if "news_df" in st.session_state and not st.session_state["news_df"].empty and edge_list:
+if "news_df" in st.session_state and not st.session_state["news_df"].empty and cooc is not None:
 
-    # 1. 엣지 빈도 계산
-    edge_counts = Counter(edge_list)
-    
-    # 2. 상위 N개 엣지 필터링
-    top_edges = edge_counts.most_common(int(edge_top_n))
+    # 1~2. 상위 N개 엣지 (희소 행렬에서 바로 추출, PageRank 상위 단어끼리로 좁힐 수도 있음)
+    # 분석 결과와 관계 수/고르는 방법이 같으면 캐시에서 바로 (위젯만 바꾼 실행에서 다시 고르지 않음)
+    top_edges = get_subgraph_edges(news_dataset, dedup_mode, min_word_len, cooc_window, analysis_days,
+                                   int(edge_top_n), network_subgraph, cooc, graph_stats)
 
     if len(top_edges) == 0:
         st.warning(f"상위 {int(edge_top_n)}개 관계를 찾을 수 없습니다. (설정 조절 필요)")
     else:
-        # 3. 그래프 객체 생성
-        G = nx.Graph()
-        weighted_edges = [(u, v, weight) for (u, v), weight in top_edges]
-        G.add_weighted_edges_from(weighted_edges)
-        
-        # 4. 중심성 계산 (Degree Centrality: 노드 크기 결정)
-        centrality = nx.degree_centrality(G)
-        
-        # 5. 시각화 준비
-        fig, ax = plt.subplots(figsize=(15, 15)) 
-        
-        # 레이아웃 결정 (힘 기반 배치)
-        pos = nx.spring_layout(G, k=0.3, iterations=50, seed=42)
-        
-        # 노드 크기 및 엣지 두께 설정
-        node_size = [v * 7000 for v in centrality.values()]
-        edge_width = [d['weight'] * 0.05 for (u, v, d) in G.edges(data=True)]
-
-        # 6. draw_networkx 호출
-        nx.draw_networkx(
-            G, 
-            pos,
-            with_labels=True,
-            node_size=node_size,
-            node_color="#63B8FF", # 산뜻한 색상으로 변경
-            edge_color="gray",
-            width=edge_width,
-            font_family=FONT_NAME, # 전역 설정된 폰트 사용
-            font_size=12,
-            alpha=0.8,
-            ax=ax
+        import altair as alt
+
+        # 3~4. 레이아웃 (그래프가 같으면 이 세션의 배치를 그대로, 엣지가 늘면 이전 배치에서 이어서 계산)
+        graph_key = network_fingerprint(top_edges)
+        prev_key, prev_pos = st.session_state.get("network_layout", (None, None))
+        if prev_key == graph_key:
+            pos = prev_pos
+        else:
+            pos = get_network_layout(graph_key, layout_fingerprint(prev_pos), top_edges, _init_pos=prev_pos)
+            st.session_state["network_layout"] = (graph_key, pos)
+
+        # 5. 시각화 데이터 (브라우저에서 Vega로 그리므로 서버는 좌표만 계산)
+        # 노드 지표는 화면에 그린 부분 그래프가 아니라 전체 동시 등장 그래프 기준
+        node_stats = graph.node_values(graph_stats, pos)
+        nodes_df = pd.DataFrame(
+            [(n, x, y, *node_stats[n]) for n, (x, y) in pos.items()],
+            columns=["단어", "x", "y", "PageRank", "가중 연결 정도", "커뮤니티"]
         )
-        
-        ax.set_title(f"'{keyword}' 키워드 관계망 (Top {int(edge_top_n)})", size=20)
-        plt.axis('off')
-        st.pyplot(fig, clear_figure=True)
+        n_communities = nodes_df["커뮤니티"].nunique()
+        edges_df = pd.DataFrame(
+            [(f"{u} - {v}", *pos[u], *pos[v], weight) for (u, v), weight in top_edges],
+            columns=["단어 쌍", "x", "y", "x2", "y2", "빈도"]
+        )
+
+        # 노드 크기 = PageRank, 노드 색 = 커뮤니티, 엣지 두께 = 동시 등장 빈도
+        edge_layer = alt.Chart(edges_df).mark_rule(color="gray", opacity=0.6).encode(
+            x=alt.X("x:Q", axis=None),
+            y=alt.Y("y:Q", axis=None),
+            x2="x2:Q",
+            y2="y2:Q",
+            strokeWidth=alt.StrokeWidth("빈도:Q", scale=alt.Scale(range=[0.5, 8]), legend=None),
+            tooltip=["단어 쌍:N", "빈도:Q"]
+        )
+        node_layer = alt.Chart(nodes_df).mark_circle(opacity=0.8).encode(
+            x="x:Q",
+            y="y:Q",
+            size=alt.Size("PageRank:Q", scale=alt.Scale(range=[100, 3000]), legend=None),
+            color=alt.Color("커뮤니티:N", scale=alt.Scale(scheme="tableau20"), legend=None),
+            tooltip=[
+                "단어:N",
+                alt.Tooltip("PageRank:Q", format=".4f"),
+                alt.Tooltip("가중 연결 정도:Q", format=",.0f"),
+                "커뮤니티:N",
+            ]
+        )
+        label_layer = alt.Chart(nodes_df).mark_text(fontSize=12).encode(
+            x="x:Q",
+            y="y:Q",
+            text="단어:N"
+        )
+
+        # 6. 줌/패닝 가능한 클라이언트 렌더링 차트
+        chart = (edge_layer + node_layer + label_layer).properties(
+            title=f"'{keyword}' 키워드 관계망 (Top {int(edge_top_n)}, {graph.SUBGRAPHS[network_subgraph]})",
+            height=800
+        ).configure_view(strokeWidth=0).interactive()
+        st.altair_chart(chart, use_container_width=True)
         
         st.info(f"""
-        **💡 시각화 해석 가이드 (총 {len(G.nodes())}개 노드)**
-        * [cite_start]**노드(단어) 크기**: 연결 중심성) , 즉, 다른 단어들과 얼마나 많이 직접적으로 연결되었는지.
+        **💡 시각화 해석 가이드 (총 {len(pos)}개 노드, {n_communities}개 커뮤니티)**
+        * [cite_start]**노드(단어) 크기**: PageRank, 즉, 중요한 단어들과 많이, 자주 연결될수록 커집니다. (화면에 보이는 관계만이 아니라 전체 관계망 기준)
+        * [cite_start]**노드(단어) 색**: 커뮤니티. 서로 자주 함께 나오는 단어 묶음(주제)을 같은 색으로 표시합니다.
         * [cite_start]**선(Edge) 두께**: 동시 등장 빈도 (관계의 강도). 두 단어가 기사에서 함께 나온 횟수를 의미합니다.
         * [cite_start]**레이아웃**: 힘 기반 배치. 관계가 강한 단어일수록 서로 가깝게 배치됩니다.
 
@@ -414,6 +808,19 @@ if "news_df" in st.session_state and not st.session_state["news_df"].empty and e
                 ),
                 use_container_width=True
             )
+        # 전체 관계망 기준 중요 단어 (화면에 그리지 않은 단어 포함)
+        with st.expander("PageRank 상위 단어 (전체 관계망)"):
+            top_ids = graph.top_nodes(graph_stats, 50)
+            st.dataframe(
+                pd.DataFrame({
+                    "단어": [graph_stats.vocab[i] for i in top_ids],
+                    "PageRank": graph_stats.pagerank[top_ids],
+                    "가중 연결 정도": graph_stats.strength[top_ids],
+                    "연결 단어 수": graph_stats.degree[top_ids],
+                    "커뮤니티": graph_stats.community[top_ids],
+                }),
+                use_container_width=True
+            )
 
 # ======================================================
 # 9) Seaborn: 분석 기간 중 상위 단어 빈도 막대 그래프
@@ -427,20 +834,16 @@ if "news_df" in st.session_state and not st.session_state["news_df"].empty and f
     )
 
     if not top_n_freq_df.empty:
-        fig, ax = plt.subplots(figsize=(10, 8))
-        # 수평 막대 그래프 (빈도 순)
-        sns.barplot(
-            x="빈도", 
-            y="단어", 
-            data=top_n_freq_df.sort_values(by="빈도", ascending=False), 
-            ax=ax,
-            palette="viridis" # 색상 팔레트 지정
+        FONT_NAME, font_warning = setup_matplotlib_font()
+        if font_warning:
+            st.warning(font_warning)
+
+        # 같은 단어/빈도/폰트면 렌더 캐시의 PNG를 그대로 사용
+        bar_key = render_cache.digest("barplot", list(top_n_freq_df.itertuples(index=False, name=None)), FONT_NAME)
+        bar_png = render_cache.cache.get_or_render(
+            bar_key, pipeline.render_barplot_png, top_n_freq_df, f"키워드 빈도 Top {int(ts_top_n)}"
         )
-        ax.set_title(f"키워드 빈도 Top {int(ts_top_n)}", size=15)
-        ax.set_xlabel("빈도", size=12)
-        ax.set_ylabel("단어", size=12)
-        plt.tight_layout()
-        st.pyplot(fig, clear_figure=True)
+        st.image(bar_png, use_container_width=True)
     else:
         st.warning("막대 그래프를 생성할 충분한 데이터가 없습니다.")
     
@@ -454,18 +857,20 @@ if "news_df" in st.session_state and not st.session_state["news_df"].empty and f
             으로 케이팝 데몬 헌터스는 올해 인기 있는 영화/애니/넷플릭스로서 특히 미국에도 인기가 많다는 것을 유추할 수 있다.
             """)
 # ======================================================
-# 10) Plotly: 일별 뉴스 발행 건수 시계열 그래프
+# 10) Plotly: 시간/일/주별 뉴스 발행 건수 시계열 그래프
 # ======================================================
-st.header("6. 일별 뉴스 발행량 추이 (Plotly)")
+st.header(f"6. {ts_unit}별 뉴스 발행량 추이 (Plotly)")
 if "news_df" in st.session_state and not st.session_state["news_df"].empty:
     
     if not daily_volume.empty:
+        import plotly.express as px
+
         # Plotly Express를 이용한 시계열 꺾은선 그래프 (추세를 보기 좋으니)
         fig = px.line(
             daily_volume,
             x='date',
             y='기사_건수',
-            title='일별 기사 발행 건수 변화 추이',
+            title=f'{ts_unit}별 기사 발행 건수 변화 추이',
             labels={'date': '날짜', '기사_건수': '기사 건수'},
             line_shape='linear',  # 꺾은선 그래프.
             markers=True,         # 각 데이터 포인트에 마커(점) 표시
@@ -474,7 +879,7 @@ if "news_df" in st.session_state and not st.session_state["news_df"].empty:
         
         # 레이아웃 업데이트 (시계열 최적화)
         fig.update_xaxes(
-            tickformat="%Y-%m-%d", 
+            tickformat="%m-%d %H시" if ts_resolution == "H" else "%Y-%m-%d",
             title='날짜'
         )
         fig.update_layout(
@@ -485,7 +890,7 @@ if "news_df" in st.session_state and not st.session_state["news_df"].empty:
         
         st.plotly_chart(fig, use_container_width=True)
     else:
-        st.warning("일별 뉴스 발행 건수 데이터를 찾을 수 없습니다.")
+        st.warning(f"{ts_unit}별 뉴스 발행 건수 데이터를 찾을 수 없습니다.")
     st.info("""
             **💡 시각화 해석 가이드**)
             **꺾은선 그래프**: 시간에 따른 뉴스 발행량의 변화를 시각적으로 파악할 수 있습니다.
@@ -495,10 +900,21 @@ if "news_df" in st.session_state and not st.session_state["news_df"].empty:
             본 차트를 통해 일별로 발행량을 정확하고 직관적으로 파악할 수 있습니다.
                 """)
 # ======================================================
-# 11) Altair: 상위 단어의 일별 등장 빈도 추이
+# 11) Altair: 상위(또는 선택한) 단어의 시간/일/주별 등장 빈도 추이
 # ======================================================
-st.header(f"7. 상위 {ts_top_n}개 키워드 일별 등장 추이 (Altair)")
-if "news_df" in st.session_state and not st.session_state["news_df"].empty and not time_series_df.empty:
+st.header(f"7. 키워드 {ts_unit}별 등장 추이 (Altair)")
+time_series_df = pd.DataFrame(columns=["날짜", "단어", "빈도"])
+if "news_df" in st.session_state and not st.session_state["news_df"].empty and ts_view is not None and freq:
+    # 기본은 상위 N개, 분석된 단어 중 원하는 단어를 골라서 비교할 수도 있음 (행렬 열만 잘라서 계산)
+    ts_terms = st.multiselect(
+        "표시할 단어",
+        options=[word for word, _ in freq.most_common(1000)],
+        default=[word for word, _ in freq.most_common(int(ts_top_n))]
+    )
+    time_series_df = timeline.term_frame(ts_view, ts_terms, ts_resolution)
+
+if not time_series_df.empty:
+    import altair as alt
 
     # Altair 차트 생성
     chart = alt.Chart(time_series_df).mark_line().encode(
@@ -511,12 +927,12 @@ if "news_df" in st.session_state and not st.session_state["news_df"].empty and n
         # 툴팁: 마우스 오버 시 상세 정보 표시
         tooltip=['날짜:T', '단어:N', '빈도:Q']
     ).properties(
-        title=f"일별 상위 {ts_top_n}개 키워드 등장 빈도 변화"
+        title=f"{ts_unit}별 키워드 등장 빈도 변화"
     ).interactive() # 줌/패닝 가능하도록 설정
     
     st.altair_chart(chart, use_container_width=True)
 else:
-    st.warning(f"상위 {ts_top_n}개 키워드 일별 등장 추이 데이터를 찾을 수 없습니다. (데이터 수집 및 분석 확인 필요)")
+    st.warning(f"키워드 {ts_unit}별 등장 추이 데이터를 찾을 수 없습니다. (데이터 수집 및 분석 또는 단어 선택 확인 필요)")
 st.info("""
          **💡 시각화 해석 가이드**
          **선 그래프**: 각 키워드의 일별 등장 빈도 변화를 시각적으로 비교할 수 있습니다.
@@ -525,3 +941,123 @@ st.info("""
          결론 : 키워드들 모두 동일한 추세로 증가하고 감소하는 폭을 보이고 있다.
          이는 상위 10개 키워드의 추이가 비슷하다, 서로 상관이 있다는 것을 의미할 수 있다.
          """)
+
+# ======================================================
+# 12) 검색어 비교 (제목 vs 줄임말 등)
+# ======================================================
+if compare_btn:
+    compare_keywords = list(dict.fromkeys(k.strip() for k in compare_input.split(",") if k.strip()))
+    if len(compare_keywords) < 2:
+        st.warning("비교할 검색어를 쉼표로 구분하여 2개 이상 입력하세요.")
+    else:
+        st.session_state["compare_keywords"] = compare_keywords
+
+if "compare_keywords" in st.session_state:
+    compare_keywords = st.session_state["compare_keywords"]
+    st.header(f"8. 검색어 비교 ({' vs '.join(compare_keywords)})")
+
+    with st.spinner("검색어별 수집 및 공통 형태소 분석 중..."):
+        try:
+            comparison = compare_data(
+                tuple(compare_keywords), news_limit, min_word_len, cooc_window, nlp_workers
+            )
+        except Exception as e:
+            st.error(f"비교 분석 중 오류 발생: {e}")
+            comparison = None
+
+    if comparison is None:
+        st.warning("비교할 기사가 없습니다.")
+    else:
+        # 1. 그룹별 기사 수 (검색어별, 공통, 중복 제거 전/후)
+        counts = compare.article_counts(comparison)
+        for col, (name, n) in zip(st.columns(len(counts)), counts.items()):
+            col.metric(name, f"{n}건")
+
+        # 2. 그룹별 상위 단어 빈도 비교
+        st.subheader("상위 단어 빈도 비교")
+        st.dataframe(compare.freq_table(comparison, 20), use_container_width=True)
+
+        # 3. 그룹별 상위 관계
+        st.subheader("상위 관계 비교")
+        for col, (name, group_cooc) in zip(st.columns(len(comparison.cooc)), comparison.cooc.items()):
+            with col:
+                st.markdown(f"**{name}**")
+                st.dataframe(
+                    pd.DataFrame(cooccur.top_edges(group_cooc, 20), columns=["단어 쌍", "빈도"]),
+                    use_container_width=True
+                )
+
+        st.info(f"""
+        **💡 비교 해석 가이드**
+        * **{compare.OVERLAP}**: 모든 검색어의 결과에 함께 나온 기사만 분석한 결과입니다.
+        * 같은 기사는 한 번만 형태소 분석하므로, 수집 합계보다 분석 기사 수가 적을수록 겹치는 기사가 많다는 뜻입니다.
+        """)
+
+# ======================================================
+# 13) 성능 패널 (사이드바, 진단용)
+# ======================================================
+if show_perf:
+    run_spans = perf.spans(since=run_mark, owners=run_owners)
+    with st.sidebar.expander("⏱️ 성능", expanded=True):
+        st.caption(f"이번 실행: {time.perf_counter() - run_started:.2f}초")
+
+        # 1. 이번 실행에서 다시 계산한 단계 (캐시를 쓴 단계는 나오지 않음)
+        if run_spans:
+            st.dataframe(
+                pd.DataFrame.from_dict(perf.summarize(run_spans), orient="index"),
+                use_container_width=True
+            )
+        else:
+            st.caption("이번 실행에서 다시 계산한 단계가 없습니다. (모두 캐시 사용)")
+
+        # 2. 캐시 적중/실패 (서버 시작 후 누적)
+        cache_stats = perf.cache_stats()
+        render_stats = render_cache.cache.stats()
+        cache_stats["render_cache"] = {"hits": render_stats["hits"], "misses": render_stats["misses"]}
+        st.markdown("**캐시 적중/실패 (누적)**")
+        st.dataframe(pd.DataFrame.from_dict(cache_stats, orient="index"), use_container_width=True)
+
+        # 3. API 호출, 형태소 분석 캐시, 증분 분석(추가/제거한 기사 수) 카운터 (누적)
+        st.markdown("**API / 형태소 분석 / 증분 분석 (누적)**")
+        st.dataframe(
+            pd.DataFrame(
+                list({**perf.counters("api."), **perf.counters("nouns."), **perf.counters("incremental.")}.items()),
+                columns=["항목", "값"]
+            ),
+            use_container_width=True
+        )
+
+        # 4. 백그라운드 작업 (모든 세션 공유: 실행/대기 중, 보관 중인 완료 작업, 합치기/취소 횟수)
+        st.markdown("**백그라운드 작업**")
+        st.dataframe(
+            pd.DataFrame(list(jobs.executor.stats().items()), columns=["항목", "값"]),
+            use_container_width=True
+        )
+
+        # 5. 분석 캐시 (모든 세션 공유: 사용 중인 메모리/한도, 단계별 크기, 내보내기/만료/디스크 횟수)
+        # 한도(limit)는 전체 한도에서 다른 메모리 캐시(명사, 증분 상태, 차트 이미지) 사용량을 뺀 값
+        cache_info = analysis_cache.cache.stats()
+        usage_info = cache_info.pop("usage")
+        st.markdown(
+            f"**분석 캐시** {cache_info['bytes'] / analysis_cache.MB:,.1f} / "
+            f"{cache_info['limit'] / analysis_cache.MB:,.0f} MB "
+            f"(전체 한도 {cache_info['max_bytes'] / analysis_cache.MB:,.0f} MB)"
+        )
+        st.dataframe(
+            pd.DataFrame.from_dict(analysis_cache.cache.stage_stats(), orient="index"),
+            use_container_width=True
+        )
+        st.markdown("**그 밖의 메모리 캐시** (budget: 전체 한도에 포함)")
+        st.dataframe(pd.DataFrame.from_dict(usage_info, orient="index"), use_container_width=True)
+        st.dataframe(
+            pd.DataFrame(list(cache_info.items()), columns=["항목", "값"]),
+            use_container_width=True
+        )
+
+        # 6. 트레이스 내보내기 (이번 실행의 단계 기록 + 전체 카운터)
+        st.download_button(
+            "트레이스 내려받기 (JSON)",
+            perf.export_trace(since=run_mark, owners=run_owners, keyword=keyword),
+            file_name="trace.json",
+            mime="application/json"
+        )
@@ -0,0 +1,340 @@
+# nlp.py
+# 형태소 분석(Okt) 전담 모듈.
+# main.py는 Streamlit 스크립트라서 자식 프로세스에서 import할 수 없으므로, 병렬 분석 함수는 여기에 둔다.
+import atexit
+import functools
+import hashlib
+import importlib.metadata
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import perf
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+CHUNKS_PER_WORKER = 4  # 워커당 조각 수 (문서 길이 편차가 있어도 부하가 고르게 분배되도록)
+
+NOUN_CACHE_PATH = "./data/noun_cache.sqlite3"
+# 명사 캐시 형식 버전. 올리면 기존 디스크 캐시를 비우고 다시 분석한다. (store.STORE_VERSION과 같이 PRAGMA user_version)
+# 1: 문서 해시만 키, 2: (분석기 식별자, 문서 해시) 키
+NOUN_CACHE_VERSION = 2
+NOUN_CACHE_MAX_BYTES = int(os.environ.get("NOUN_CACHE_MB", 64)) * 1024 * 1024  # 메모리 캐시 최대 크기 (넘으면 오래 안 쓴 것부터 제거)
+
+# JVM 호출 묶기: okt.nouns(doc)는 문서마다 JPype로 Python <-> JVM 경계를 넘으면서
+# 문자열 변환과 결과 리스트 변환을 따로 하므로, 짧은 기사 요약에서는 이 비용의 비중이 크다.
+# 여러 문서를 구분 토큰으로 이어 붙여 한 번에 분석하고, 결과를 구분 토큰 위치에서 다시 문서별로 나눈다.
+# (Okt는 공백으로 나뉜 어절 단위로 분석하므로 공백으로 둘러싼 영문 구분 토큰은 앞뒤 문서와 섞이지 않는다)
+BATCH_SEPARATOR = "QXQSEPQXQ"  # 구분 토큰 (Alpha 한 토큰으로 분리됨)
+BATCH_CHARS = 50_000           # JVM 호출 한 번에 보낼 최대 글자 수
+BATCH = os.environ.get("NLP_BATCH", "1") != "0"  # NLP_BATCH=0이면 묶지 않고 문서마다 호출 (명사 캐시도 따로 씀)
+
+_okt = None    # 현재 프로세스의 Okt (워커 프로세스에서는 워커 전용)
+_pool = None   # 병렬 분석 프로세스 풀 (JVM이 이미 떠 있는 워커를 재사용, 워커 수가 바뀌면 새로 만듦)
+_pool_workers = 0
+_lock = threading.Lock()
+
+
+def get_okt():
+    """
+    현재 프로세스에서 공유하는 Okt 인스턴스 (처음 호출할 때 JVM 시작)
+    konlpy(JPype)는 import만으로도 무거우므로 여기서 처음 필요할 때 import한다.
+    """
+    global _okt
+    if _okt is None:
+        with _lock:
+            if _okt is None:
+                from konlpy.tag import Okt
+                _okt = Okt()
+    return _okt
+
+
+def _init_worker():
+    # 워커마다 JVM을 한 번만 띄우고, 첫 호출 비용(클래스 로딩)까지 미리 지불해 둔다.
+    get_okt().nouns("형태소 분석 준비")
+
+
+def _char_batches(docs, max_chars):
+    """연속된 문서를 글자 수 합이 max_chars를 넘지 않도록 묶습니다. (긴 문서 하나는 단독 묶음)"""
+    batch, size = [], 0
+    for doc in docs:
+        if batch and size + len(doc) > max_chars:
+            yield batch
+            batch, size = [], 0
+        batch.append(doc)
+        size += len(doc) + len(BATCH_SEPARATOR) + 2
+    if batch:
+        yield batch
+
+
+def _nouns_batched(okt, docs):
+    """
+    문서들을 구분 토큰으로 이어 붙여 okt.pos를 묶음마다 한 번만 호출하고, 문서별 명사 목록으로 나눕니다.
+    결과는 okt.nouns(doc)를 문서마다 호출한 것과 같습니다.
+    """
+    results = []
+    for batch in _char_batches(docs, BATCH_CHARS):
+        doc_nouns = [[]]
+        for word, tag in okt.pos(f" {BATCH_SEPARATOR} ".join(batch)):
+            if word == BATCH_SEPARATOR:
+                doc_nouns.append([])
+            elif tag == "Noun":
+                doc_nouns[-1].append(word)
+        if len(doc_nouns) != len(batch):
+            # 문서에 구분 토큰과 같은 문자열이 있는 경우 등: 이 묶음만 문서별로 다시 분석
+            perf.incr("nouns.batch_fallbacks")
+            doc_nouns = [okt.nouns(doc) for doc in batch]
+        results.extend(doc_nouns)
+    return results
+
+
+def _nouns_chunk(docs, batch=True):
+    okt = get_okt()
+    if batch:
+        return _nouns_batched(okt, docs)
+    return [okt.nouns(doc) for doc in docs]
+
+
+def _ping():
+    return os.getpid()
+
+
+def _get_pool(workers):
+    """
+    workers개 워커의 프로세스 풀. 풀은 하나만 유지하고, 워커 수가 바뀌면 이전 풀을 종료하고 새로 만든다.
+    (워커마다 JVM이 떠 있으므로 워커 수별로 풀을 남겨 두면 메모리가 워커 수 조합만큼 늘어난다)
+    """
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                # 이미 받은 작업은 끝까지 처리하고 워커가 종료됨
+                _pool.shutdown(wait=False)
+            # JVM은 fork 후 안전하지 않으므로 spawn으로 새 프로세스를 만든다.
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            _pool_workers = workers
+            perf.incr("nouns.pool_starts")
+        return _pool
+
+
+def warm_up(workers=1):
+    """
+    JVM 시작과 Okt 첫 호출 비용을 미리 지불합니다.
+    workers > 1이면 워커 프로세스도 모두 띄운다. (일괄 분석처럼 곧 병렬 분석할 것이 확실할 때만)
+    """
+    get_okt().nouns("형태소 분석 준비")
+    workers = max(1, int(workers))
+    if workers > 1:
+        pool = _get_pool(workers)
+        for future in [pool.submit(_ping) for _ in range(workers)]:
+            future.result()
+
+
+def warm_up_async(workers=1):
+    """warm_up을 백그라운드 데몬 스레드에서 실행하고 스레드를 반환합니다."""
+    thread = threading.Thread(target=warm_up, args=(workers,), name="okt-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+@atexit.register
+def shutdown_pools():
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+
+def extract_nouns(docs, workers=1, batch=BATCH):
+    """
+    문서 목록에서 문서별 명사 목록을 추출합니다.
+    workers > 1이면 문서를 연속된 조각으로 나눠 프로세스 풀에서 분석하고,
+    입력 순서대로 다시 합치므로 결과는 직렬 분석과 동일합니다.
+    batch=True면 여러 문서를 한 번의 JVM 호출로 분석합니다. (결과 동일, False면 문서마다 호출)
+    """
+    docs = list(docs)
+    workers = max(1, int(workers))
+    if workers == 1 or len(docs) < 2 * workers:
+        return _nouns_chunk(docs, batch)
+
+    n_chunks = min(len(docs), workers * CHUNKS_PER_WORKER)
+    size = -(-len(docs) // n_chunks)  # 올림 나눗셈
+    chunks = [docs[i:i + size] for i in range(0, len(docs), size)]
+
+    fn = functools.partial(_nouns_chunk, batch=batch)
+    try:
+        results_iter = _get_pool(workers).map(fn, chunks)
+    except RuntimeError:
+        # 다른 세션이 워커 수를 바꿔 방금 받은 풀이 종료된 경우: 새 풀로 한 번 더
+        results_iter = _get_pool(workers).map(fn, chunks)
+    results = []
+    for chunk_nouns in results_iter:
+        results.extend(chunk_nouns)
+    return results
+
+
+# ----------------------------------------------------------------------
+# 문서별 명사 캐시
+# okt.nouns 원본 결과를 문서 내용 해시로 저장해 두면, 불용어/최소 길이 필터링만 바뀌었을 때
+# 형태소 분석을 다시 하지 않아도 된다. (재시작 후에도 유지되도록 SQLite에 저장)
+# 메모리 캐시는 최근에 쓴 문서를 NOUN_CACHE_MAX_BYTES까지만 유지한다. (LRU, 나머지는 SQLite에서 다시 읽음)
+# 분석 캐시 한도가 모자라면 trim_noun_cache로 더 줄인다. (analysis_cache.register_usage의 trim)
+# ----------------------------------------------------------------------
+_noun_cache = OrderedDict()
+_noun_cache_bytes = 0  # 메모리 캐시 크기 추정값 (명사 목록과 문자열, 키)
+_noun_cache_lock = threading.Lock()
+
+
+def doc_hash(doc):
+    return hashlib.blake2b(doc.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def tokenizer_id(batch=BATCH):
+    """
+    명사 캐시 키에 넣는 분석기 식별자 (konlpy 버전 + JVM 호출 방식).
+    분석 결과가 달라질 수 있는 쪽이 바뀌면 이전 결과를 섞어 쓰지 않고 새로 분석한다.
+    """
+    try:
+        version = importlib.metadata.version("konlpy")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return f"okt-{version}-{'batch' if batch else 'doc'}"
+
+
+def _connect_noun_cache(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < NOUN_CACHE_VERSION:
+        # 이전 형식의 캐시는 변환하지 않고 비운다. (다시 분석하면 채워짐)
+        # 다른 연결이 동시에 비우지 않도록 쓰기 잠금을 잡고 다시 확인
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < NOUN_CACHE_VERSION:
+                conn.execute("DROP TABLE IF EXISTS nouns")
+                conn.execute(f"PRAGMA user_version = {NOUN_CACHE_VERSION}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS nouns ("
+        "tokenizer TEXT NOT NULL, hash TEXT NOT NULL, nouns TEXT NOT NULL, PRIMARY KEY (tokenizer, hash))"
+    )
+    return conn
+
+
+def extract_nouns_cached(docs, workers=1, path=None, batch=BATCH):
+    """
+    extract_nouns와 같지만, 이미 분석한 문서는 캐시(메모리 -> 디스크 순)에서 꺼내고
+    처음 보는 문서만 형태소 분석합니다. 캐시는 분석기 식별자(tokenizer_id)별로 따로 씁니다.
+    """
+    docs = list(docs)
+    hashes = [doc_hash(doc) for doc in docs]
+    tid = tokenizer_id(batch)
+
+    # 1. 메모리 캐시
+    with _noun_cache_lock:
+        found = {}
+        for h in set(hashes):
+            if (tid, h) in _noun_cache:
+                _noun_cache.move_to_end((tid, h))
+                found[h] = _noun_cache[(tid, h)]
+    missing = [h for h in dict.fromkeys(hashes) if h not in found]
+    perf.incr("nouns.memory_hits", len(found))
+
+    conn = _connect_noun_cache(path or NOUN_CACHE_PATH)
+    try:
+        # 2. 디스크 캐시 (SQLite 변수 개수 제한 때문에 나눠서 조회)
+        for i in range(0, len(missing), 500):
+            part = missing[i:i + 500]
+            rows = conn.execute(
+                f"SELECT hash, nouns FROM nouns WHERE tokenizer = ? AND hash IN ({','.join('?' * len(part))})",
+                [tid, *part],
+            )
+            for h, nouns in rows:
+                found[h] = json.loads(nouns)
+                perf.incr("nouns.disk_hits")
+
+        # 3. 캐시에 없는 문서만 형태소 분석 후 저장
+        todo = {}
+        for h, doc in zip(hashes, docs):
+            if h not in found and h not in todo:
+                todo[h] = doc
+        perf.incr("nouns.misses", len(todo))
+        if todo:
+            new_nouns = extract_nouns(todo.values(), workers, batch)
+            found.update(zip(todo.keys(), new_nouns))
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO nouns (tokenizer, hash, nouns) VALUES (?, ?, ?)",
+                    [(tid, h, json.dumps(found[h], ensure_ascii=False)) for h in todo],
+                )
+    finally:
+        conn.close()
+
+    _remember_nouns(tid, found)
+    return [found[h] for h in hashes]
+
+
+def _entry_size(key, nouns):
+    return sys.getsizeof(key) + sys.getsizeof(key[1]) + sys.getsizeof(nouns) + sum(map(sys.getsizeof, nouns))
+
+
+def _remember_nouns(tid, found):
+    """{해시: 명사 목록}을 메모리 캐시에 넣고, 한도를 넘으면 오래 안 쓴 문서부터 제거합니다."""
+    global _noun_cache_bytes
+    with _noun_cache_lock:
+        for h, nouns in found.items():
+            key = (tid, h)
+            old = _noun_cache.get(key)
+            if old is not None:
+                _noun_cache_bytes -= _entry_size(key, old)
+            _noun_cache[key] = nouns
+            _noun_cache.move_to_end(key)
+            _noun_cache_bytes += _entry_size(key, nouns)
+        evicted = _evict_nouns(NOUN_CACHE_MAX_BYTES)
+    if evicted:
+        perf.incr("nouns.memory_evictions", evicted)
+
+
+def _evict_nouns(max_bytes):
+    # 오래 안 쓴 문서부터 max_bytes 이하가 될 때까지 제거 (_noun_cache_lock을 잡은 상태에서 호출)
+    global _noun_cache_bytes
+    evicted = 0
+    while _noun_cache and _noun_cache_bytes > max_bytes:
+        key, nouns = _noun_cache.popitem(last=False)
+        _noun_cache_bytes -= _entry_size(key, nouns)
+        evicted += 1
+    return evicted
+
+
+def trim_noun_cache(max_bytes):
+    """메모리 캐시를 max_bytes 이하로 줄입니다. (오래 안 쓴 문서부터, 디스크 캐시는 그대로)"""
+    with _noun_cache_lock:
+        evicted = _evict_nouns(max_bytes)
+    if evicted:
+        perf.incr("nouns.memory_evictions", evicted)
+
+
+def noun_cache_stats():
+    """메모리 캐시의 {"entries": 문서 수, "bytes": 크기 추정값}"""
+    with _noun_cache_lock:
+        return {"entries": len(_noun_cache), "bytes": _noun_cache_bytes}
+
+
+def clear_noun_cache():
+    """메모리 캐시를 비웁니다. (디스크 캐시는 그대로)"""
+    global _noun_cache_bytes
+    with _noun_cache_lock:
+        _noun_cache.clear()
+        _noun_cache_bytes = 0
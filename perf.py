@@ -0,0 +1,249 @@
+# perf.py
+# 단계별 시간/메모리 측정과 카운터 (API 페이지/바이트/재시도, 캐시 적중/실패).
+# 측정값은 프로세스 전체에서 모아 두고, 단계가 끝날 때마다 JSON 한 줄로 로그를 남긴다.
+# 대시보드의 성능 패널과 트레이스 내보내기(JSON)에서 같은 기록을 사용한다.
+#
+# 사용법:
+#   with perf.stage("tokenize", docs=len(df)):   # 코드 블록 측정
+#   @perf.timed("layout")                        # 함수 측정
+#   perf.incr("api.pages")                       # 카운터
+# 환경 변수 PERF_LOG=1 이면 단계 기록을 표준 에러로 출력한다. (서버 로그 수집용)
+#
+# 서버 하나를 여러 세션이 공유하므로, 단계 기록에는 그 단계를 실행한 소유자(세션 ID, 백그라운드 작업 키)를 남기고
+# 성능 패널은 자기 소유자의 기록만 고른다. 메모리 추적도 켠 세션이 하나라도 있는 동안만 켜 둔다.
+import functools
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+
+MAX_SPANS = 2000  # 보관할 최근 단계 기록 수
+
+logger = logging.getLogger("perf")
+
+_lock = threading.Lock()
+_counters = Counter()
+_spans = deque(maxlen=MAX_SPANS)
+_seq = itertools.count(1)
+_local = threading.local()
+_memory_owners = set()  # 메모리 추적을 켠 소유자 (비면 추적을 끔)
+
+
+def enable_logging(level=logging.INFO):
+    """단계 기록 로그(JSON 한 줄)를 표준 에러로 출력합니다."""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s perf %(message)s"))
+        logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+if os.environ.get("PERF_LOG"):
+    enable_logging()
+
+
+def incr(name, n=1):
+    """카운터 name을 n만큼 올립니다."""
+    with _lock:
+        _counters[name] += n
+
+
+def counters(prefix=""):
+    with _lock:
+        return {k: v for k, v in sorted(_counters.items()) if k.startswith(prefix)}
+
+
+def mark():
+    """현재까지 기록된 마지막 단계 번호. spans(since=...)로 이후 기록만 가져올 때 사용합니다."""
+    with _lock:
+        return _spans[-1]["seq"] if _spans else 0
+
+
+def spans(since=0, owners=None):
+    """since 이후의 단계 기록. owners(소유자 모음)가 있으면 그 소유자가 실행한 단계만 반환합니다."""
+    with _lock:
+        return [s for s in _spans if s["seq"] > since and (owners is None or s.get("owner") in owners)]
+
+
+# ----------------------------------------------------------------------
+# 단계 측정
+# ----------------------------------------------------------------------
+def start_memory(owner=None):
+    """
+    owner의 파이썬 메모리 추적 요청을 등록하고 추적을 켭니다. (켜져 있는 동안 단계별 최대 메모리를 기록, 대신 느려짐)
+    추적은 프로세스 전체에 걸리므로, 요청한 owner가 모두 stop_memory를 부를 때까지 켜 둡니다.
+    """
+    with _lock:
+        _memory_owners.add(owner)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+def stop_memory(owner=None):
+    """owner의 메모리 추적 요청을 취소합니다. (남은 요청이 없으면 추적을 끔)"""
+    with _lock:
+        _memory_owners.discard(owner)
+        if not _memory_owners and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def set_owner(owner):
+    """현재 스레드에서 기록하는 단계의 소유자를 정합니다. (세션 ID, 작업 키 등, None이면 해제)"""
+    _local.owner = owner
+
+
+def current_owner():
+    return getattr(_local, "owner", None)
+
+
+def bind(fn):
+    """fn을 다른 스레드(스레드 풀)에서 실행해도 지금 스레드의 소유자로 단계를 기록하도록 감쌉니다."""
+    owner = current_owner()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        prev = current_owner()
+        set_owner(owner)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            set_owner(prev)
+    return wrapper
+
+
+def set_listener(listener):
+    """
+    현재 스레드에서 단계가 시작될 때마다 listener(name, depth)를 호출합니다. (None이면 해제)
+    백그라운드 작업(jobs.py)의 진행 상황 표시와 취소 확인에 사용합니다.
+    listener에서 예외를 던지면 그 단계는 시작되지 않습니다.
+    """
+    _local.listener = listener
+
+
+@contextmanager
+def stage(name, **fields):
+    """
+    블록의 경과 시간을 기록합니다. fields는 기록에 그대로 남습니다. (예: 문서 수)
+    메모리 추적이 켜져 있으면 가장 바깥 단계의 최대 메모리(peak_mb)도 기록합니다.
+    """
+    depth = getattr(_local, "depth", 0)
+    listener = getattr(_local, "listener", None)
+    if listener is not None:
+        listener(name, depth)
+    _local.depth = depth + 1
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        if depth == 0:
+            tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    start = time.time()
+    t = time.perf_counter()
+    error = None
+    try:
+        yield fields
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _local.depth = depth
+        span = {
+            "stage": name,
+            "start": round(start, 3),
+            "seconds": round(time.perf_counter() - t, 4),
+            "depth": depth,
+            "thread": threading.current_thread().name,
+            **fields,
+        }
+        owner = current_owner()
+        if owner is not None:
+            span["owner"] = owner
+        if tracing and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            span["mem_mb"] = round((current - base) / (1024 * 1024), 2)
+            if depth == 0:
+                span["peak_mb"] = round((peak - base) / (1024 * 1024), 2)
+        if error:
+            span["error"] = error
+        with _lock:
+            span["seq"] = next(_seq)
+            _spans.append(span)
+        logger.info(json.dumps(span, ensure_ascii=False, default=str))
+
+
+def timed(name):
+    """함수 호출 전체를 stage(name)으로 측정하는 데코레이터"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# 캐시 적중/실패
+# st.cache_data 함수는 캐시에 없을 때만 본문이 실행되므로
+# 호출 수(track_cache)와 본문 실행 수(cache_miss)의 차이가 적중 수가 된다.
+# ----------------------------------------------------------------------
+def cache_miss(name):
+    incr(f"cache.{name}.misses")
+
+
+def track_cache(fn):
+    """캐시 함수 호출 수를 셉니다. @st.cache_data 위에 붙이고, 본문 첫 줄에서 cache_miss를 호출합니다."""
+    name = getattr(fn, "__name__", repr(fn))
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        incr(f"cache.{name}.calls")
+        return fn(*args, **kwargs)
+
+    if hasattr(fn, "clear"):
+        wrapper.clear = fn.clear
+    return wrapper
+
+
+def cache_stats():
+    """{캐시 함수 이름: {"hits": 적중, "misses": 실패}}"""
+    stats = {}
+    for key, value in counters("cache.").items():
+        _, name, kind = key.split(".", 2)
+        stats.setdefault(name, {"calls": 0, "misses": 0})[kind] = value
+    return {
+        name: {"hits": max(s["calls"] - s["misses"], 0), "misses": s["misses"]}
+        for name, s in stats.items()
+    }
+
+
+# ----------------------------------------------------------------------
+# 요약 / 내보내기
+# ----------------------------------------------------------------------
+def summarize(span_list):
+    """단계 이름별 호출 수, 합계/최대 시간, 최대 메모리"""
+    summary = {}
+    for s in span_list:
+        row = summary.setdefault(s["stage"], {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+        row["calls"] += 1
+        row["seconds"] = round(row["seconds"] + s["seconds"], 4)
+        row["max_seconds"] = max(row["max_seconds"], s["seconds"])
+        if "peak_mb" in s:
+            row["peak_mb"] = max(row.get("peak_mb", 0.0), s["peak_mb"])
+    return summary
+
+
+def export_trace(since=0, owners=None, **extra):
+    """단계 기록(owners가 있으면 그 소유자의 기록만)과 카운터를 JSON 문자열로 반환합니다. (성능 패널의 내려받기용)"""
+    return json.dumps({
+        "exported_at": time.time(),
+        **extra,
+        "spans": spans(since, owners),
+        "counters": counters(),
+        "cache": cache_stats(),
+    }, ensure_ascii=False, indent=2, default=str)
@@ -0,0 +1,253 @@
+# pipeline.py
+# 수집 이후의 분석 단계(불용어 -> 형태소 분석/코퍼스 -> 빈도/동시 등장 -> 시계열 -> 렌더링)를
+# Streamlit 없이 호출할 수 있도록 모아 둔 모듈.
+# main.py는 이 함수들을 st.cache_data / st.cache_resource로 감싸서 사용한다.
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+import nlp
+import cooccur
+import corpus
+import timeline
+import perf
+
+STOPWORDS_PATH = "./data/korean_stopwords.txt" # 강의록에서 가지고온 불용어
+WORDCLOUD_SIZE = (900, 450)
+MASK_PATH = "./data/mask.png"
+LAYOUT_ITERATIONS = 50
+WARM_LAYOUT_ITERATIONS = 15
+
+
+# ----------------------------------------------------------------------
+# 불용어
+# ----------------------------------------------------------------------
+def load_stop_words(keyword):
+    """불용어 파일을 읽고 검색어 및 강의에서 사용된 불용어를 추가하여 반환합니다."""
+    stop_words = set()
+
+    if os.path.exists(STOPWORDS_PATH):
+        with open(STOPWORDS_PATH, "r", encoding="utf-8") as f:
+            stop_words = set(line.strip() for line in f if line.strip())
+    else:
+        # 기본 불용어 (파일 없을 경우.. 그럴 리는 없다.)
+        stop_words = {"것", "등", "위", "수", "배", "만", "명", "관련", "대해", "뉴스", "속보"}
+
+    if keyword:
+        stop_words.add(keyword)
+        stop_words.add(keyword.replace(" ", ""))
+    # 강의안에서 추가된 불용어들 (중복 방지를 위해 set에 update)
+    stop_words.update([
+        "서울", "서울시", "부동산", "주요", "첫째", "결과", "조사", "아크", "대비", "증권",
+        "가능성", "대표", "시절", "제자", "최강", "활용", "최진", "타운", "요소", "적용",
+        "중앙", "전주", "한국", "포함", "도시", "일부", "이슈", "보고서", "갈등", "미래",
+        "위원", "통해", "문제", "NH투자증권", "아유경제_부동산", "조국",
+        "조희연", "사면", "심층분석", "년", "월", "일", "시" # 시간 관련 불용어 추가(시계열 분석을 위해)
+    ])
+    return stop_words
+
+
+# ----------------------------------------------------------------------
+# 형태소 분석 및 통합 분석
+# ----------------------------------------------------------------------
+def doc_texts(df):
+    """기사별 분석 대상 텍스트 (제목 + 요약)"""
+    return (df["title"].fillna("").astype(str) + " " + df["description"].fillna("").astype(str))
+
+
+def analyze_batch(df, stop_words, min_len, workers=1):
+    """
+    기사 배치(DataFrame)에서 명사를 추출하여 문서별 필터링된 명사 목록(doc_terms)을 반환합니다.
+    스트리밍 수집에서 배치마다 사용합니다.
+    workers > 1이면 형태소 분석을 여러 프로세스로 나눠 실행합니다. (결과는 동일)
+    """
+    # 1. 명사 추출 (문서 순서 유지)
+    # 문서별 캐시를 사용하므로 최소 길이/불용어만 바뀐 경우 형태소 분석은 다시 하지 않는다.
+    with perf.stage("tokenize_batch", docs=len(df)):
+        doc_nouns = nlp.extract_nouns_cached(doc_texts(df), workers)
+
+    # 2. 필터링 (최소 길이, 불용어) - 문서 경계와 단어 순서는 유지 (동시 등장 계산에 필요)
+    return [
+        [n for n in nouns if len(n) >= min_len and n not in stop_words]
+        for nouns in doc_nouns
+    ]
+
+
+def build_corpus(df, workers=1, root=None):
+    """
+    기사별 명사(필터링 전)를 토큰 코퍼스 파일로 한 번만 저장하고 경로를 반환합니다.
+    같은 기사 묶음의 코퍼스가 이미 있으면 형태소 분석 없이 그대로 사용합니다.
+    새로 저장할 때는 오래 안 쓴 코퍼스를 지웁니다. (corpus.prune)
+    """
+    path = corpus.corpus_path(corpus.corpus_id(df), root)
+    if os.path.isdir(path):
+        corpus.touch(path)
+    else:
+        with perf.stage("tokenize", docs=len(df), workers=workers):
+            doc_nouns = nlp.extract_nouns_cached(doc_texts(df), workers)
+        with perf.stage("write_corpus"):
+            corpus.write_corpus(path, doc_nouns, df["pubDate"])
+            perf.incr("corpus.pruned", corpus.prune(root))
+    return path
+
+
+def analyze_corpus(corpus_path, stop_words, min_len, window=0, weights=None):
+    """
+    저장된 코퍼스에서 단어 빈도(freq)와 동시 등장 행렬(cooc)을 계산합니다.
+    window가 0이면 문서 전체, 아니면 window개 연속 단어 안에서의 동시 등장을 셉니다.
+    weights(문서별 가중치, dedup.reduce_duplicates 참고)가 있으면 문서마다 그만큼 셉니다.
+    """
+    tc = corpus.open_corpus(corpus_path)
+
+    # 필터링 (최소 길이, 불용어)은 단어 ID 마스크로 처리 - 문서 경계와 순서는 유지
+    with perf.stage("filter"):
+        mask = tc.term_mask(stop_words, min_len)
+        offsets, tokens = tc.filter(mask)
+
+    # 3. 워드클라우드용: 모든 문서의 명사 빈도
+    with perf.stage("freq"):
+        token_weights = None if weights is None else np.repeat(weights, np.diff(offsets))
+        freq = tc.freq(tokens, token_weights)
+
+    # 4. 네트워크용: 단어 ID 배열로 바로 희소 행렬 동시 등장 계산
+    # (문서마다 combinations 튜플을 만들던 방식과 같은 결과, 메모리는 서로 다른 쌍 수에 비례)
+    with perf.stage("cooccur", window=window) as span:
+        cooc = cooccur.cooccurrence_from_ids(tc.vocab, offsets, tokens, window, weights)
+        span["pairs"] = int(cooc.matrix.nnz)
+
+    return freq, cooc
+
+
+@perf.timed("analyze")
+def analyze(df, keyword, min_len, window=0, workers=1, stop_words=None, root=None, weights=None):
+    """
+    데이터프레임을 분석하여 단어 빈도(freq), 동시 등장 행렬(cooc), 코퍼스 경로를 반환합니다.
+    """
+    if stop_words is None:
+        stop_words = load_stop_words(keyword)
+    corpus_path = build_corpus(df, workers, root)
+    freq, cooc = analyze_corpus(corpus_path, stop_words, min_len, window, weights)
+    return freq, cooc, corpus_path
+
+
+# ----------------------------------------------------------------------
+# 시계열
+# ----------------------------------------------------------------------
+@perf.timed("timeline")
+def build_timeline(corpus_path, weights=None, article_dates=None):
+    """코퍼스의 (시간 구간 x 단어) 빈도 행렬 (timeline.Timeline, 시간 단위, 기사 수는 article_dates 기준)"""
+    return timeline.build_timeline(corpus_path, weights, article_dates)
+
+
+@perf.timed("time_series")
+def time_series(corpus_path, freq, top_n=5, weights=None, resolution="D", article_dates=None):
+    """
+    일별 기사 건수(daily_volume)와
+    상위 N개 키워드의 일별 등장 빈도(time_series_df)를 반환
+    형태소 분석은 다시 하지 않고, 저장된 토큰 코퍼스의 (구간 x 단어) 행렬에서 잘라낸다.
+    weights(문서별 가중치)가 있으면 빈도를 그만큼 셉니다.
+    article_dates(수집한 전체 기사의 발행 시각)가 있으면 기사 건수는 유사 기사까지 모두 셉니다.
+    resolution: "H"(시간), "D"(일), "W"(주)
+    """
+    if corpus_path is None:
+        return pd.DataFrame(columns=["date", "기사_건수"]), pd.DataFrame(columns=["날짜", "단어", "빈도"])
+    view = timeline.resample(build_timeline(corpus_path, weights, article_dates), resolution)
+
+    # 상위 단어는 이미 필터링을 통과한 단어이므로 합계가 freq와 일치
+    top_words = [word for word, _ in freq.most_common(int(top_n))]
+    return timeline.volume_frame(view, resolution), timeline.term_frame(view, top_words, resolution)
+
+
+# ----------------------------------------------------------------------
+# 네트워크 레이아웃
+# ----------------------------------------------------------------------
+@perf.timed("layout")
+def network_layout(top_edges, init_pos=None):
+    """
+    노드 좌표 {단어: (x, y)}를 반환합니다. (노드 크기/색 지표는 전체 그래프 기준으로 graph.py에서 계산)
+    init_pos가 있으면 그 좌표에서 레이아웃을 이어서 계산합니다.
+    """
+    import networkx as nx
+
+    G = nx.Graph()
+    G.add_weighted_edges_from([(u, v, weight) for (u, v), weight in top_edges])
+
+    # 레이아웃 결정 (힘 기반 배치). 이전 배치에 있던 노드가 절반 이상이면 이어서 계산
+    init_pos = {n: xy for n, xy in (init_pos or {}).items() if n in G}
+    warm = len(init_pos) * 2 >= G.number_of_nodes()
+    pos = nx.spring_layout(
+        G,
+        k=0.3,
+        pos=init_pos if warm else None,
+        iterations=WARM_LAYOUT_ITERATIONS if warm else LAYOUT_ITERATIONS,
+        seed=42
+    )
+    return {n: (float(x), float(y)) for n, (x, y) in pos.items()}
+
+
+# ----------------------------------------------------------------------
+# 차트 렌더링 (pyplot 전역 상태를 쓰지 않도록 Figure 객체를 직접 만들고 PNG 바이트로 반환)
+# ----------------------------------------------------------------------
+def load_mask(path=MASK_PATH, height=WORDCLOUD_SIZE[1]):
+    """
+    마스크 이미지를 워드클라우드 마스크로 변환합니다.
+    (흰색 = 빈 공간, 검정 = 단어 영역, 워드클라우드 높이에 맞춰 크기 조정)
+    """
+    from PIL import Image
+
+    if not os.path.exists(path):
+        return None
+    image = Image.open(path).convert("RGBA")
+    background = Image.new("RGBA", image.size, "white")
+    background.alpha_composite(image)
+    gray = background.convert("L")
+
+    gray = gray.resize((round(gray.width * height / gray.height), height))
+    mask = np.where(np.asarray(gray) > 127, 255, 0).astype(np.uint8)
+    mask.setflags(write=False)
+    return mask
+
+
+@perf.timed("render_wordcloud")
+def render_wordcloud_png(frequencies, size, font_path, mask=None):
+    from wordcloud import WordCloud
+
+    wc = WordCloud(
+        font_path=font_path,
+        background_color="white",
+        width=size[0],
+        height=size[1],
+        max_words=len(frequencies),
+        mask=mask
+    ).generate_from_frequencies(frequencies)
+
+    buf = io.BytesIO()
+    wc.to_image().save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@perf.timed("render_barplot")
+def render_barplot_png(top_n_freq_df, title):
+    from matplotlib.figure import Figure
+    import seaborn as sns
+
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+    # 수평 막대 그래프 (빈도 순)
+    sns.barplot(
+        x="빈도",
+        y="단어",
+        data=top_n_freq_df.sort_values(by="빈도", ascending=False),
+        ax=ax,
+        palette="viridis" # 색상 팔레트 지정
+    )
+    ax.set_title(title, size=15)
+    ax.set_xlabel("빈도", size=12)
+    ax.set_ylabel("단어", size=12)
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
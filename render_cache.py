@@ -0,0 +1,82 @@
+# render_cache.py
+# 완성된 차트 이미지(PNG 바이트)를 보관하는 캐시.
+# 입력(상위 N개 빈도, 크기, 폰트, 마스크)이 같으면 다시 그리지 않고 저장된 바이트를 그대로 보낸다.
+# 캐시에 없으면 스크립트 스레드 대신 렌더링 전용 스레드에서 그린다.
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import perf
+
+MAX_BYTES = 64 * 1024 * 1024  # 캐시 전체 크기 제한 (초과 시 오래 안 쓴 항목부터 삭제)
+RENDER_WORKERS = 2
+
+
+def digest(*parts):
+    """렌더링 입력값들로 캐시 키를 만듭니다."""
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class RenderCache:
+    """바이트 크기 기준 LRU 캐시. 같은 키를 동시에 요청하면 한 번만 렌더링합니다."""
+
+    def __init__(self, max_bytes=MAX_BYTES, workers=RENDER_WORKERS):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+
+    def get(self, key):
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            if len(data) > self.max_bytes:
+                return
+            self.entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, old = self.entries.popitem(last=False)
+                self.size -= len(old)
+
+    def get_or_render(self, key, render, *args, **kwargs):
+        """key가 캐시에 있으면 바로 반환하고, 없으면 렌더링 스레드에서 render(*args)를 실행해 저장합니다."""
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        with self.lock:
+            future = self.inflight.get(key)
+            if future is None:
+                self.misses += 1
+                # 렌더링 단계도 요청한 세션의 기록으로 남도록 소유자를 넘김
+                future = self.executor.submit(perf.bind(render), *args, **kwargs)
+                self.inflight[key] = future
+        try:
+            data = future.result()
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+        self.put(key, data)
+        return data
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.size,
+                    "hits": self.hits, "misses": self.misses}
+
+
+# 프로세스 전체(모든 세션)에서 공유
+cache = RenderCache()
@@ -0,0 +1,218 @@
+# store.py
+# 수집한 기사를 SQLite 파일에 검색어별로 저장하여, 재시작 후에도 다시 다운로드하지 않도록 한다.
+import os
+import sqlite3
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+import pandas as pd
+
+import api
+
+STORE_PATH = "./data/news_store.sqlite3"
+STORE_VERSION = 2  # 1: 제목/요약의 HTML 엔티티 변환과 공백 정리 (api.normalize_text), 2: keywords.fetched_num
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    keyword      TEXT NOT NULL,
+    link         TEXT NOT NULL,
+    originallink TEXT,
+    pubDate      TEXT NOT NULL,
+    title        TEXT,
+    description  TEXT,
+    PRIMARY KEY (keyword, link)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (keyword, pubDate);
+CREATE TABLE IF NOT EXISTS keywords (
+    keyword        TEXT PRIMARY KEY,
+    newest_pubDate TEXT,
+    updated_at     TEXT,
+    fetched_num    INTEGER
+);
+"""
+
+
+def connect(path=STORE_PATH):
+    """저장소 파일을 열고 (없으면 생성) 테이블을 준비합니다."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    _migrate(conn)
+    return conn
+
+
+def _migrate(conn):
+    """이전 버전 저장소를 현재 형식으로 한 번만 변환합니다."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= STORE_VERSION:
+        return
+    # 다른 연결이 동시에 변환하지 않도록 쓰기 잠금을 잡고 다시 확인
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 2:
+            # 전체 수집한 최대 건수 (이전 저장소는 모름 = NULL, 저장된 기사 수로 판단)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(keywords)")}
+            if "fetched_num" not in columns:
+                conn.execute("ALTER TABLE keywords ADD COLUMN fetched_num INTEGER")
+        if version < 1:
+            rows = pd.read_sql_query("SELECT rowid, title, description FROM articles", conn)
+            if not rows.empty:
+                # 예전 행은 태그만 제거되어 있으므로 &quot; 등 엔티티 변환과 공백 정리를 적용
+                conn.executemany(
+                    "UPDATE articles SET title = ?, description = ? WHERE rowid = ?",
+                    zip(api.normalize_text(rows["title"]).fillna("").tolist(),
+                        api.normalize_text(rows["description"]).fillna("").tolist(),
+                        rows["rowid"].tolist()),
+                )
+        if version < STORE_VERSION:
+            conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def get_newest_pubdate(conn, keyword):
+    """검색어별로 지금까지 본 가장 최신 기사 시각 (없으면 None)"""
+    row = conn.execute(
+        "SELECT newest_pubDate FROM keywords WHERE keyword = ?", (keyword,)
+    ).fetchone()
+    return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+
+def get_fetched_num(conn, keyword):
+    """검색어를 처음부터 끝까지(증분 없이) 수집했던 가장 큰 요청 건수 (없으면 0)"""
+    row = conn.execute(
+        "SELECT fetched_num FROM keywords WHERE keyword = ?", (keyword,)
+    ).fetchone()
+    return row[0] if row and row[0] else 0
+
+
+def get_known_links(conn, keyword):
+    rows = conn.execute("SELECT link FROM articles WHERE keyword = ?", (keyword,))
+    return {link for (link,) in rows}
+
+
+def count_articles(conn, keyword):
+    return conn.execute(
+        "SELECT COUNT(*) FROM articles WHERE keyword = ?", (keyword,)
+    ).fetchone()[0]
+
+
+def save_articles(conn, keyword, df, fetched_num=None):
+    """
+    정제된 기사 DataFrame을 저장합니다. link 기준으로 중복은 무시합니다.
+    fetched_num(증분 없이 전체를 받은 요청 건수)을 주면 검색어의 전체 수집 건수를 그 값까지 올립니다.
+    새로 추가된 기사 수를 반환합니다.
+    """
+    if df is None or df.empty:
+        return 0
+
+    rows = [
+        (keyword, row.link, row.originallink, row.pubDate.isoformat(), row.title, row.description)
+        for row in df.itertuples(index=False)
+        if row.link
+    ]
+    before = conn.total_changes
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO articles "
+            "(keyword, link, originallink, pubDate, title, description) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        added = conn.total_changes - before
+        newest = df["pubDate"].max()
+        known = get_newest_pubdate(conn, keyword)
+        if known is not None and known > newest:
+            newest = known
+        fetched_num = max(fetched_num or 0, get_fetched_num(conn, keyword))
+        conn.execute(
+            "INSERT OR REPLACE INTO keywords (keyword, newest_pubDate, updated_at, fetched_num) VALUES (?, ?, ?, ?)",
+            (keyword, newest.isoformat(), datetime.now().isoformat(timespec="seconds"), fetched_num or None),
+        )
+    return added
+
+
+def load_articles(conn, keyword, limit=None):
+    """저장된 기사를 최신순으로 limit건 읽어 get_naver_news와 같은 형태의 DataFrame으로 반환합니다."""
+    query = (
+        "SELECT pubDate, title, description, link, originallink FROM articles "
+        "WHERE keyword = ? ORDER BY pubDate DESC"
+    )
+    params = [keyword]
+    if limit:
+        query += " LIMIT ?"
+        params.append(int(limit))
+    df = pd.read_sql_query(query, conn, params=params)
+    if not df.empty:
+        df["pubDate"] = pd.to_datetime(df["pubDate"])
+    return df
+
+
+def _reached_known(known_links, newest):
+    """페이지에 이미 저장된 기사(같은 link 또는 더 오래된 pubDate)가 있으면 True"""
+    def stop_when(items):
+        for item in items:
+            if item.get("link") in known_links:
+                return True
+            try:
+                pub = parsedate_to_datetime(item["pubDate"]).astimezone(api.LOCAL_TZ).replace(tzinfo=None)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if newest is not None and pub <= newest:
+                return True
+        return False
+    return stop_when
+
+
+def iter_collect_news(keyword, num_data=1000, path=STORE_PATH, **fetch_kwargs):
+    """
+    저장소를 이용한 증분 수집 (스트리밍).
+    1. 이미 수집한 검색어(최신 기사 시각이 기록됨)이고, 예전에 num_data건 이상을 전체 수집했거나
+       저장된 기사가 num_data건 이상이면 최신 기사부터 받다가 아는 기사를 만나는 페이지에서 멈춘다.
+       (검색 결과가 num_data건보다 적은 검색어도 다시 수집할 때는 새 기사만 받음)
+    2. 아니면 (처음이거나 예전보다 많이 요청) num_data건 전체를 받아 중복을 제외하고 저장한다.
+    API 페이지가 도착할 때마다 정제된 배치를 yield하며,
+    마지막으로 저장소에만 있는 나머지 기사(최신순 num_data건 기준)를 한 배치로 yield합니다.
+    받은 기사는 모든 페이지를 받은 뒤에 한 번에 저장한다. 재시도 후에도 실패한 페이지가 있으면
+    api.PageError를 발생시키고 저장소는 그대로 둔다. (중간 페이지가 빠진 채 저장하면
+    다음 증분 수집이 그 앞의 아는 기사에서 멈춰서 빠진 구간을 다시 받지 않는다)
+    """
+    conn = connect(path)
+    try:
+        stop_when = None
+        newest = get_newest_pubdate(conn, keyword)
+        if newest is not None and (get_fetched_num(conn, keyword) >= num_data
+                                   or count_articles(conn, keyword) >= num_data):
+            stop_when = _reached_known(get_known_links(conn, keyword), newest)
+
+        seen = set()
+        fetched = []
+        for batch in api.iter_naver_news(keyword, num_data, stop_when=stop_when, skip_failed=False,
+                                         **fetch_kwargs):
+            fetched.append(batch)
+            batch = batch[~batch["link"].isin(seen)].drop_duplicates("link")
+            seen.update(batch["link"])
+            if not batch.empty:
+                yield batch
+        if fetched:
+            save_articles(conn, keyword, pd.concat(fetched, ignore_index=True),
+                          fetched_num=num_data if stop_when is None else None)
+
+        rest = load_articles(conn, keyword, limit=num_data)
+        rest = rest[~rest["link"].isin(seen)]
+        if not rest.empty:
+            yield rest.reset_index(drop=True)
+    finally:
+        conn.close()
+
+
+def collect_news(keyword, num_data=1000, path=STORE_PATH, **fetch_kwargs):
+    """iter_collect_news를 끝까지 실행한 뒤 저장소에서 최신순 num_data건을 읽어 반환합니다."""
+    for _ in iter_collect_news(keyword, num_data, path, **fetch_kwargs):
+        pass
+    conn = connect(path)
+    try:
+        return load_articles(conn, keyword, limit=num_data)
+    finally:
+        conn.close()
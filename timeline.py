@@ -0,0 +1,103 @@
+# timeline.py
+# 코퍼스 하나당 (시간 구간 x 단어) 희소 빈도 행렬을 한 번만 만들고,
+# 상위 N개 / 사용자가 고른 단어의 시계열과 시간/일/주 단위 재집계는 이 행렬을 잘라서 계산한다.
+# 상위 N 개수나 표시할 단어, 집계 단위를 바꿔도 코퍼스를 다시 훑지 않는다.
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+import corpus
+
+RESOLUTIONS = {"H": "시간", "D": "일", "W": "주"}
+
+# vocab: 코퍼스 어휘 (열 = 단어 ID), buckets: 구간 시작 시각 datetime64[s] (오름차순, 기사가 있는 구간만)
+# counts: (구간 x 단어) CSR 단어 등장 횟수, volume: 구간별 기사 수
+Timeline = namedtuple("Timeline", ["vocab", "buckets", "counts", "volume"])
+
+
+def build_timeline(corpus_path, weights=None, article_dates=None):
+    """
+    코퍼스의 시간(hour) 단위 Timeline을 만듭니다. (가장 작은 단위, 나머지는 resample로)
+    불용어/최소 길이 필터 전의 모든 단어를 담으므로 분석 설정이 바뀌어도 그대로 쓸 수 있습니다.
+    weights(문서별 가중치)가 있으면 단어 횟수를 그만큼 셉니다. (article_dates가 없으면 기사 수도)
+    article_dates(수집한 전체 기사의 발행 시각)가 있으면 기사 수는 코퍼스 문서가 아니라 이 시각으로 셉니다.
+    (유사 기사로 묶여 분석하지 않은 기사도 발행된 기사이므로 발행량에 포함)
+    """
+    tc = corpus.open_corpus(corpus_path)
+    dates = np.asarray(tc.dates)
+    # 발행 시각이 없는 기사는 제외
+    valid = ~np.isnat(dates)
+    doc_hours = dates[valid].astype("datetime64[h]")
+    doc_weights = np.ones(tc.n_docs, dtype=np.int64) if weights is None else np.asarray(weights, dtype=np.int64)
+    if article_dates is None:
+        buckets, inverse = np.unique(doc_hours, return_inverse=True)
+        volume = np.bincount(inverse, weights=doc_weights[valid], minlength=len(buckets)).astype(np.int64)
+    else:
+        article_hours = pd.to_datetime(pd.Series(article_dates), errors="coerce").to_numpy().astype("datetime64[h]")
+        article_hours = article_hours[~np.isnat(article_hours)]
+        buckets = np.union1d(doc_hours, article_hours)
+        inverse = np.searchsorted(buckets, doc_hours)
+        volume = np.bincount(np.searchsorted(buckets, article_hours), minlength=len(buckets)).astype(np.int64)
+    doc_bucket = np.full(tc.n_docs, -1, dtype=np.int64)
+    doc_bucket[valid] = inverse
+
+    doc_ids = tc.doc_ids()
+    hit = valid[doc_ids]
+    token_docs, tokens = doc_ids[hit], np.asarray(tc.tokens)[hit]
+    counts = sp.csr_matrix(
+        (doc_weights[token_docs], (doc_bucket[token_docs], tokens)),
+        shape=(len(buckets), len(tc.vocab)),
+    )
+    counts.sum_duplicates()
+    return Timeline(tc.vocab, buckets.astype("datetime64[s]"), counts, volume)
+
+
+def bucket_starts(buckets, resolution):
+    """구간 시작 시각을 resolution("H", "D", "W") 단위의 시작 시각으로 내립니다. (주는 월요일 시작)"""
+    if resolution == "H":
+        return buckets.astype("datetime64[h]").astype("datetime64[s]")
+    days = buckets.astype("datetime64[D]")
+    if resolution == "W":
+        # 1970-01-01은 목요일이므로 (일수 + 3) % 7 = 월요일부터 지난 날 수
+        days = days - (days.astype(np.int64) + 3) % 7
+    return days.astype("datetime64[s]")
+
+
+def resample(timeline, resolution="D"):
+    """Timeline을 더 큰 단위로 합칩니다. ((새 구간 x 원래 구간) 0/1 행렬 곱)"""
+    starts, inverse = np.unique(bucket_starts(timeline.buckets, resolution), return_inverse=True)
+    S = sp.csr_matrix(
+        (np.ones(len(inverse), dtype=np.int64), (inverse, np.arange(len(inverse)))),
+        shape=(len(starts), len(inverse)),
+    )
+    return Timeline(timeline.vocab, starts, (S @ timeline.counts).tocsr(),
+                    np.bincount(inverse, weights=timeline.volume, minlength=len(starts)).astype(np.int64))
+
+
+def _labels(buckets, resolution):
+    # 일/주 단위는 기존 일별 시계열과 같은 날짜(date) 값, 시간 단위는 Timestamp
+    stamps = pd.to_datetime(buckets)
+    return stamps if resolution == "H" else stamps.date
+
+
+def volume_frame(timeline, resolution="D"):
+    """구간별 기사 건수 DataFrame (date, 기사_건수)"""
+    return pd.DataFrame({"date": _labels(timeline.buckets, resolution), "기사_건수": timeline.volume})
+
+
+def term_frame(timeline, terms, resolution="D"):
+    """
+    terms의 구간별 등장 횟수를 (날짜, 단어, 빈도) 형태로 반환합니다.
+    모든 (구간, 단어) 조합을 포함하고 등장하지 않은 구간은 0입니다. (어휘에 없는 단어는 제외)
+    """
+    index = {t: i for i, t in enumerate(timeline.vocab)}
+    terms = [t for t in dict.fromkeys(terms) if t in index]
+    # 필요한 열만 잘라서 밀집 배열로 (구간 수 x 단어 수)
+    values = timeline.counts[:, [index[t] for t in terms]].toarray() if terms else np.zeros((len(timeline.buckets), 0))
+    return pd.DataFrame({
+        "날짜": np.repeat(np.asarray(_labels(timeline.buckets, resolution), dtype=object), len(terms)),
+        "단어": np.tile(np.asarray(terms, dtype=object), len(timeline.buckets)),
+        "빈도": values.astype(np.int64).ravel(),
+    })